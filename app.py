@@ -1,28 +1,59 @@
 import streamlit as st
-import spacy
-import pandas as pd
-from pdfminer.high_level import extract_text as extract_pdf_text
-import docx2txt
-import re
 from collections import Counter
-from fpdf import FPDF
 import base64
-import plotly.graph_objects as go
+import time
+import uuid
+
+# Heavy dependencies (pandas, plotly, fpdf, pdfminer, NumPy, spaCy) are
+# imported by the pages that use them, so the Home page starts fast.
+from resumate import config
+from resumate.jobs import JobQueueFull, get_job_manager
+from resumate.keywords import ModelNotInstalled, check_model, get_keywords, preload_nlp
+from resumate.metrics import REGISTRY, start_metrics_server
+from resumate.taxonomy import get_taxonomy
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="ResuMate AI | Your Career Partner", page_icon="🚀", layout="wide")
 
-# Load NLP Model
-@st.cache_resource
-def load_nlp():
-    try:
-        return spacy.load("en_core_web_sm")
-    except:
-        import os
-        os.system("python -m spacy download en_core_web_sm")
-        return spacy.load("en_core_web_sm")
+# Load the NLP model in the background (once per process; skipped in
+# matcher-only mode). It is never downloaded at runtime.
+try:
+    check_model()
+    preload_nlp()
+    model_error = None
+except ModelNotInstalled as e:
+    model_error = str(e)
+
+if config.METRICS_PORT:
+    start_metrics_server(config.METRICS_PORT, config.METRICS_HOST)
+
+
+@st.fragment(run_every=0.5)
+def job_progress(job_id, show_rows=None):
+    """Polls a background job while it runs and reruns the page once it has finished."""
+    job = get_job_manager().get(job_id)
+    if job is None or job.done:
+        st.rerun()
+    st.progress(job.progress, text=job.message)
+    if show_rows is not None and job.partial:
+        show_rows(job.partial)
+    if st.button("✖ Cancel", key=f"cancel_{job_id}"):
+        get_job_manager().cancel(job_id)
+        st.rerun()
+
+
+def upload_session():
+    """Id under which this browser session's uploads are accounted (resumate.uploads)."""
+    return st.session_state.setdefault('upload_session', uuid.uuid4().hex)
+
+
+def rankings_frame(rows):
+    """Batch Analyzer rows as a table, best score first."""
+    import pandas as pd
+
+    df = pd.DataFrame(rows).rename(columns=str.title)
+    return df.sort_values("Score", ascending=False, na_position="last")
 
-nlp = load_nlp()
 
 # --- CUSTOM CSS ---
 st.markdown("""
@@ -113,132 +144,16 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# --- UTILS ---
-def extract_text_from_file(uploaded_file):
-    if uploaded_file.name.endswith('.pdf'):
-        try:
-            return extract_pdf_text(uploaded_file)
-        except:
-            return "Error extracting PDF text"
-    elif uploaded_file.name.endswith('.docx'):
-        try:
-            return docx2txt.process(uploaded_file)
-        except:
-            return "Error extracting DOCX text"
-    return ""
-
-def get_keywords(text):
-    """
-    Extracts key technical and soft skills from a text using SpaCy NLP.
-    Returns a dictionary of skills grouped by category.
-    """
-    # Grouped skills for better analysis
-    SKILLS_CATEGORIES = {
-        "Languages": {"python", "javascript", "java", "c++", "sql", "typescript", "rust", "go", "html", "css"},
-        "Frameworks": {"react", "node.js", "angular", "vue", "django", "flask", "pytorch", "tensorflow", "spring", "express"},
-        "Tools & Cloud": {"docker", "kubernetes", "aws", "azure", "git", "linux", "terraform", "jenkins", "nosql", "mongodb", "postgresql", "rest api", "graphql", "devops", "cicd", "blockchain", "cybersecurity"},
-        "Data & AI": {"machine learning", "data science", "pandas", "numpy", "scikit-learn", "tableau", "power bi"},
-        "Soft Skills": {"agile", "scrum", "project management", "ui/ux", "figma", "communication", "leadership", "problem solving", "teamwork", "analytical", "critical thinking", "time management"}
-    }
-    
-    # Process text
-    text_lower = text.lower()
-    doc = nlp(text_lower)
-    
-    results = {cat: [] for cat in SKILLS_CATEGORIES}
-    found_any = set()
-
-    # 1. POS Tagging Method: Extract nouns and proper nouns
-    for token in doc:
-        if token.pos_ in ['NOUN', 'PROPN'] and not token.is_stop:
-            clean_text = token.text.strip().lower()
-            if len(clean_text) > 2:
-                # Check which category it belongs to
-                for cat, skills in SKILLS_CATEGORIES.items():
-                    if clean_text in skills and clean_text not in found_any:
-                        results[cat].append(clean_text)
-                        found_any.add(clean_text)
-    
-    # 2. Phrase Matching Method (for multi-word or exact matches)
-    for cat, skills in SKILLS_CATEGORIES.items():
-        for skill in skills:
-            if skill not in found_any:
-                if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                    results[cat].append(skill)
-                    found_any.add(skill)
-            
-    return results
-
-class PDF(FPDF):
-    def header(self):
-        pass
-    def footer(self):
-        pass
-
-def generate_resume_pdf(data, accent_color, layout_style="Modern"):
-    pdf = PDF()
-    pdf.add_page()
-    
-    # Convert hex to RGB
-    h = accent_color.lstrip('#')
-    rgb = tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
-    
-    # Header
-    pdf.set_font("Arial", 'B', 24)
-    pdf.set_text_color(15, 23, 42)
-    
-    align = 'C' if layout_style == "Modern" else 'L'
-    
-    pdf.cell(0, 15, data['name'].upper(), ln=True, align=align)
-    
-    pdf.set_font("Arial", '', 10)
-    pdf.set_text_color(100, 116, 139)
-    contact_info = f"{data['email']} | {data['phone']} | {data['location']}"
-    pdf.cell(0, 5, contact_info, ln=True, align=align)
-    if data['linkedin']:
-        pdf.cell(0, 5, data['linkedin'], ln=True, align=align)
-    
-    pdf.ln(10)
-    
-    # Sections
-    def add_section(title, content):
-        pdf.set_font("Arial", 'B', 14)
-        pdf.set_text_color(rgb[0], rgb[1], rgb[2]) 
-        pdf.cell(0, 10, title.upper(), ln=True)
-        pdf.set_draw_color(226, 232, 240)
-        pdf.line(pdf.get_x(), pdf.get_y(), pdf.get_x() + (190 if layout_style == "Modern" else 80), pdf.get_y())
-        pdf.ln(2)
-        
-        pdf.set_font("Arial", '', 11)
-        pdf.set_text_color(30, 41, 59)
-        pdf.multi_cell(0, 6, content)
-        pdf.ln(5)
-
-    if data['summary']:
-        add_section("Professional Summary", data['summary'])
-    
-    if data['education']:
-        add_section("Education", data['education'])
-        
-    if data['experience']:
-        add_section("Experience", data['experience'])
-        
-    if data['skills']:
-        add_section("Skills", data['skills'])
-        
-    if data['projects']:
-        add_section("Projects", data['projects'])
-
-    return pdf.output(dest='S')
-
 # --- SIDEBAR NAV ---
 with st.sidebar:
     st.image("https://cdn-icons-png.flaticon.com/512/3135/3135691.png", width=100)
     st.title("ResuMate AI")
     st.markdown("---")
-    page = st.radio("Navigation", ["Home", "Analyzer", "Resume Builder", "Interview Prep"])
+    page = st.radio("Navigation", ["Home", "Analyzer", "Batch Analyzer", "Resume Builder", "Interview Prep"])
     st.markdown("---")
     st.info("Built for students to land their dream jobs 🚀")
+    if model_error:
+        st.warning(model_error)
 
 # --- PAGES ---
 if page == "Home":
@@ -316,113 +231,253 @@ elif page == "Analyzer":
         if st.session_state.get('resume_trigger'):
             st.info("Sample Job loaded! Since file uploads are secure, please upload any PDF/DOCX to see the matching logic in action.")
         
+    semantic_mode = st.checkbox("🧠 Semantic matching", help="Also match each JD requirement to your closest resume sentence by meaning, not just exact keywords. Runs locally; adds some latency.")
+        
+    with st.expander("🔧 Diagnostics"):
+        show_timings = st.checkbox("Show stage timings")
+        profile_run = st.checkbox(f"Profile this analysis ({config.PROFILER})")
+        
     if st.button("Calculate Match Score"):
         if jd_text and uploaded_file:
-            with st.spinner("Processing documents..."):
-                resume_text = extract_text_from_file(uploaded_file)
-                
-                if "Error" in resume_text:
-                    st.error(resume_text)
-                else:
-                    jd_results = get_keywords(jd_text)
-                    resume_results = get_keywords(resume_text)
-                    
-                    found_dict = {}
-                    missing_dict = {}
-                    
-                    all_jd_keywords = []
-                    all_res_keywords = []
-                    
-                    for cat in jd_results:
-                        f = set(jd_results[cat]).intersection(set(resume_results[cat]))
-                        m = set(jd_results[cat]).difference(set(resume_results[cat]))
-                        
-                        if f: found_dict[cat] = sorted(list(f))
-                        if m: missing_dict[cat] = sorted(list(m))
-                        
-                        all_jd_keywords.extend(jd_results[cat])
-                        all_res_keywords.extend(resume_results[cat])
-                    
-                    total_jd = len(all_jd_keywords)
-                    total_found = len(set(all_jd_keywords).intersection(set(all_res_keywords)))
-                    
-                    score = round((total_found / total_jd) * 100) if total_jd > 0 else 0
-                    
-                    st.markdown(f"""
-                        <div class="score-card">
-                            <p style="margin: 0; color: #94a3b8; font-weight: 600;">MATCH SCORE</p>
-                            <h1 class="score-value">{score}%</h1>
-                            <p style="margin-top: 0.5rem; color: #8b5cf6;">{"Great match!" if score > 70 else "Needs some improvement" if score > 40 else "Low match - try adding more keywords"}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                    # --- VISUALIZATION ---
-                    fig = go.Figure(go.Indicator(
-                        mode = "gauge+number",
-                        value = score,
-                        title = {'text': "Matching Accuracy"},
-                        gauge = {
-                            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "white"},
-                            'bar': {'color': "#8b5cf6"},
-                            'bgcolor': "rgba(0,0,0,0)",
-                            'borderwidth': 2,
-                            'bordercolor': "gray",
-                            'steps': [
-                                {'range': [0, 40], 'color': 'rgba(239, 68, 68, 0.1)'},
-                                {'range': [40, 70], 'color': 'rgba(234, 179, 8, 0.1)'},
-                                {'range': [70, 100], 'color': 'rgba(34, 197, 94, 0.1)'}
-                            ],
-                        }
-                    ))
-                    fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', font={'color': "white", 'family': "Inter"}, height=300)
-                    st.plotly_chart(fig, use_container_width=True)
-
-                    # --- SKILLS GAP CHART ---
-                    gap_data = pd.DataFrame({
-                        "Category": ["Matched", "Missing"],
-                        "Count": [total_found, total_jd - total_found],
-                        "Color": ["#22c55e", "#ef4444"]
-                    })
-                    
-                    fig_gap = go.Figure(go.Bar(
-                        x=gap_data["Category"],
-                        y=gap_data["Count"],
-                        marker_color=gap_data["Color"],
-                        text=gap_data["Count"],
-                        textposition='auto',
-                    ))
-                    fig_gap.update_layout(
-                        title="Quick Skills Gap Analysis",
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        font={'color': "white"},
-                        height=300,
-                        yaxis=dict(showgrid=False)
+            from resumate.analysis import analysis_key, analyze_resume
+            from resumate.extract import ExtractionError
+            from resumate.uploads import get_upload_store
+            
+            profiler = config.PROFILER if profile_run else None
+            try:
+                # Size and page limits are checked here, before the job is queued
+                upload_start = time.perf_counter()
+                resume = get_upload_store().accept(upload_session(), uploaded_file.name, uploaded_file)
+                upload_read = time.perf_counter() - upload_start
+            except ExtractionError as e:
+                st.error(str(e))
+            else:
+                try:
+                    job = get_job_manager().submit(
+                        analysis_key(uploaded_file.name, resume, jd_text, semantic_mode, profiler),
+                        analyze_resume, uploaded_file.name, resume, jd_text, semantic_mode, profiler,
+                        {"upload_read": upload_read}, cleanup=resume.release,
                     )
-                    st.plotly_chart(fig_gap, use_container_width=True)
-
-                    st.markdown("### 📊 Detailed Skill Breakdown")
-                    res_c1, res_c2 = st.columns(2)
-                    
-                    with res_c1:
-                        st.success(f"✅ **Matched Keywords**")
-                        for cat, ks in found_dict.items():
-                            st.markdown(f"**{cat}:** " + ", ".join([f"`{k}`" for k in ks]))
-                        
-                    with res_c2:
-                        st.warning(f"⚠ **Missing Keywords**")
-                        for cat, ks in missing_dict.items():
-                            st.markdown(f"**{cat}:** " + ", ".join([f"`{k}`" for k in ks]))
-                        
-                    st.markdown("### 💡 AI Suggestions")
-                    missing_flat = [item for sublist in missing_dict.values() for item in sublist]
-                    if missing_flat:
-                        st.info(f"**Action Plan:** Try to incorporate concepts like **{', '.join(missing_flat[:3])}** into your experience bullets.")
-                        st.write("Focus on categories where you have the most gaps to improve your ATS ranking.")
-                    else:
-                        st.info("Your resume matches all identified technical keywords in the JD! Focus on quantifying your achievements.")
+                    st.session_state['analysis_job'] = job.id
+                except JobQueueFull:
+                    st.warning("ResuMate is busy with other analyses right now. Please try again in a few seconds.")
         else:
             st.error("Please provide both documents.")
+    
+    # The analysis runs in the background and survives reruns; this only shows its state
+    job = get_job_manager().get(st.session_state.get('analysis_job'))
+    if job is not None and not job.done:
+        job_progress(job.id)
+    elif job is not None and job.status == "failed":
+        st.error(job.error)
+    elif job is not None and job.status == "cancelled":
+        st.info("Analysis cancelled.")
+    elif job is not None:
+        import pandas as pd
+        import plotly.graph_objects as go
+        from resumate.metrics import StageTimer
+        from resumate.scoring import SECTION_WEIGHTS
+        
+        result = job.result
+        # Charts are drawn on every rerun, so they're timed here under the job's request id
+        # (and published once per job, not once per rerun)
+        chart_timer = StageTimer("analyzer", request_id=result["request_id"])
+        score, found_dict, missing_dict = result["score"], result["found"], result["missing"]
+        total_found, total_jd = result["total_found"], result["total_jd"]
+        
+        st.markdown(f"""
+            <div class="score-card">
+                <p style="margin: 0; color: #94a3b8; font-weight: 600;">MATCH SCORE</p>
+                <h1 class="score-value">{score}%</h1>
+                <p style="margin-top: 0.5rem; color: #8b5cf6;">{"Great match!" if score > 70 else "Needs some improvement" if score > 40 else "Low match - try adding more keywords"}</p>
+            </div>
+        """, unsafe_allow_html=True)
+
+        ocr = result["ocr"]
+        if ocr is not None and ocr["error"]:
+            st.warning(f"⚠ Some pages of this resume are scanned images and could not be read "
+                       f"({ocr['skipped']} skipped): {ocr['error']}. The score only covers the text that was found.")
+        elif ocr is not None:
+            st.info(f"🔎 {ocr['pages']} scanned page(s) read with OCR in {ocr['seconds']:.1f} s"
+                    + (f" ({ocr['cached']} from cache)" if ocr["cached"] else "") + ".")
+
+        # Where each matched skill was found: shown in work counts more than listed
+        skill_sections = result["skill_sections"]
+        sec_c1, sec_c2 = st.columns(2)
+        sec_c1.metric("Section-Weighted Score", f"{result['section_score']}%",
+                      help="Each matched JD skill counts by the best resume section it appears in: "
+                           + ", ".join(f"{name} ×{w:g}" for name, w in SECTION_WEIGHTS.items()))
+        if sec_c2.button("🛠️ Edit this resume in the Builder"):
+            st.session_state['sample_profile'] = result["resume_profile"]
+            sec_c2.success("Loaded into the Resume Builder form. Open **Resume Builder** in the sidebar.")
+        if skill_sections:
+            with st.expander("📑 Where your matched skills appear"):
+                st.dataframe(pd.DataFrame([{
+                    "Skill": skill,
+                    "Sections": ", ".join(sections),
+                } for skill, sections in sorted(skill_sections.items())]), use_container_width=True, hide_index=True)
+
+        semantic = result["semantic"]
+        if semantic is not None:
+            keyword_ms = sum(sec for name, sec in result["stages"].items() if name != "semantic") * 1000
+            sem_c1, sem_c2, sem_c3 = st.columns(3)
+            sem_c1.metric("Keyword Score", f"{score}%", f"{keyword_ms:.0f} ms", delta_color="off")
+            sem_c2.metric("Semantic Score", f"{semantic['score']}%", f"+{result['stages']['semantic'] * 1000:.0f} ms", delta_color="off")
+            sem_c3.metric("Requirements Covered", f"{semantic['covered']} / {semantic['total']}")
+            st.caption(f"Semantic backend: {semantic['backend']}")
+            if semantic["matches"]:
+                with st.expander("🧠 Requirement-by-requirement evidence"):
+                    st.dataframe(pd.DataFrame([{
+                        "JD Requirement": m["requirement"],
+                        "Closest Resume Sentence": m["evidence"],
+                        "Similarity": m["similarity"],
+                        "Covered": "✅" if m["matched"] else "—",
+                    } for m in semantic["matches"]]), use_container_width=True, hide_index=True)
+
+        # --- VISUALIZATION ---
+        with chart_timer.stage("charts"):
+            fig = go.Figure(go.Indicator(
+                mode = "gauge+number",
+                value = score,
+                title = {'text': "Matching Accuracy"},
+                gauge = {
+                    'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "white"},
+                    'bar': {'color': "#8b5cf6"},
+                    'bgcolor': "rgba(0,0,0,0)",
+                    'borderwidth': 2,
+                    'bordercolor': "gray",
+                    'steps': [
+                        {'range': [0, 40], 'color': 'rgba(239, 68, 68, 0.1)'},
+                        {'range': [40, 70], 'color': 'rgba(234, 179, 8, 0.1)'},
+                        {'range': [70, 100], 'color': 'rgba(34, 197, 94, 0.1)'}
+                    ],
+                }
+            ))
+            fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', font={'color': "white", 'family': "Inter"}, height=300)
+            st.plotly_chart(fig, use_container_width=True)
+
+            # --- SKILLS GAP CHART ---
+            gap_data = pd.DataFrame({
+                "Category": ["Matched", "Missing"],
+                "Count": [total_found, total_jd - total_found],
+                "Color": ["#22c55e", "#ef4444"]
+            })
+        
+            fig_gap = go.Figure(go.Bar(
+                x=gap_data["Category"],
+                y=gap_data["Count"],
+                marker_color=gap_data["Color"],
+                text=gap_data["Count"],
+                textposition='auto',
+            ))
+            fig_gap.update_layout(
+                title="Quick Skills Gap Analysis",
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font={'color': "white"},
+                height=300,
+                yaxis=dict(showgrid=False)
+            )
+            st.plotly_chart(fig_gap, use_container_width=True)
+        if st.session_state.get('charts_timed_job') != job.id:
+            chart_timer.finish(score=score)
+            st.session_state['charts_timed_job'] = job.id
+
+        st.markdown("### 📊 Detailed Skill Breakdown")
+        res_c1, res_c2 = st.columns(2)
+        
+        with res_c1:
+            st.success(f"✅ **Matched Keywords**")
+            for cat, ks in found_dict.items():
+                st.markdown(f"**{cat}:** " + ", ".join([f"`{k}`" for k in ks]))
+            
+        with res_c2:
+            st.warning(f"⚠ **Missing Keywords**")
+            for cat, ks in missing_dict.items():
+                st.markdown(f"**{cat}:** " + ", ".join([f"`{k}`" for k in ks]))
+            
+        st.markdown("### 💡 AI Suggestions")
+        missing_flat = [item for sublist in missing_dict.values() for item in sublist]
+        if missing_flat:
+            st.info(f"**Action Plan:** Try to incorporate concepts like **{', '.join(missing_flat[:3])}** into your experience bullets.")
+            st.write("Focus on categories where you have the most gaps to improve your ATS ranking.")
+        else:
+            st.info("Your resume matches all identified technical keywords in the JD! Focus on quantifying your achievements.")
+        
+        if show_timings or profile_run:
+            with st.expander("⏱️ Stage Timings", expanded=True):
+                stages = pd.DataFrame(
+                    [{"Stage": name, "ms": round(sec * 1000, 1)}
+                     for name, sec in {**result["stages"], **chart_timer.stages}.items()]
+                )
+                st.dataframe(stages, use_container_width=True, hide_index=True)
+                st.caption(f"Total: {(result['total'] + chart_timer.stages['charts']) * 1000:.0f} ms "
+                           f"· request {result['request_id']}")
+                if result["profile"]:
+                    st.code(result["profile"], language="text")
+                st.code(REGISTRY.render_prometheus(), language="text")
+
+elif page == "Batch Analyzer":
+    st.title("Batch Resume Ranking 📚")
+    st.write("Upload many resumes (or a ZIP of them) and rank every candidate against one job description.")
+    
+    batch_jd = st.text_area("Target Job Description", height=200,
+                            value=st.session_state.get('jd_sample', ""),
+                            placeholder="e.g. Seeking a Python Developer with experience in Django...")
+    batch_files = st.file_uploader("Upload PDFs, DOCXs or a ZIP archive", type=['pdf', 'docx', 'zip'], accept_multiple_files=True)
+    
+    with st.expander("⚖️ Scoring Weights"):
+        taxonomy = get_taxonomy()
+        required_skills = set(st.multiselect("Required skills (count double)", sorted(taxonomy.skill_category)))
+        use_idf = st.checkbox("Weight rare skills higher (IDF across this batch)")
+        weight_cols = st.columns(len(taxonomy.categories))
+        category_weights = {
+            cat: col.number_input(cat, min_value=0.0, max_value=5.0, value=1.0, step=0.5)
+            for col, cat in zip(weight_cols, taxonomy.categories)
+        }
+    
+    if st.button("Rank Candidates"):
+        if batch_jd and batch_files:
+            from resumate.analysis import rank_resumes, ranking_key
+            from resumate.uploads import get_upload_store
+            
+            items, rejected = get_upload_store().accept_files(upload_session(), batch_files)
+            if rejected:
+                st.warning(f"Skipped {len(rejected)} file(s):\n\n"
+                           + "\n".join(f"- **{name}**: {error}" for name, error in rejected))
+            if not items:
+                st.error("No PDF or DOCX resumes found in the upload.")
+            else:
+                try:
+                    job = get_job_manager().submit(
+                        ranking_key(items, batch_jd, category_weights, required_skills, use_idf),
+                        rank_resumes, items, batch_jd, category_weights, required_skills, use_idf,
+                        cleanup=lambda: [upload.release() for _, upload in items],
+                    )
+                    st.session_state['batch_job'] = job.id
+                except JobQueueFull:
+                    st.warning("ResuMate is busy with other analyses right now. Please try again in a few seconds.")
+        else:
+            st.error("Please provide a job description and at least one resume.")
+    
+    job = get_job_manager().get(st.session_state.get('batch_job'))
+    if job is not None and not job.done:
+        # Rows stream into the table as each batch of resumes is scored
+        job_progress(job.id, show_rows=lambda rows: st.dataframe(rankings_frame(rows), use_container_width=True, hide_index=True))
+    elif job is not None and job.status == "failed":
+        st.error(job.error)
+    elif job is not None and job.status == "cancelled":
+        st.info("Ranking cancelled.")
+    elif job is not None:
+        df = rankings_frame(job.result)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        st.success(f"✅ Ranked {len(df)} candidates.")
+        st.download_button(
+            label="Download Rankings CSV",
+            data=df.to_csv(index=False),
+            file_name="candidate_rankings.csv",
+            mime="text/csv"
+        )
 
 elif page == "Resume Builder":
     st.title("Professional Resume Builder 🛠️")
@@ -442,69 +497,178 @@ elif page == "Resume Builder":
             'projects': 'ResuMate AI: An NLP tool for resume optimization.'
         }
 
-    with st.form("resume_form"):
-        st.markdown("#### 🎨 Theme & Layout")
-        col_t1, col_t2 = st.columns(2)
-        resume_color = col_t1.color_picker("Accent Color", "#6366f1")
-        resume_layout = col_t2.selectbox("Select Layout", ["Modern", "Classic"], help="Modern is centered, Classic is left-aligned.")
-        
-        st.markdown("---")
-        st.markdown("#### 👤 1. Personal Information")
-        
-        # Load sample data if exists
-        s = st.session_state.get('sample_profile', {})
-        
-        c1, c2 = st.columns(2)
-        name = c1.text_input("Full Name", value=s.get('name', ""), placeholder="e.g. Alex Johnson")
-        email = c2.text_input("Email Address", value=s.get('email', ""), placeholder="alex@example.com")
-        phone = c1.text_input("Phone Number", value=s.get('phone', ""), placeholder="+1 234 567 890")
-        location = c2.text_input("Location", value=s.get('location', ""), placeholder="City, State/Country")
-        linkedin = st.text_input("LinkedIn/GitHub Profile URL", value=s.get('linkedin', ""), placeholder="linkedin.com/in/alexj")
-        
-        st.markdown("---")
-        st.markdown("#### 📝 2. Professional Summary")
-        summary = st.text_area("A 2-3 sentence overview", height=100, value=s.get('summary', ""))
-        
-        st.markdown("---")
-        st.markdown("#### 🎓 3. Education")
-        education = st.text_area("Degrees and schools", height=100, value=s.get('education', ""))
-        
-        st.markdown("---")
-        st.markdown("#### 💼 4. Work Experience")
-        experience = st.text_area("Roles and achievements", height=150, value=s.get('experience', ""))
-        
-        st.markdown("---")
-        st.markdown("#### 🛠️ 5. Key Skills")
-        skills = st.text_area("Languages and tools", height=100, value=s.get('skills', ""))
-        
-        st.markdown("---")
-        st.markdown("#### 🚀 6. Significant Projects")
-        projects = st.text_area("Projects", height=100, value=s.get('projects', ""))
+    with st.expander("📥 Start from an existing resume"):
+        import_file = st.file_uploader("Upload PDF or DOCX", type=['pdf', 'docx'], key="import_resume")
+        if st.button("Fill the form from this resume"):
+            if import_file is None:
+                st.error("Please upload a resume.")
+            else:
+                from resumate.extract import ExtractionError, extract_document
+                from resumate.sections import parse_resume
+                from resumate.uploads import get_upload_store
+                
+                try:
+                    upload = get_upload_store().accept(upload_session(), import_file.name, import_file)
+                    try:
+                        doc = parse_resume(extract_document(import_file.name, upload))
+                    finally:
+                        upload.release()
+                except ExtractionError as e:
+                    st.error(str(e))
+                else:
+                    st.session_state['sample_profile'] = doc.to_profile()
+                    if not doc.sectioned:
+                        st.warning("No section headings (Education, Experience, Skills...) were recognized; "
+                                   "only contact details were filled in.")
+
+    from resumate.pdf import TEMPLATES
+
+    st.markdown("#### 🎯 Target Job")
+    builder_jd = st.text_area("Job description to score this resume against as you edit", height=120,
+                              value=st.session_state.get('jd_sample', ""),
+                              placeholder="Paste a job description to see your ATS match update with every field you change")
+    # Filled in below, once the fields have been read
+    live_score = st.container()
+    
+    st.markdown("---")
+    st.markdown("#### 🎨 Theme & Layout")
+    col_t1, col_t2 = st.columns(2)
+    resume_color = col_t1.color_picker("Accent Color", "#6366f1")
+    resume_layout = col_t2.selectbox("Select Layout", list(TEMPLATES),
+                                     help=" ".join(f"**{t.name}:** {t.description}" for t in TEMPLATES.values()))
+    
+    st.markdown("---")
+    st.markdown("#### 👤 1. Personal Information")
+    
+    # Load sample data if exists
+    s = st.session_state.get('sample_profile', {})
+    
+    c1, c2 = st.columns(2)
+    name = c1.text_input("Full Name", value=s.get('name', ""), placeholder="e.g. Alex Johnson")
+    email = c2.text_input("Email Address", value=s.get('email', ""), placeholder="alex@example.com")
+    phone = c1.text_input("Phone Number", value=s.get('phone', ""), placeholder="+1 234 567 890")
+    location = c2.text_input("Location", value=s.get('location', ""), placeholder="City, State/Country")
+    linkedin = st.text_input("LinkedIn/GitHub Profile URL", value=s.get('linkedin', ""), placeholder="linkedin.com/in/alexj")
+    
+    st.markdown("---")
+    st.markdown("#### 📝 2. Professional Summary")
+    summary = st.text_area("A 2-3 sentence overview", height=100, value=s.get('summary', ""))
+    
+    st.markdown("---")
+    st.markdown("#### 🎓 3. Education")
+    education = st.text_area("Degrees and schools", height=100, value=s.get('education', ""))
+    
+    st.markdown("---")
+    st.markdown("#### 💼 4. Work Experience")
+    experience = st.text_area("Roles and achievements", height=150, value=s.get('experience', ""))
+    
+    st.markdown("---")
+    st.markdown("#### 🛠️ 5. Key Skills")
+    skills = st.text_area("Languages and tools", height=100, value=s.get('skills', ""))
+    
+    st.markdown("---")
+    st.markdown("#### 🚀 6. Significant Projects")
+    projects = st.text_area("Projects", height=100, value=s.get('projects', ""))
+    
+    resume_data = {
+        'name': name, 'email': email, 'phone': phone,
+        'location': location, 'linkedin': linkedin,
+        'summary': summary, 'education': education,
+        'experience': experience, 'skills': skills,
+        'projects': projects
+    }
+    
+    if builder_jd.strip():
+        # Scored straight from the fields: only a changed field is matched
+        # again, and no PDF is rendered or read back
+        from resumate.scoring import SECTION_WEIGHTS, merge_results, score_match, score_sections
+        from resumate.sections import profile_keywords
         
-        st.markdown("<br>", unsafe_allow_html=True)
-        submitted = st.form_submit_button("Preview & Generate PDF Resume")
+        started = time.perf_counter()
+        try:
+            jd_results = get_keywords(builder_jd)
+            section_results = profile_keywords(resume_data)
+            score, found_dict, missing_dict, total_found, total_jd = score_match(
+                jd_results, merge_results(section_results.values()))
+            section_score, _ = score_sections(jd_results, section_results)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        except ModelNotInstalled as e:
+            # The form and the export still work without the model
+            live_score.warning(f"Live scoring is unavailable: {e}")
+        else:
+            with live_score:
+                col_s1, col_s2 = st.columns(2)
+                col_s1.metric("ATS Match", f"{score}%", help=f"{total_found} of {total_jd} skills in the job description")
+                col_s2.metric("Section-Weighted Score", f"{section_score}%",
+                              help="Each matched skill counts by the best section it appears in: "
+                                   + ", ".join(f"{section} ×{w:g}" for section, w in SECTION_WEIGHTS.items()))
+                if missing_dict:
+                    st.markdown("**Missing:** " + ", ".join(f"`{k}`" for ks in missing_dict.values() for k in ks))
+                elif total_jd:
+                    st.success("Every skill in the job description appears in your resume.")
+                st.caption(f"Updates whenever you leave a field · scored in {elapsed_ms:.0f} ms")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    def resume_pdf():
+        from resumate.pdf import generate_resume_pdf
         
-        if submitted:
-            if not name or not email:
-                st.error("Name and Email are required.")
+        return generate_resume_pdf(resume_data, resume_color, resume_layout)
+    
+    if not name or not email:
+        st.info("Name and Email are required to export your resume.")
+    # The PDF is only rendered when the button is clicked
+    st.download_button(
+        label="Download Resume PDF",
+        data=resume_pdf,
+        file_name=f"{name.replace(' ', '_')}_Resume.pdf",
+        mime="application/pdf",
+        disabled=not name or not email,
+    )
+
+    st.markdown("---")
+    with st.expander("📦 Bulk Export"):
+        st.write("Render many resumes at once from a CSV or JSONL file with one profile per row "
+                 "(columns: name, email, phone, location, linkedin, summary, education, experience, skills, projects).")
+        profiles_file = st.file_uploader("Profiles file", type=['csv', 'jsonl', 'json'])
+        col_b1, col_b2 = st.columns(2)
+        bulk_color = col_b1.color_picker("Accent Color", "#6366f1", key="bulk_color")
+        bulk_layout = col_b2.selectbox("Layout", list(TEMPLATES), key="bulk_layout")
+        if st.button("Render ZIP of PDFs"):
+            if profiles_file is None:
+                st.error("Please upload a profiles file.")
             else:
-                resume_data = {
-                    'name': name, 'email': email, 'phone': phone,
-                    'location': location, 'linkedin': linkedin,
-                    'summary': summary, 'education': education,
-                    'experience': experience, 'skills': skills,
-                    'projects': projects
-                }
-                
-                pdf_bytes = generate_resume_pdf(resume_data, resume_color, resume_layout)
-                
-                st.success("✅ Your professional resume is ready!")
-                st.download_button(
-                    label="Download Resume PDF",
-                    data=pdf_bytes,
-                    file_name=f"{name.replace(' ', '_')}_Resume.pdf",
-                    mime="application/pdf"
-                )
+                from resumate.cache import content_key
+                from resumate.pdf import export_resumes
+
+                data = profiles_file.getvalue()
+                try:
+                    job = get_job_manager().submit(
+                        content_key("export", profiles_file.name, data, bulk_color, bulk_layout),
+                        export_resumes, profiles_file.name, data, bulk_color, bulk_layout,
+                    )
+                    st.session_state['export_job'] = job.id
+                except JobQueueFull:
+                    st.warning("ResuMate is busy with other jobs right now. Please try again in a few seconds.")
+
+        job = get_job_manager().get(st.session_state.get('export_job'))
+        if job is not None and not job.done:
+            job_progress(job.id)
+        elif job is not None and job.status == "failed":
+            st.error(job.error)
+        elif job is not None and job.status == "cancelled":
+            st.info("Export cancelled.")
+        elif job is not None:
+            result = job.result
+            st.success(f"✅ Rendered {result['count']} resumes.")
+            for row, error in result["errors"]:
+                st.warning(f"Skipped profile {row}: {error}")
+            st.download_button(
+                label="Download Resumes ZIP",
+                data=result["zip"],
+                file_name="resumes.zip",
+                mime="application/zip"
+            )
 
 elif page == "Interview Prep":
     st.title("Interview Preparation Assistant 🤖")
@@ -514,37 +678,70 @@ elif page == "Interview Prep":
                           value=st.session_state.get('jd_sample', ""),
                           placeholder="Paste the job you're preparing for...")
     
+    col_q1, col_q2 = st.columns(2)
+    difficulties = col_q1.multiselect("Difficulty", ["easy", "medium", "hard"], default=["easy", "medium", "hard"])
+    per_skill = col_q2.slider("Questions per skill", 1, 3, 2)
+    
     if st.button("Generate Interview Questions"):
         if jd_input:
-            with st.spinner("Analyzing JD and generating questions..."):
-                categorized_keywords = get_keywords(jd_input)
-                # Flatten the keywords for display
-                flat_keywords = [item for sublist in categorized_keywords.values() for item in sublist]
-                
-                st.markdown("### 🎯 Technical Questions (Based on JD)")
-                if flat_keywords:
-                    for i, kw in enumerate(flat_keywords[:8]):
-                        st.info(f"**Q{i+1}:** Can you describe a project where you used **{kw.upper()}** and what challenges you faced?")
-                else:
-                    st.warning("No specific technical keywords found. Try pasting a more detailed JD.")
-                
-                st.markdown("---")
-                st.markdown("### 🤝 Behavioral Questions (The Essentials)")
-                behavioral_qs = [
-                    "Tell me about a time you worked in a team and faced a conflict. How did you resolve it?",
-                    "Describe a situation where you had to learn a new technology quickly. What was your process?",
-                    "What is your greatest technical achievement so far, and why?",
-                    "Where do you see yourself in 3 years in terms of technical growth?"
-                ]
-                for i, q in enumerate(behavioral_qs):
-                    st.success(f"**BQ{i+1}:** {q}")
-                    
-                st.markdown("---")
-                st.markdown("### 💡 Interview Tips")
-                st.info("""
-                - **The STAR Method:** For behavioral questions, always use Situation, Task, Action, and Result.
-                - **Be Quantifiable:** Whenever possible, use numbers (e.g., 'Reduced load time by 20%').
-                - **Ask Questions:** Always prepare 2-3 questions for the interviewer (e.g., 'What does a typical day look like for the engineering team?').
-                """)
+            st.session_state['prep'] = {'jd': jd_input, 'seed': 0}
+            st.session_state['prep_page'] = 1
         else:
             st.error("Please paste a Job Description first.")
+    
+    prep = st.session_state.get('prep')
+    if prep and difficulties:
+        from resumate.questions import page as questions_page, prep_pack
+        
+        # Memoized per JD and settings, so paging and revisits are instant
+        try:
+            pack = prep_pack(prep['jd'], difficulties, per_skill, seed=prep['seed'])
+        except ModelNotInstalled as e:
+            st.error(str(e))
+            st.stop()
+        
+        st.markdown("### 🎯 Technical Questions (Based on JD)")
+        if pack["questions"]:
+            st.caption(f"{len(pack['skills'])} skills found, most mentioned first: "
+                       + ", ".join(f"{s['skill']} ({s['mentions']})" for s in pack["skills"]))
+            page_size = 10
+            pages = questions_page(pack["questions"], 1, page_size)[1]
+            st.session_state['prep_page'] = min(st.session_state.get('prep_page', 1), pages)
+            page_number = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key='prep_page')
+            shown, _ = questions_page(pack["questions"], page_number, page_size)
+            for i, q in enumerate(shown, start=(page_number - 1) * page_size + 1):
+                st.info(f"**Q{i}** · `{q['skill']}` · {q['difficulty']}\n\n{q['text']}")
+        else:
+            st.warning("No specific technical keywords found. Try pasting a more detailed JD.")
+        
+        st.markdown("---")
+        st.markdown("### 🤝 Behavioral Questions (The Essentials)")
+        for i, q in enumerate(pack["behavioral"]):
+            st.success(f"**BQ{i+1}:** {q['text']}")
+        
+        col_p1, col_p2 = st.columns(2)
+        if col_p1.button("🔀 Different Questions"):
+            prep['seed'] += 1
+            st.rerun()
+        
+        def prep_pack_pdf():
+            from resumate.pdf import render_prep_pack
+            
+            return render_prep_pack(pack)
+        
+        col_p2.download_button(
+            label="Download Prep Pack PDF",
+            data=prep_pack_pdf,
+            file_name="interview_prep_pack.pdf",
+            mime="application/pdf"
+        )
+            
+        st.markdown("---")
+        st.markdown("### 💡 Interview Tips")
+        st.info("""
+        - **The STAR Method:** For behavioral questions, always use Situation, Task, Action, and Result.
+        - **Be Quantifiable:** Whenever possible, use numbers (e.g., 'Reduced load time by 20%').
+        - **Ask Questions:** Always prepare 2-3 questions for the interviewer (e.g., 'What does a typical day look like for the engineering team?').
+        """)
+    elif prep:
+        st.warning("Pick at least one difficulty.")
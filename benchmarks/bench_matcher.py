@@ -0,0 +1,68 @@
+"""
+Compares the old per-skill regex loop with the compiled SkillMatcher on long
+documents and growing taxonomies.
+
+    python -m benchmarks.bench_matcher
+"""
+import random
+import re
+import string
+import time
+
+from resumate.matcher import SkillMatcher
+from resumate.taxonomy import get_taxonomy
+
+FILLER = (
+    "designed built and shipped services for customers across teams "
+    "improved reliability latency and cost while mentoring junior engineers"
+).split()
+
+
+def legacy_find_all(skills, text_lower):
+    # The loop get_keywords used before SkillMatcher: one regex per skill.
+    return [s for s in skills if re.search(r'\b' + re.escape(s) + r'\b', text_lower)]
+
+
+def synthetic_skills(n, rng):
+    skills = set(get_taxonomy().skill_category)
+    while len(skills) < n:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+                 for _ in range(rng.choice((1, 1, 2, 3)))]
+        skills.add(" ".join(words))
+    return sorted(skills)
+
+
+def synthetic_document(n_words, skills, rng):
+    words = []
+    while len(words) < n_words:
+        words.extend(rng.choice(skills).split() if rng.random() < 0.05 else [rng.choice(FILLER)])
+    return " ".join(words)
+
+
+def timeit(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'skills':>7} {'words':>7} {'legacy ms':>10} {'matcher ms':>11} {'build ms':>9} {'speedup':>8}")
+    for n_skills in (60, 1000, 5000):
+        skills = synthetic_skills(n_skills, rng)
+        start = time.perf_counter()
+        matcher = SkillMatcher({s: s for s in skills})
+        build = time.perf_counter() - start
+        for n_words in (500, 5000, 20000):
+            text = synthetic_document(n_words, skills, rng)
+            old = timeit(lambda: legacy_find_all(skills, text), repeat=1 if n_skills > 1000 else 3)
+            new = timeit(lambda: matcher.find_all(text))
+            print(f"{n_skills:>7} {n_words:>7} {old * 1000:>10.1f} {new * 1000:>11.1f} "
+                  f"{build * 1000:>9.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Cold-start budget for the Streamlit app. Runs app.py once in a fresh
+interpreter under `python -X importtime` (Streamlit's bare mode renders the
+Home page) and reports wall time, total import time and the slowest
+top-level imports:
+
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --runs 5 --top 15 --json startup.json
+
+Set RESUMATE_KEYWORD_MODE etc. as for the app; the spaCy model load is
+included in the wall time when the app does it at startup.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr):
+    """Top-level modules from -X importtime output as {module: cumulative µs}."""
+    top = {}
+    for line in stderr.splitlines():
+        m = LINE.match(line)
+        if m and len(m.group(3)) == 1:
+            top[m.group(4)] = top.get(m.group(4), 0) + int(m.group(2))
+    return top
+
+
+def run_once(script):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", script], cwd=ROOT,
+                          capture_output=True, text=True, env={**os.environ, "PYTHONWARNINGS": "ignore"})
+    wall = time.perf_counter() - start
+    return wall, parse_importtime(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default="app.py")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to start; the median is reported")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    runs = [run_once(args.script) for _ in range(args.runs)]
+    walls = [wall for wall, _ in runs]
+    modules = {name: statistics.median(r.get(name, 0) for _, r in runs) for name in runs[0][1]}
+    total_ms = statistics.median(sum(r.values()) for _, r in runs) / 1000
+
+    print(f"wall time     {statistics.median(walls) * 1000:8.0f} ms  (median of {args.runs})")
+    print(f"import time   {total_ms:8.0f} ms")
+    print("slowest top-level imports (cumulative ms):")
+    slowest = sorted(modules.items(), key=lambda kv: -kv[1])[:args.top]
+    for name, us in slowest:
+        print(f"  {us / 1000:8.1f}  {name}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"wall_ms": round(statistics.median(walls) * 1000, 1), "import_ms": round(total_ms, 1),
+                       "modules_ms": {name: round(us / 1000, 1) for name, us in slowest}}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
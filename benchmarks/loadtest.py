@@ -0,0 +1,87 @@
+"""
+Load test for the HTTP API. Start a local instance first:
+
+    uvicorn resumate.api:app --workers 4
+    python -m benchmarks.loadtest --endpoint score --resume sample.pdf --concurrency 32 --requests 2000
+
+Reports p50/p95/p99 latency and requests/sec.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from benchmarks.stats import percentile
+
+SAMPLE_JD = (
+    "Seeking a Full-Stack Python Developer with experience in Django, React, and AWS. "
+    "Must be familiar with Docker, Kubernetes, PostgreSQL and CI/CD pipelines."
+)
+
+
+def build_request(args, resume_bytes):
+    if args.endpoint == "keywords":
+        return {"url": "/keywords", "json": {"texts": [SAMPLE_JD]}}
+    if args.endpoint == "pdf":
+        return {"url": "/resume/pdf", "json": {"data": {"name": "Alex Johnson", "email": "alex@example.com",
+                                                        "skills": "Python, SQL, React"}}}
+    return {"url": "/score", "data": {"jd": SAMPLE_JD},
+            "files": [("files", ("resume.pdf", resume_bytes, "application/pdf"))]}
+
+
+async def run(args):
+    resume_bytes = b""
+    if args.endpoint == "score":
+        with open(args.resume, "rb") as f:
+            resume_bytes = f.read()
+
+    latencies = []
+    errors = 0
+    remaining = iter(range(args.requests))
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    response = await client.post(**build_request(args, resume_bytes))
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"endpoint     /{args.endpoint}  concurrency={args.concurrency}")
+    print(f"requests     {len(latencies)} ok, {errors} failed in {elapsed:.2f}s")
+    print(f"throughput   {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"latency ms   p50={percentile(latencies, 50) * 1000:.1f}  p95={percentile(latencies, 95) * 1000:.1f}  "
+              f"p99={percentile(latencies, 99) * 1000:.1f}  mean={statistics.mean(latencies) * 1000:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=["score", "keywords", "pdf"], default="keywords")
+    parser.add_argument("--resume", help="PDF/DOCX to upload for --endpoint score")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+    if args.endpoint == "score" and not args.resume:
+        parser.error("--resume is required for --endpoint score")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
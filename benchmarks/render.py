@@ -0,0 +1,57 @@
+"""
+Resume PDF throughput: one render_resume call after another in this
+process versus render_bulk into a ZIP with a process pool:
+
+    python -m benchmarks.render
+    python -m benchmarks.render --profiles 500 --workers 1 2 4 --json render.json
+
+The first render, which parses the font, is reported separately. Bulk
+timings include starting the pool, so each worker parses the font too.
+"""
+import argparse
+import io
+import json
+import os
+import time
+
+from benchmarks import corpus
+from resumate.pdf import TEMPLATES, render_bulk, render_resume
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=200, help="Profiles rendered per measurement")
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1],
+                        help="Bulk pool sizes to measure (0 renders in this process)")
+    parser.add_argument("--template", choices=list(TEMPLATES), default="Modern")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    profiles = [corpus.profile(seed) for seed in range(args.profiles)]
+    results = {}
+
+    start = time.perf_counter()
+    render_resume(profiles[0], template=args.template)
+    results["first_render_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    start = time.perf_counter()
+    for profile in profiles:
+        render_resume(profile, template=args.template)
+    results["single_pdfs_per_s"] = round(len(profiles) / (time.perf_counter() - start), 1)
+
+    print(f"first render (font parse)  {results['first_render_ms']:8.0f} ms")
+    print(f"single                     {results['single_pdfs_per_s']:8.1f} PDFs/s")
+    for workers in args.workers:
+        start = time.perf_counter()
+        count, _ = render_bulk(profiles, io.BytesIO(), template=args.template, workers=workers)
+        rate = round(count / (time.perf_counter() - start), 1)
+        results[f"bulk_pdfs_per_s[workers={workers}]"] = rate
+        print(f"bulk, {workers} workers{'':<10}{rate:8.1f} PDFs/s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark suite for the scoring pipeline. Runs offline against a synthetic
+corpus and writes a JSON report that can be diffed between versions:
+
+    python -m benchmarks.run --output report.json
+    python -m benchmarks.run --output new.json --compare report.json
+
+Each case reports throughput, latency percentiles and peak traced memory.
+Caching is disabled so every iteration does the real work.
+"""
+import os
+
+# Must happen before resumate.config is imported
+os.environ["RESUMATE_CACHE_MEMORY_ENTRIES"] = "0"
+os.environ["RESUMATE_EMBEDDING_CACHE_ENTRIES"] = "0"
+os.environ.pop("RESUMATE_CACHE_DIR", None)
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks import corpus
+from benchmarks.stats import summarize
+from resumate import config
+from resumate.extract import ExtractionLimits, extract_text
+from resumate.keywords import get_keywords
+from resumate.pdf import generate_resume_pdf
+from resumate.scoring import score_match
+from resumate.semantic import get_embedder, semantic_match
+
+PAGE_COUNTS = (1, 5, 20)
+JD_WORDS = (100, 500, 2000)
+NO_LIMITS = ExtractionLimits(max_pages=1000, max_bytes=1 << 30, max_seconds=3600)
+
+
+def build_cases(quick):
+    pages = PAGE_COUNTS[:2] if quick else PAGE_COUNTS
+    cases = {}
+    for n in pages:
+        pdf, docx, text = corpus.resume_pdf(n), corpus.resume_docx(n), corpus.resume_text(n)
+        cases[f"extract_pdf[pages={n}]"] = lambda pdf=pdf: extract_text("r.pdf", pdf, NO_LIMITS)
+        cases[f"extract_docx[pages={n}]"] = lambda docx=docx: extract_text("r.docx", docx, NO_LIMITS)
+        cases[f"keywords_resume[pages={n}]"] = lambda text=text: get_keywords(text)
+    for words in (JD_WORDS[:2] if quick else JD_WORDS):
+        jd = corpus.job_description(words)
+        cases[f"keywords_jd[words={words}]"] = lambda jd=jd: get_keywords(jd)
+
+    jd_results = get_keywords(corpus.job_description(300, seed=1))
+    resume_results = get_keywords(corpus.resume_text(2, seed=2))
+    cases["score_match"] = lambda: score_match(jd_results, resume_results)
+
+    jd_text, resume = corpus.job_description(300, seed=1), corpus.resume_text(2, seed=2)
+    cases[f"semantic_match[{get_embedder().name.split(':')[0]}]"] = lambda: semantic_match(jd_text, resume)
+
+    jd, pdf = corpus.job_description(300, seed=3), corpus.resume_pdf(2, seed=3)
+    cases["analyze[pages=2]"] = lambda: score_match(get_keywords(jd), get_keywords(extract_text("r.pdf", pdf, NO_LIMITS)))
+
+    data = corpus.profile()
+    cases["generate_resume_pdf"] = lambda: generate_resume_pdf(data, "#6366f1", "Modern")
+    return cases
+
+
+def measure(fn, min_iterations, min_seconds):
+    fn()  # warm-up: imports, model load, compiled regexes
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < min_iterations or time.perf_counter() - started < min_seconds:
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+        if len(latencies) >= 10 * min_iterations:
+            break
+    result = summarize(latencies)
+
+    # Separate pass: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    fn()
+    result["peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    tracemalloc.stop()
+    return result
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "keyword_mode": config.KEYWORD_MODE,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Prints p50/peak changes vs a baseline report; returns the regressed case names."""
+    regressions = []
+    print(f"\n{'case':<28} {'p50 ms':>18} {'peak KB':>22}")
+    for name, new in report["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            continue
+        flags = []
+        for metric in ("p50_ms", "peak_kb"):
+            if old[metric] and (new[metric] - old[metric]) / old[metric] > threshold:
+                flags.append(metric)
+        if flags:
+            regressions.append(name)
+        print(f"{name:<28} {old['p50_ms']:>8.2f} -> {new['p50_ms']:<8.2f} {old['peak_kb']:>10.1f} -> {new['peak_kb']:<10.1f}"
+              + ("  REGRESSION " + ",".join(flags) if flags else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark-report.json")
+    parser.add_argument("--compare", help="Baseline report to diff against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown counted as a regression")
+    parser.add_argument("--min-iterations", type=int, default=20)
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    parser.add_argument("--quick", action="store_true", help="Skip the largest documents")
+    parser.add_argument("-k", dest="filter", help="Only run cases containing this string")
+    args = parser.parse_args()
+
+    report = {"environment": environment(), "results": {}}
+    for name, fn in build_cases(args.quick).items():
+        if args.filter and args.filter not in name:
+            continue
+        result = measure(fn, args.min_iterations, args.min_seconds)
+        report["results"][name] = result
+        print(f"{name:<28} {result['throughput_per_s']:>9.1f}/s  p50={result['p50_ms']:.2f}ms  "
+              f"p95={result['p95_ms']:.2f}ms  p99={result['p99_ms']:.2f}ms  peak={result['peak_kb']:.0f}KB")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
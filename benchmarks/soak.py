@@ -0,0 +1,179 @@
+"""
+Soak test for upload handling: N concurrent sessions upload resumes and
+run Analyzer jobs (resumate.jobs) through an UploadStore, as the Streamlit
+pages do, while RSS is sampled for the process and its extraction workers.
+
+    python -m benchmarks.soak --sessions 20 --rounds 10 --pages 1 8
+    python -m benchmarks.soak --sessions 20 --spill-bytes 1000000000  # keep every upload in memory
+
+Every upload is a different synthetic resume, so nothing comes from the
+text cache. Reports peak RSS (Linux, from /proc; elsewhere only the
+process's ru_maxrss), peak bytes held by the store and job latencies.
+"""
+import argparse
+import io
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import active_children
+
+from benchmarks import corpus
+from benchmarks.stats import percentile
+from resumate.analysis import analysis_key, analyze_resume
+from resumate.extract import ExtractionError
+from resumate.jobs import JobQueueFull, get_job_manager
+from resumate.uploads import UploadStore
+
+SAMPLE_JD = (
+    "Seeking a Full-Stack Python Developer with experience in Django, React, and AWS. "
+    "Must be familiar with Docker, Kubernetes, PostgreSQL and CI/CD pipelines."
+)
+
+
+class UploadedFile(io.BytesIO):
+    """Stands in for Streamlit's UploadedFile (a BytesIO with a name and size)."""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+def rss(pid="self"):
+    """Resident set size of a process in bytes, or None where /proc isn't available."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class Sampler(threading.Thread):
+    """Samples the RSS of this process, its workers and the store's usage until stopped."""
+
+    def __init__(self, store, interval):
+        super().__init__(daemon=True)
+        self.store = store
+        self.interval = interval
+        self.peak = {"process": 0, "workers": 0, "total": 0, "store_memory": 0, "store_disk": 0}
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            own = rss() or 0
+            workers = sum(rss(p.pid) or 0 for p in active_children())
+            usage = self.store.usage()
+            for name, value in (("process", own), ("workers", workers), ("total", own + workers),
+                                ("store_memory", usage["memory_bytes"]), ("store_disk", usage["disk_bytes"])):
+                self.peak[name] = max(self.peak[name], value)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def generate(args, directory):
+    """Writes each session's resumes to `directory` up front, so making them isn't measured."""
+    for number in range(args.sessions):
+        rng = random.Random(number)
+        for round_number in range(args.rounds):
+            data = corpus.resume_pdf(rng.randint(*args.pages), seed=number * 100003 + round_number,
+                                     photo_kb=args.photo_kb)
+            with open(os.path.join(directory, f"s{number}-r{round_number}.pdf"), "wb") as f:
+                f.write(data)
+
+
+def session(number, args, directory, store, latencies, errors):
+    rng = random.Random(number)
+    for round_number in range(args.rounds):
+        name = f"s{number}-r{round_number}.pdf"
+        with open(os.path.join(directory, name), "rb") as f:
+            # Streamlit holds the uploaded file in memory until the widget changes
+            uploaded = UploadedFile(name, f.read())
+        start = time.perf_counter()
+        try:
+            upload = store.accept(str(number), name, uploaded)
+        except ExtractionError:
+            errors["rejected"] += 1
+            continue
+        while True:
+            try:
+                job = get_job_manager().submit(analysis_key(name, upload, SAMPLE_JD), analyze_resume, name, upload,
+                                               SAMPLE_JD)
+                break
+            except JobQueueFull:
+                time.sleep(0.05)
+        while not job.done:
+            time.sleep(0.02)
+        if job.status == "done":
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors["failed"] += 1
+        del uploaded
+        time.sleep(rng.uniform(0, args.think))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5, help="uploads per session")
+    parser.add_argument("--pages", type=int, nargs=2, default=(1, 8), metavar=("MIN", "MAX"),
+                        help="pages per resume, drawn uniformly")
+    parser.add_argument("--photo-kb", type=int, default=1500,
+                        help="size of the image in each resume (KB), which is what makes real uploads large")
+    parser.add_argument("--think", type=float, default=0.5, help="longest pause between a session's uploads (s)")
+    parser.add_argument("--spill-bytes", type=int, default=None, help="default: RESUMATE_UPLOAD_SPILL_BYTES")
+    parser.add_argument("--memory-budget", type=int, default=None, help="default: RESUMATE_UPLOAD_MEMORY_BUDGET")
+    parser.add_argument("--interval", type=float, default=0.05, help="RSS sampling interval (s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="resumate-soak-") as directory:
+        resumes = os.path.join(directory, "resumes")
+        os.mkdir(resumes)
+        generate(args, resumes)
+        store = UploadStore(os.path.join(directory, "uploads"), spill_bytes=args.spill_bytes,
+                            memory_budget=args.memory_budget)
+        baseline = rss()
+        sampler = Sampler(store, args.interval)
+        sampler.start()
+        latencies, errors = [], {"rejected": 0, "failed": 0}
+        threads = [threading.Thread(target=session, args=(n, args, resumes, store, latencies, errors))
+                   for n in range(args.sessions)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+
+    mb = 1024 * 1024
+    peak = sampler.peak
+    print(f"sessions     {args.sessions} x {args.rounds} uploads of {args.pages[0]}-{args.pages[1]} pages "
+          f"with a {args.photo_kb} KB image, "
+          f"spill over {store.spill_bytes / mb:g} MB, memory budget {store.memory_budget / mb:g} MB")
+    print(f"jobs         {len(latencies)} done, {errors['failed']} failed, {errors['rejected']} rejected "
+          f"in {elapsed:.1f}s ({len(latencies) / elapsed:.1f}/s)")
+    if latencies:
+        latencies.sort()
+        print(f"latency ms   p50={percentile(latencies, 50) * 1000:.0f}  p95={percentile(latencies, 95) * 1000:.0f}  "
+              f"p99={percentile(latencies, 99) * 1000:.0f}")
+    if baseline is not None:
+        print(f"peak RSS     process {peak['process'] / mb:.1f} MB (started at {baseline / mb:.1f} MB), "
+              f"workers {peak['workers'] / mb:.1f} MB, total {peak['total'] / mb:.1f} MB")
+    else:
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"peak RSS     process {maxrss / (mb if sys.platform == 'darwin' else 1024):.1f} MB")
+    print(f"store peak   {peak['store_memory'] / mb:.2f} MB in memory, {peak['store_disk'] / mb:.2f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import statistics
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies):
+    """Latency percentiles (ms) and throughput for a list of durations in seconds."""
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "n": len(latencies),
+        "throughput_per_s": round(len(latencies) / total, 2) if total else None,
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
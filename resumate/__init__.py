@@ -0,0 +1,27 @@
+"""
+Core matching logic for ResuMate AI, usable without Streamlit:
+
+    from resumate import extract_document, get_keywords, score_match
+
+The names below are imported on first use, so `import resumate.config` (or
+any light submodule) doesn't pay for pdfminer, NumPy or SciPy.
+"""
+import importlib
+
+_EXPORTS = {
+    "ExtractionError": "resumate.extract",
+    "extract_document": "resumate.extract",
+    "get_keywords": "resumate.keywords",
+    "get_keywords_batch": "resumate.keywords",
+    "parse_resume": "resumate.sections",
+    "score_match": "resumate.scoring",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'resumate' has no attribute '{name}'")
+    return getattr(importlib.import_module(module), name)
@@ -0,0 +1,5 @@
+import sys
+
+from resumate.cli import main
+
+sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+The Analyzer and Batch Analyzer pipelines as job functions for
+resumate.jobs: each takes the Job first, reports progress through it and
+returns a plain dict the page renders once the job is done.
+"""
+import json
+from contextlib import nullcontext
+
+from resumate import config
+from resumate.batch import extract_many, get_extraction_pool
+from resumate.cache import content_key
+from resumate.extract import ExtractionError, content_digest
+from resumate.keywords import get_keywords, get_keywords_batch
+from resumate.metrics import StageTimer, capture_profile
+from resumate.ocr import ocr_report
+from resumate.scoring import score_match, score_matrix, score_sections
+from resumate.sections import parse_resume, section_keywords
+from resumate.semantic import get_embedder, semantic_match
+from resumate.taxonomy import get_taxonomy
+
+
+def _settings_key(*parts):
+    # Results also depend on the skill list and keyword mode
+    return content_key(*parts, get_taxonomy().fingerprint, config.KEYWORD_MODE)
+
+
+def analysis_key(filename, data, jd_text, semantic=False, profiler=None):
+    """Job key for analyze_resume: identical inputs share one job."""
+    return _settings_key("analyze", filename, content_digest(data), jd_text, str(bool(semantic)), profiler or "")
+
+
+def analyze_resume(job, filename, data, jd_text, semantic=False, profiler=None, stages=None):
+    """
+    Scores one resume (bytes or an Upload) against a JD. Text extraction
+    runs in the shared process pool, with scanned pages OCR'd (the "ocr"
+    report, or None); `profiler` ("cprofile"/"pyinstrument") profiles this thread.
+    `stages` are times the page already measured (reading the upload).
+    """
+    timer = StageTimer("analyzer", stages=stages)
+    profile = capture_profile(profiler) if profiler else nullcontext({})
+    with profile as profile_result:
+        job.report(0.1, "Extracting text...")
+        with timer.stage("extract"):
+            _, text, error = next(extract_many([(filename, data)], pool=get_extraction_pool()))
+        if error:
+            raise ExtractionError(error)
+
+        job.report(0.5, "Matching skills...")
+        with timer.stage("keywords_resume"):
+            resume_results = get_keywords(text)
+        with timer.stage("keywords_jd"):
+            jd_results = get_keywords(jd_text)
+        with timer.stage("scoring"):
+            score, found_dict, missing_dict, total_found, total_jd = score_match(jd_results, resume_results)
+        with timer.stage("sections"):
+            doc = parse_resume(text)
+            section_score, skill_sections = score_sections(jd_results, section_keywords(doc))
+
+        semantic_result = None
+        if semantic:
+            job.report(0.7, "Matching requirements by meaning...")
+            with timer.stage("semantic"):
+                semantic_result = semantic_match(jd_text, text)
+                semantic_result["backend"] = get_embedder().name.split(":")[0]
+
+    timer.finish(score=score, file_bytes=len(data))
+    return {
+        "score": score,
+        "found": found_dict,
+        "missing": missing_dict,
+        "total_found": total_found,
+        "total_jd": total_jd,
+        "section_score": section_score,
+        "skill_sections": skill_sections,
+        "resume_profile": doc.to_profile(),
+        "semantic": semantic_result,
+        "ocr": ocr_report(filename, data),
+        "stages": dict(timer.stages),
+        "total": timer.total,
+        "request_id": timer.request_id,
+        "profile": profile_result.get("report", ""),
+    }
+
+
+def ranking_key(items, jd_text, category_weights=None, required=None, idf=False):
+    """Job key for rank_resumes."""
+    parts = [part for name, data in items for part in (name, content_digest(data))]
+    settings = json.dumps([category_weights or {}, sorted(required or ()), bool(idf)], sort_keys=True)
+    return _settings_key("rank", jd_text, settings, *parts)
+
+
+def rank_resumes(job, items, jd_text, category_weights=None, required=None, idf=False):
+    """
+    Ranks (name, bytes or Upload) resumes against a JD. Rows are published as partial
+    results after every nlp.pipe batch; returns the final rows, best first.
+    """
+    # JD keywords are computed once for the whole batch
+    jd_results = get_keywords(jd_text)
+    rows = []
+    pending = []
+    scored = []  # (row, keywords) for the final IDF pass
+
+    job.report(0.0, f"Extracting {len(items)} resumes...")
+    for done, (name, text, error) in enumerate(extract_many(items, pool=get_extraction_pool()), start=1):
+        if error:
+            rows.append({"candidate": name, "score": None, "matched": "", "missing": "", "error": error})
+        else:
+            pending.append((name, text))
+
+        # Score extracted resumes in nlp.pipe batches and stream them out
+        if len(pending) >= config.NLP_BATCH_SIZE or done == len(items):
+            batch_results = get_keywords_batch([t for _, t in pending])
+            weighted = score_matrix([jd_results], batch_results, category_weights, required)[0] if pending else []
+            for (cand, _), res, score in zip(pending, batch_results, weighted):
+                _, found_dict, missing_dict, _, _ = score_match(jd_results, res)
+                rows.append({
+                    "candidate": cand,
+                    "score": round(score),
+                    "matched": ", ".join(k for ks in found_dict.values() for k in ks),
+                    "missing": ", ".join(k for ks in missing_dict.values() for k in ks),
+                    "error": "",
+                })
+                scored.append((rows[-1], res))
+            pending.clear()
+            job.report(partial=list(rows))
+        job.report(done / len(items), f"Processed {done}/{len(items)} resumes")
+
+    # Rarity weights need the whole pool, so rescore it in one matrix product
+    if idf and scored:
+        final = score_matrix([jd_results], [res for _, res in scored], category_weights, required, idf=True)[0]
+        for (row, _), score in zip(scored, final):
+            row["score"] = round(score)
+
+    return sorted(rows, key=lambda r: (r["score"] is None, -(r["score"] or 0)))
@@ -0,0 +1,233 @@
+"""
+HTTP scoring API.
+
+    uvicorn resumate.api:app --workers 4
+
+Each worker loads the spaCy model once at startup, extracts uploads in a
+bounded process pool and micro-batches concurrent keyword requests into a
+single nlp.pipe call.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse, Response
+from pydantic import BaseModel, Field
+
+from resumate import config
+from resumate.cache import get_cache
+from resumate.extract import ExtractionError, extract_text, text_cache_key
+from resumate.keywords import get_keywords_batch, get_nlp
+from resumate.metrics import REGISTRY, StageTimer
+from resumate.ocr import recover_text
+from resumate.pdf import DEFAULT_ACCENT, TEMPLATES, generate_resume_pdf
+from resumate.scoring import score_match
+
+
+class KeywordBatcher:
+    """
+    Collects texts from concurrent requests for up to `max_wait` seconds (or
+    `max_size` texts) and runs them through get_keywords_batch together.
+    """
+
+    def __init__(self, max_size=32, max_wait=0.005):
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, texts):
+        futures = []
+        for text in texts:
+            future = asyncio.get_running_loop().create_future()
+            await self._queue.put((text, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                # spaCy holds the GIL for most of the work but releases the
+                # event loop while it runs in the default thread pool.
+                results = await loop.run_in_executor(None, get_keywords_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class KeywordsRequest(BaseModel):
+    texts: List[str]
+
+
+class ResumeData(BaseModel):
+    name: str
+    email: str
+    phone: str = ""
+    location: str = ""
+    linkedin: str = ""
+    summary: str = ""
+    education: str = ""
+    experience: str = ""
+    skills: str = ""
+    projects: str = ""
+
+
+class ResumePdfRequest(BaseModel):
+    data: ResumeData
+    # Rejected with a 422 here rather than failing in the renderer
+    accent_color: str = Field(DEFAULT_ACCENT, pattern=r"^#?[0-9a-fA-F]{6}$")
+    layout_style: str = "Modern"
+
+
+class ScoreResult(BaseModel):
+    file: str
+    score: Optional[int]
+    found: Dict[str, List[str]] = {}
+    missing: Dict[str, List[str]] = {}
+    semantic_score: Optional[int] = None
+    error: Optional[str] = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Warm the model once per worker so the first request doesn't pay for it
+    await asyncio.get_running_loop().run_in_executor(None, get_nlp)
+    app.state.pool = ProcessPoolExecutor(
+        max_workers=config.API_EXTRACT_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    # Uploads currently queued on or running in the pool
+    app.state.pending_extractions = 0
+    app.state.batcher = KeywordBatcher(config.NLP_BATCH_SIZE, config.API_BATCH_WAIT_MS / 1000)
+    app.state.batcher.start()
+    try:
+        yield
+    finally:
+        await app.state.batcher.stop()
+        app.state.pool.shutdown(cancel_futures=True)
+
+
+app = FastAPI(title="ResuMate AI", lifespan=lifespan)
+
+
+async def _extract(upload):
+    data = await upload.read()
+    cache = get_cache()
+    key = text_cache_key(upload.filename, data)
+    text = cache.get(key)
+    if text is not None:
+        return text
+
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(app.state.pool, extract_text, upload.filename, data)
+    # Only waits on the OCR pool, and only for PDFs with pages without text
+    text, complete = await loop.run_in_executor(None, recover_text, upload.filename, data, text)
+    if complete:
+        cache.set(key, text)
+    return text
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok", "keyword_mode": config.KEYWORD_MODE}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return REGISTRY.render_prometheus()
+
+
+@app.post("/keywords")
+async def keywords(request: KeywordsRequest):
+    if len(request.texts) > config.API_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {config.API_MAX_BATCH} texts per request")
+    return {"results": await app.state.batcher.submit(request.texts)}
+
+
+@app.post("/score", response_model=List[ScoreResult])
+async def score(jd: str = Form(...), files: List[UploadFile] = File(...), semantic: bool = Form(False)):
+    if len(files) > config.API_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {config.API_MAX_BATCH} files per request")
+    # Backpressure: refuse work instead of queueing without bound
+    if app.state.pending_extractions + len(files) > config.API_MAX_PENDING_EXTRACTIONS:
+        raise HTTPException(status_code=503, detail="Extraction queue is full, retry later")
+
+    async def extract_one(upload):
+        try:
+            return await _extract(upload), None
+        except ExtractionError as e:
+            return None, str(e)
+
+    timer = StageTimer("api_score")
+    app.state.pending_extractions += len(files)
+    try:
+        with timer.stage("extract"):
+            extracted = await asyncio.gather(*(extract_one(f) for f in files))
+    finally:
+        app.state.pending_extractions -= len(files)
+    texts = [text for text, error in extracted if error is None]
+    with timer.stage("keywords"):
+        jd_results, *resume_results = await app.state.batcher.submit([jd, *texts])
+    semantic_results = [None] * len(texts)
+    if semantic and texts:
+        from resumate.semantic import semantic_match_many
+
+        with timer.stage("semantic"):
+            semantic_results = await asyncio.get_running_loop().run_in_executor(None, semantic_match_many, jd, texts)
+
+    results = []
+    resume_results = iter(zip(resume_results, semantic_results))
+    with timer.stage("scoring"):
+        for upload, (text, error) in zip(files, extracted):
+            if error:
+                results.append(ScoreResult(file=upload.filename, score=None, error=error))
+                continue
+            keywords, semantic_result = next(resume_results)
+            score_value, found_dict, missing_dict, _, _ = score_match(jd_results, keywords)
+            results.append(ScoreResult(file=upload.filename, score=score_value, found=found_dict, missing=missing_dict,
+                                       semantic_score=semantic_result and semantic_result["score"]))
+    timer.finish(files=len(files))
+    return sorted(results, key=lambda r: (r.score is None, -(r.score or 0)))
+
+
+@app.post("/resume/pdf")
+async def resume_pdf(request: ResumePdfRequest):
+    if request.layout_style not in TEMPLATES:
+        raise HTTPException(status_code=422, detail=f"layout_style must be one of {', '.join(TEMPLATES)}")
+    pdf_bytes = await asyncio.get_running_loop().run_in_executor(
+        None, generate_resume_pdf, request.data.model_dump(), request.accent_color, request.layout_style
+    )
+    return Response(content=bytes(pdf_bytes), media_type="application/pdf")
@@ -0,0 +1,114 @@
+"""
+Helpers for scoring many resumes against one job description.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from resumate import config
+from resumate.cache import get_cache
+from resumate.extract import ExtractionError, extract_text, text_cache_key
+from resumate.ocr import recover_text
+from resumate.uploads import Upload
+
+
+def _extract(filename, data):
+    try:
+        return extract_text(filename, data), None
+    except ExtractionError as e:
+        return None, str(e)
+
+
+def extract_many(items, max_workers=None, pool=None):
+    """
+    Extracts text from (name, bytes or Upload) pairs in a process pool,
+    yielding (name, text, error) as each document finishes; scanned pages
+    are OCR'd (resumate.ocr) before a text is yielded. Cached texts are
+    yielded first without touching the pool. Uploads are released once
+    their text is cached, before it is yielded. Pass `pool` to use a shared executor
+    instead of starting one; closing the generator early cancels whatever
+    has not started yet.
+    """
+    cache = get_cache()
+    pending = []
+    for name, data in items:
+        key = text_cache_key(name, data)
+        text = cache.get(key)
+        if text is not None:
+            _release(data)
+            yield name, text, None
+        else:
+            pending.append((name, data, key))
+
+    if not pending:
+        return
+
+    own_pool = pool is None
+    if own_pool:
+        pool = _new_pool(max_workers)
+    futures = {pool.submit(_extract, name, data): (name, data, key) for name, data, key in pending}
+    try:
+        for future in as_completed(futures):
+            name, data, key = futures[future]
+            try:
+                text, error = future.result()
+            except Exception as e:
+                text, error = None, f"Error extracting text: {e}"
+            if error is None:
+                text, complete = recover_text(name, data, text)
+                if complete:
+                    cache.set(key, text)
+            _release(data)
+            yield name, text, error
+    finally:
+        for future in futures:
+            future.cancel()
+        if own_pool:
+            pool.shutdown()
+
+
+def _release(data):
+    # Nothing else reads an upload once extract_many is done with it
+    if isinstance(data, Upload):
+        data.release()
+
+
+def _new_pool(max_workers):
+    # pdfminer is pure Python and holds the GIL, so use processes; spawn
+    # avoids forking the server's threads into the workers.
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """Process pool shared by the app's background jobs (JOB_EXTRACT_WORKERS processes)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = _new_pool(config.JOB_EXTRACT_WORKERS)
+                _start_workers(pool, config.JOB_EXTRACT_WORKERS)
+                _pool = pool
+    return _pool
+
+
+def _start_workers(pool, count):
+    """
+    Starts all of a pool's workers now. A spawned worker re-runs the parent's
+    __main__ script by path on start-up; under Streamlit that script is the
+    whole app (model load included), so its __file__ is hidden meanwhile.
+    """
+    main = sys.modules.get("__main__")
+    path = main.__dict__.pop("__file__", None) if main is not None else None
+    try:
+        # Each submit spawns another worker while none is idle yet
+        for _ in range(count):
+            pool.submit(os.getpid)
+    finally:
+        if path is not None:
+            main.__file__ = path
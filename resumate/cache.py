@@ -0,0 +1,176 @@
+"""
+Content-addressed cache for extracted text and keyword results.
+
+Entries are keyed by a SHA-256 of their inputs, so the same upload or JD is
+only processed once. An in-memory LRU tier sits in front of an optional
+SQLite tier that survives restarts and is shared between worker processes.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from resumate import config
+
+
+def content_key(*parts):
+    """SHA-256 over the given str/bytes parts, usable as a cache key."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache bounded by number of entries."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """
+    SQLite-backed cache for JSON-serializable values, bounded by total value
+    size (least recently used entries are evicted first) and by entry age.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, ttl=7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _connect(self):
+        # A short-lived connection per call keeps this safe to use from any
+        # thread or process.
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return default
+            if self.ttl and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return default
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        blob = json.dumps(value).encode("utf-8")
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        if self.ttl:
+            conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+
+class TieredCache:
+    """Memory LRU in front of an optional disk tier; disk hits are promoted."""
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key, default=None):
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+                return value
+        return default
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache configured from resumate.config."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk = None
+                if config.CACHE_DIR:
+                    disk = DiskCache(
+                        os.path.join(config.CACHE_DIR, "resumate-cache.sqlite3"),
+                        max_bytes=config.CACHE_MAX_BYTES,
+                        ttl=config.CACHE_TTL,
+                    )
+                _cache = TieredCache(LRUCache(config.CACHE_MEMORY_ENTRIES), disk)
+    return _cache
@@ -0,0 +1,311 @@
+"""
+Command-line interface for headless scoring:
+
+    resumate score --jd jd.txt resumes/*.pdf --jobs 4 --json
+    resumate pool add --db pool.db resumes/*.pdf
+    resumate pool search --db pool.db --jd jd.txt --top 20
+    resumate render profiles.csv --out resumes.zip --template Compact
+    resumate feed ingest --db jobs.db postings.jsonl
+    resumate feed match --db jobs.db resume.pdf --top 20
+    resumate check
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from resumate import config
+from resumate.batch import extract_many
+from resumate.extract import SUPPORTED_EXTENSIONS, ExtractionError, extract_document, file_extension
+from resumate.keywords import ModelNotInstalled, get_keywords, get_keywords_batch, get_nlp
+from resumate.scoring import score_match, score_matrix
+from resumate.taxonomy import get_taxonomy
+
+
+def read_jd(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if file_extension(path) in SUPPORTED_EXTENSIONS:
+        try:
+            return extract_document(path, data)
+        except ExtractionError as e:
+            raise ExtractionError(f"cannot read {path}: {e}") from e
+    return data.decode("utf-8", errors="replace")
+
+
+def score_command(args):
+    args.weight = dict(args.weight)
+    jd_text = read_jd(args.jd)
+    jd_results = get_keywords(jd_text)
+
+    items = []
+    for path in args.resumes:
+        with open(path, "rb") as f:
+            items.append((path, f.read()))
+
+    rows = []
+    extracted = []
+    for path, text, error in extract_many(items, args.jobs):
+        if error:
+            rows.append({"file": path, "score": None, "found": {}, "missing": {}, "error": error})
+        else:
+            extracted.append((path, text))
+
+    resume_results = get_keywords_batch([text for _, text in extracted])
+    # The whole pool is scored in one sparse matrix product
+    scores = []
+    semantic = [None] * len(extracted)
+    semantic_ms = 0.0
+    if args.semantic and extracted:
+        from resumate.semantic import semantic_match_many
+
+        start = time.perf_counter()
+        semantic = semantic_match_many(jd_text, [text for _, text in extracted])
+        semantic_ms = (time.perf_counter() - start) * 1000
+    if resume_results:
+        required = {get_taxonomy().canonical(skill) or skill for skill in args.required}
+        scores = score_matrix([jd_results], resume_results, args.weight, required, idf=args.idf)[0]
+    for (path, _), res, score, sem in zip(extracted, resume_results, scores, semantic):
+        _, found_dict, missing_dict, _, _ = score_match(jd_results, res)
+        row = {"file": path, "score": round(score), "found": found_dict, "missing": missing_dict, "error": None}
+        if sem is not None:
+            row["semantic_score"] = sem["score"]
+            row["semantic_matches"] = sem["matches"]
+        rows.append(row)
+
+    rows.sort(key=lambda r: (r["score"] is None, -(r["score"] or 0), r["file"]))
+
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for r in rows:
+            if r["error"]:
+                print(f"  --  {r['file']}  ({r['error']})")
+            else:
+                missing = ", ".join(k for ks in r["missing"].values() for k in ks)
+                semantic_note = f"  (semantic {r['semantic_score']}%)" if "semantic_score" in r else ""
+                print(f"{r['score']:>3}%  {r['file']}{semantic_note}" + (f"  missing: {missing}" if missing else ""))
+    if args.semantic:
+        print(f"semantic matching added {semantic_ms:.0f} ms", file=sys.stderr)
+
+    return 1 if any(r["error"] for r in rows) else 0
+
+
+def pool_add_command(args):
+    from resumate.store import CandidateStore
+
+    store = CandidateStore(args.db)
+    items = []
+    for path in args.resumes:
+        with open(path, "rb") as f:
+            items.append((path, f.read()))
+
+    failed = 0
+    extracted = []
+    for path, text, error in extract_many(items, args.jobs):
+        if error:
+            print(f"skipped {path}: {error}", file=sys.stderr)
+            failed += 1
+        else:
+            extracted.append((path, text))
+
+    for (path, text), keywords in zip(extracted, get_keywords_batch([text for _, text in extracted])):
+        store.upsert(os.path.abspath(path), text, name=os.path.basename(path), keywords=keywords)
+    refreshed = store.refresh_stale()
+    print(f"Indexed {len(extracted)} resumes ({refreshed} re-keyed for a new taxonomy); pool size {len(store)}")
+    store.close()
+    return 1 if failed else 0
+
+
+def pool_remove_command(args):
+    from resumate.store import CandidateStore
+
+    store = CandidateStore(args.db)
+    missing = [path for path in args.resumes if not store.remove(os.path.abspath(path))]
+    store.close()
+    for path in missing:
+        print(f"not in pool: {path}", file=sys.stderr)
+    return 1 if missing else 0
+
+
+def pool_search_command(args):
+    from resumate.store import CandidateStore, MappedSkillIndex
+
+    store = CandidateStore(args.db)
+    index = MappedSkillIndex(store.index_path) if os.path.exists(store.index_path) else None
+    results = store.search(get_keywords(read_jd(args.jd)), top_k=args.top, index=index)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for r in results:
+            print(f"{r['score']:>3}%  {r['name']}  ({r['external_id']})")
+    return 0
+
+
+def render_command(args):
+    from resumate.pdf import iter_profiles, render_bulk
+
+    with open(args.profiles, "rb") as f:
+        profiles = list(iter_profiles(args.profiles, f.read()))
+    start = time.perf_counter()
+    count, errors = render_bulk(profiles, args.out, args.color, args.template, workers=args.jobs)
+    elapsed = time.perf_counter() - start
+    for row, error in errors:
+        print(f"skipped profile {row}: {error}", file=sys.stderr)
+    print(f"Rendered {count} resumes to {args.out} in {elapsed:.1f} s ({count / elapsed:.1f} PDFs/s)")
+    return 1 if errors else 0
+
+
+def feed_ingest_command(args):
+    import itertools
+
+    from resumate.jobfeed import JobStore, iter_postings
+
+    store = JobStore(args.db, threshold=args.threshold)
+    postings = itertools.chain.from_iterable(iter_postings(path) for path in args.feeds)
+
+    def progress(stats):
+        print(f"\r{stats['read']} postings read, {stats['duplicate']} duplicates", end="", file=sys.stderr)
+
+    start = time.perf_counter()
+    stats = store.ingest(postings, chunk_size=args.chunk_size, progress=progress)
+    refreshed = store.refresh_stale()
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    print(f"Read {stats['read']} postings in {elapsed:.1f} s ({stats['read'] / max(elapsed, 1e-9):.0f}/s): "
+          f"{stats['new']} new, {stats['updated']} updated, {stats['unchanged']} unchanged, "
+          f"{stats['duplicate']} duplicates ({refreshed} re-keyed for a new taxonomy); "
+          f"{len(store)} unique postings stored")
+    store.close()
+    return 0
+
+
+def feed_match_command(args):
+    from resumate.jobfeed import JobStore
+    from resumate.store import MappedSkillIndex
+
+    store = JobStore(args.db)
+    index = MappedSkillIndex(store.index_path) if os.path.exists(store.index_path) else None
+    results = store.match(get_keywords(read_jd(args.resume)), top_k=args.top, min_score=args.min_score, index=index)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for r in results:
+            where = " · ".join(v for v in (r["company"], r["location"]) if v)
+            reposts = f"  (+{r['reposts']} reposts)" if r["reposts"] else ""
+            print(f"{r['score']:>3}%  {r['title'] or r['external_id']}" + (f"  {where}" if where else "") + reposts)
+    return 0
+
+
+def check_command(args):
+    """Verifies, offline, that the configured keyword mode can run."""
+    if config.KEYWORD_MODE != "spacy":
+        print(f"keyword mode '{config.KEYWORD_MODE}': no spaCy model needed")
+        return 0
+    start = time.perf_counter()
+    nlp = get_nlp()
+    print(f"spaCy model '{config.SPACY_MODEL}' loaded in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"(pipeline: {', '.join(nlp.pipe_names)})")
+    return 0
+
+
+def category_weight(value):
+    category, _, weight = value.rpartition("=")
+    if not category:
+        raise argparse.ArgumentTypeError("expected CATEGORY=WEIGHT")
+    return category, float(weight)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="resumate", description="ResuMate AI headless tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    score = sub.add_parser("score", help="Score resumes against a job description")
+    score.add_argument("--jd", required=True, help="Job description (.txt, .pdf or .docx)")
+    score.add_argument("resumes", nargs="+", help="Resume files (.pdf or .docx)")
+    score.add_argument("--jobs", type=int, default=None, help="Extraction processes (default: one per CPU)")
+    score.add_argument("--json", action="store_true", help="Print results as JSON")
+    score.add_argument("--weight", type=category_weight, action="append", default=[], metavar="CATEGORY=WEIGHT",
+                       help='Weight for a skill category, e.g. --weight "Soft Skills=0.5" (repeatable)')
+    score.add_argument("--required", action="append", default=[], metavar="SKILL",
+                       help="Skill that counts double (repeatable)")
+    score.add_argument("--idf", action="store_true", help="Weight rare skills higher across the scored resumes")
+    score.add_argument("--semantic", action="store_true",
+                       help="Also report how many JD requirements each resume covers by meaning")
+    score.set_defaults(func=score_command)
+
+    pool = sub.add_parser("pool", help="Manage a stored candidate pool").add_subparsers(dest="pool_command", required=True)
+
+    add = pool.add_parser("add", help="Add or update resumes in the pool")
+    add.add_argument("--db", required=True, help="Pool database (created if missing)")
+    add.add_argument("resumes", nargs="+")
+    add.add_argument("--jobs", type=int, default=None, help="Extraction processes (default: one per CPU)")
+    add.set_defaults(func=pool_add_command)
+
+    remove = pool.add_parser("remove", help="Remove resumes from the pool")
+    remove.add_argument("--db", required=True)
+    remove.add_argument("resumes", nargs="+")
+    remove.set_defaults(func=pool_remove_command)
+
+    search = pool.add_parser("search", help="Rank pooled candidates against a job description")
+    search.add_argument("--db", required=True)
+    search.add_argument("--jd", required=True, help="Job description (.txt, .pdf or .docx)")
+    search.add_argument("--top", type=int, default=20)
+    search.add_argument("--json", action="store_true")
+    search.set_defaults(func=pool_search_command)
+
+    from resumate.pdf import DEFAULT_ACCENT, TEMPLATES
+
+    render = sub.add_parser("render", help="Render a CSV/JSONL file of profiles into a ZIP of resume PDFs")
+    render.add_argument("profiles", help="Profiles, one per row/line (.csv, .jsonl or a .json list)")
+    render.add_argument("--out", required=True, help="ZIP file to write")
+    render.add_argument("--template", choices=list(TEMPLATES), default="Modern")
+    render.add_argument("--color", default=DEFAULT_ACCENT, help="Accent color as #rrggbb")
+    render.add_argument("--jobs", type=int, default=None,
+                        help="Rendering processes (default: RESUMATE_PDF_WORKERS or one per CPU; 0 renders inline)")
+    render.set_defaults(func=render_command)
+
+    feed = sub.add_parser("feed", help="Ingest job postings and match a resume against them").add_subparsers(
+        dest="feed_command", required=True)
+
+    ingest = feed.add_parser("ingest", help="Add or update postings from JSONL/CSV feeds, skipping reposts")
+    ingest.add_argument("--db", required=True, help="Postings database (created if missing)")
+    ingest.add_argument("feeds", nargs="+", help="Feed files (.jsonl or .csv), one posting per line/row")
+    ingest.add_argument("--threshold", type=float, default=0.8,
+                        help="Estimated text similarity at which a posting counts as a repost (default 0.8)")
+    ingest.add_argument("--chunk-size", type=int, default=256, help="Postings deduplicated and analyzed per batch")
+    ingest.set_defaults(func=feed_ingest_command)
+
+    match = feed.add_parser("match", help="Rank stored postings against a resume")
+    match.add_argument("--db", required=True)
+    match.add_argument("resume", help="Resume (.pdf, .docx or .txt)")
+    match.add_argument("--top", type=int, default=20)
+    match.add_argument("--min-score", type=float, default=0)
+    match.add_argument("--json", action="store_true")
+    match.set_defaults(func=feed_match_command)
+
+    check = sub.add_parser("check", help="Check that the spaCy model is installed and loads (no download)")
+    check.set_defaults(func=check_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except ModelNotInstalled as e:
+        print(e, file=sys.stderr)
+        return 2
+    except ExtractionError as e:
+        # Resumes that can't be read are skipped; a JD that can't be read ends the command
+        print(e, file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
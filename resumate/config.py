@@ -0,0 +1,118 @@
+"""
+Runtime settings, read once from environment variables.
+"""
+import os
+
+# "spacy": POS-tag the text and run the phrase matcher.
+# "matcher": skip spaCy entirely and rely on the compiled phrase matcher.
+KEYWORD_MODE = os.environ.get("RESUMATE_KEYWORD_MODE", "spacy").lower()
+if KEYWORD_MODE not in ("spacy", "matcher"):
+    raise ValueError(f"RESUMATE_KEYWORD_MODE must be 'spacy' or 'matcher', not '{KEYWORD_MODE}'")
+
+SPACY_MODEL = os.environ.get("RESUMATE_SPACY_MODEL", "en_core_web_sm")
+
+# Keyword extraction only reads token.pos_ and token.is_stop, which need the
+# tagger and attribute_ruler; these components are never loaded.
+SPACY_EXCLUDE = ("parser", "ner", "lemmatizer", "senter")
+
+# Skill taxonomy file; None uses the bundled resumate/data/skills.json
+TAXONOMY_PATH = os.environ.get("RESUMATE_TAXONOMY")
+
+# Cache for extracted text and keyword results. The disk tier is only used
+# when RESUMATE_CACHE_DIR is set.
+CACHE_MEMORY_ENTRIES = int(os.environ.get("RESUMATE_CACHE_MEMORY_ENTRIES", "256"))
+CACHE_DIR = os.environ.get("RESUMATE_CACHE_DIR")
+CACHE_MAX_BYTES = int(os.environ.get("RESUMATE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_TTL = int(os.environ.get("RESUMATE_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Batch size / process count passed to spaCy's nlp.pipe by the Batch
+# Analyzer (its text extraction uses the job pool, JOB_EXTRACT_WORKERS).
+NLP_BATCH_SIZE = int(os.environ.get("RESUMATE_NLP_BATCH_SIZE", "32"))
+NLP_PROCESSES = int(os.environ.get("RESUMATE_NLP_PROCESSES", "1"))
+
+# Background jobs (resumate.jobs) for the Streamlit pages: threads running
+# analyses, how many jobs may be queued or running before new ones are
+# refused, extraction processes shared by all jobs, and how long a finished
+# job is kept so resubmitting the same inputs reuses its result.
+JOB_WORKERS = int(os.environ.get("RESUMATE_JOB_WORKERS", "2"))
+JOB_MAX_PENDING = int(os.environ.get("RESUMATE_JOB_MAX_PENDING", "16"))
+JOB_EXTRACT_WORKERS = int(os.environ.get("RESUMATE_JOB_EXTRACT_WORKERS", "2"))
+JOB_RESULT_TTL = int(os.environ.get("RESUMATE_JOB_RESULT_TTL", "900"))
+
+# HTTP API (resumate.api): extraction processes per worker, how many uploads
+# may wait for them before requests get a 503, the largest accepted batch and
+# how long concurrent keyword requests are held to be batched together.
+API_EXTRACT_WORKERS = int(os.environ.get("RESUMATE_API_EXTRACT_WORKERS", "2"))
+API_MAX_PENDING_EXTRACTIONS = int(os.environ.get("RESUMATE_API_MAX_PENDING_EXTRACTIONS", "1000"))
+API_MAX_BATCH = int(os.environ.get("RESUMATE_API_MAX_BATCH", "500"))
+API_BATCH_WAIT_MS = float(os.environ.get("RESUMATE_API_BATCH_WAIT_MS", "5"))
+
+# Extraction limits: documents past any of these are rejected with a message
+# naming the limit instead of tying up a worker.
+EXTRACT_MAX_PAGES = int(os.environ.get("RESUMATE_EXTRACT_MAX_PAGES", "20"))
+EXTRACT_MAX_BYTES = int(os.environ.get("RESUMATE_EXTRACT_MAX_BYTES", str(10 * 1024 * 1024)))
+EXTRACT_MAX_SECONDS = float(os.environ.get("RESUMATE_EXTRACT_MAX_SECONDS", "15"))
+
+# Uploads in the Streamlit pages (resumate.uploads). Files over
+# UPLOAD_SPILL_BYTES are written to a temp file in UPLOAD_DIR (default: the
+# system temp directory) and memory-mapped for extraction. A session may
+# hold UPLOAD_SESSION_MAX_BYTES of uploads waiting to be extracted, and all
+# sessions UPLOAD_MEMORY_BUDGET in memory (past that, the least recently
+# active sessions' uploads are moved to disk); a session idle for
+# UPLOAD_IDLE_SECONDS has its uploads deleted. A DOCX may unpack to at most
+# UPLOAD_MAX_UNPACKED_BYTES.
+UPLOAD_SPILL_BYTES = int(os.environ.get("RESUMATE_UPLOAD_SPILL_BYTES", str(1024 * 1024)))
+UPLOAD_DIR = os.environ.get("RESUMATE_UPLOAD_DIR")
+UPLOAD_SESSION_MAX_BYTES = int(os.environ.get("RESUMATE_UPLOAD_SESSION_MAX_BYTES", str(200 * 1024 * 1024)))
+UPLOAD_MEMORY_BUDGET = int(os.environ.get("RESUMATE_UPLOAD_MEMORY_BUDGET", str(64 * 1024 * 1024)))
+UPLOAD_IDLE_SECONDS = float(os.environ.get("RESUMATE_UPLOAD_IDLE_SECONDS", "900"))
+UPLOAD_MAX_UNPACKED_BYTES = int(os.environ.get("RESUMATE_UPLOAD_MAX_UNPACKED_BYTES", str(50 * 1024 * 1024)))
+
+# Serve Prometheus metrics on this port from the Streamlit process (off when
+# unset), bound to METRICS_HOST (loopback unless a scraper on another host
+# needs it, e.g. "0.0.0.0"), and the profiler used by the Analyzer's
+# "Profile" option: "cprofile" or "pyinstrument" (if installed).
+METRICS_PORT = int(os.environ.get("RESUMATE_METRICS_PORT", "0")) or None
+METRICS_HOST = os.environ.get("RESUMATE_METRICS_HOST", "127.0.0.1")
+PROFILER = os.environ.get("RESUMATE_PROFILER", "cprofile")
+
+# Semantic matching (resumate.semantic). Backend: "auto" tries
+# sentence-transformers with a local EMBEDDING_MODEL, then the word vectors
+# of SPACY_VECTORS_MODEL, then hashed character n-grams. Vector index:
+# "auto" tries faiss, then hnswlib, then NumPy brute force. The threshold is
+# the similarity at which a requirement counts as covered (per-backend
+# default when unset).
+SEMANTIC_BACKEND = os.environ.get("RESUMATE_SEMANTIC_BACKEND", "auto").lower()
+if SEMANTIC_BACKEND not in ("auto", "sentence-transformers", "spacy", "hashing"):
+    raise ValueError("RESUMATE_SEMANTIC_BACKEND must be 'auto', 'sentence-transformers', 'spacy' or 'hashing', "
+                     f"not '{SEMANTIC_BACKEND}'")
+EMBEDDING_MODEL = os.environ.get("RESUMATE_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+SPACY_VECTORS_MODEL = os.environ.get("RESUMATE_SPACY_VECTORS_MODEL", "en_core_web_md")
+EMBEDDING_BATCH_SIZE = int(os.environ.get("RESUMATE_EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_CACHE_ENTRIES = int(os.environ.get("RESUMATE_EMBEDDING_CACHE_ENTRIES", "20000"))
+VECTOR_INDEX = os.environ.get("RESUMATE_VECTOR_INDEX", "auto").lower()
+SEMANTIC_THRESHOLD = float(os.environ["RESUMATE_SEMANTIC_THRESHOLD"]) if os.environ.get("RESUMATE_SEMANTIC_THRESHOLD") else None
+
+# Resume PDFs (resumate.pdf): a TrueType font for text ("core" forces the
+# built-in Helvetica, which only covers Latin-1; unset looks for DejaVu Sans),
+# its bold face (defaults to the regular one), and the processes used by bulk
+# export (default: one per CPU).
+PDF_FONT = os.environ.get("RESUMATE_PDF_FONT")
+PDF_FONT_BOLD = os.environ.get("RESUMATE_PDF_FONT_BOLD")
+PDF_WORKERS = int(os.environ["RESUMATE_PDF_WORKERS"]) if os.environ.get("RESUMATE_PDF_WORKERS") else None
+
+# Interview question bank; None uses the bundled resumate/data/questions.json
+QUESTIONS_PATH = os.environ.get("RESUMATE_QUESTIONS")
+
+# OCR for PDF pages without a text layer (resumate.ocr): "auto" uses a local
+# Tesseract when pytesseract, pypdfium2 and the tesseract binary are
+# installed, "off" never OCRs. Pages are rendered at OCR_DPI and read in
+# OCR_LANG by OCR_WORKERS processes (default: one per CPU); a document gets
+# OCR_MAX_SECONDS in total.
+OCR_MODE = os.environ.get("RESUMATE_OCR", "auto").lower()
+if OCR_MODE not in ("auto", "off"):
+    raise ValueError(f"RESUMATE_OCR must be 'auto' or 'off', not '{OCR_MODE}'")
+OCR_WORKERS = int(os.environ.get("RESUMATE_OCR_WORKERS", "0")) or None
+OCR_MAX_SECONDS = float(os.environ.get("RESUMATE_OCR_MAX_SECONDS", "60"))
+OCR_DPI = int(os.environ.get("RESUMATE_OCR_DPI", "300"))
+OCR_LANG = os.environ.get("RESUMATE_OCR_LANG", "eng")
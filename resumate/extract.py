@@ -0,0 +1,205 @@
+import io
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import docx2txt
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTTextContainer
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+from resumate import config
+from resumate.cache import content_key, get_cache
+
+SUPPORTED_EXTENSIONS = ("pdf", "docx")
+
+
+# Skip pdfminer's hierarchical text-box grouping (boxes_flow=None) and
+# vertical text detection: neither matters for keyword matching and the
+# grouping is quadratic in the number of boxes on a page.
+FAST_LAPARAMS = LAParams(boxes_flow=None, detect_vertical=False, all_texts=False)
+
+
+class ExtractionError(Exception):
+    """Raised when a document's text can't be extracted."""
+
+
+class ExtractionLimitExceeded(ExtractionError):
+    """
+    Raised when a document exceeds one of the ExtractionLimits.
+    `limit` names the limit that was hit: "max_bytes", "max_pages" or "max_seconds".
+    """
+
+    def __init__(self, limit, message):
+        super().__init__(message)
+        self.limit = limit
+
+    def __reduce__(self):
+        # Keep both arguments when raised inside a process pool worker
+        return self.__class__, (self.limit, str(self))
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    max_pages: int = config.EXTRACT_MAX_PAGES
+    max_bytes: int = config.EXTRACT_MAX_BYTES
+    max_seconds: float = config.EXTRACT_MAX_SECONDS
+
+
+def file_extension(filename):
+    return filename.rsplit('.', 1)[-1].lower() if '.' in filename else ""
+
+
+def content_digest(data):
+    """content_key of a document's bytes; an Upload (resumate.uploads) carries its own."""
+    digest = getattr(data, "digest", None)
+    return digest if digest is not None else content_key(data)
+
+
+@contextmanager
+def open_document(data):
+    """
+    A binary file object over a document given as bytes or as an Upload
+    (memory-mapped when the upload was spilled to disk).
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(data)
+    else:
+        with data.open() as fp:
+            yield fp
+
+
+def pdf_page_count(fp):
+    """A PDF's page count from its page tree, without parsing any page; None if it can't be read."""
+    try:
+        return int(resolve1(resolve1(PDFDocument(PDFParser(fp)).catalog["Pages"])["Count"]))
+    except Exception:
+        return None
+
+
+def check_size(filename, size, limits=None):
+    """Rejects a document by its byte size alone, before anything is read."""
+    limits = limits or ExtractionLimits()
+    ext = file_extension(filename)
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ExtractionError(f"Unsupported file type '.{ext}': upload a PDF or DOCX")
+    if size == 0:
+        raise ExtractionError(f"{ext.upper()} is empty")
+    if size > limits.max_bytes:
+        raise ExtractionLimitExceeded("max_bytes", f"{ext.upper()} is larger than {limits.max_bytes / 1048576:g} MB")
+
+
+def check_document(filename, data, limits=None):
+    """
+    The cheap checks made before a document is parsed: its size, a PDF's
+    page count (read from the page tree) and how far a DOCX unpacks
+    (UPLOAD_MAX_UNPACKED_BYTES, from the ZIP directory). Raises
+    ExtractionLimitExceeded or ExtractionError.
+    """
+    limits = limits or ExtractionLimits()
+    check_size(filename, len(data), limits)
+    with open_document(data) as fp:
+        if file_extension(filename) == "pdf":
+            pages = pdf_page_count(fp)
+            if pages is not None and pages > limits.max_pages:
+                raise ExtractionLimitExceeded("max_pages", f"PDF has more than {limits.max_pages} pages")
+            return
+        try:
+            with zipfile.ZipFile(fp) as archive:
+                unpacked = sum(info.file_size for info in archive.infolist())
+        except zipfile.BadZipFile as e:
+            raise ExtractionError("Error extracting DOCX text: not a DOCX file") from e
+        if unpacked > config.UPLOAD_MAX_UNPACKED_BYTES:
+            raise ExtractionLimitExceeded(
+                "max_bytes", f"DOCX unpacks to more than {config.UPLOAD_MAX_UNPACKED_BYTES / 1048576:g} MB"
+            )
+
+
+def iter_pdf_pages(data, limits=None):
+    """
+    Yields the text of a PDF one page at a time, stopping with
+    ExtractionLimitExceeded as soon as a limit is crossed. The time limit is
+    checked between pages.
+    """
+    limits = limits or ExtractionLimits()
+    if len(data) > limits.max_bytes:
+        raise ExtractionLimitExceeded("max_bytes", f"PDF is larger than {limits.max_bytes / 1048576:g} MB")
+
+    deadline = time.monotonic() + limits.max_seconds
+    try:
+        with open_document(data) as fp:
+            for page_number, layout in enumerate(extract_pages(fp, laparams=FAST_LAPARAMS), start=1):
+                if page_number > limits.max_pages:
+                    raise ExtractionLimitExceeded("max_pages", f"PDF has more than {limits.max_pages} pages")
+                yield "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+                if time.monotonic() > deadline:
+                    raise ExtractionLimitExceeded(
+                        "max_seconds",
+                        f"PDF took longer than {limits.max_seconds:g}s to read (stopped after page {page_number})",
+                    )
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError("Error extracting PDF text") from e
+
+
+def iter_document_pages(filename, data, limits=None):
+    """Yields a document's text page by page (a DOCX is a single page)."""
+    limits = limits or ExtractionLimits()
+    ext = file_extension(filename)
+    if ext == 'pdf':
+        yield from iter_pdf_pages(data, limits)
+    elif ext == 'docx':
+        if len(data) > limits.max_bytes:
+            raise ExtractionLimitExceeded("max_bytes", f"DOCX is larger than {limits.max_bytes / 1048576:g} MB")
+        try:
+            with open_document(data) as fp:
+                text = docx2txt.process(fp)
+        except ExtractionError:
+            raise
+        except Exception as e:
+            raise ExtractionError("Error extracting DOCX text") from e
+        yield text
+
+
+def extract_text(filename, data, limits=None):
+    """
+    Extracts plain text from a PDF or DOCX file, given as bytes or an Upload.
+    Plain module-level function so it can run in a process pool.
+    """
+    return "\f".join(iter_document_pages(filename, data, limits))
+
+
+def text_cache_key(filename, data):
+    return content_key("text", file_extension(filename), content_digest(data))
+
+
+def extract_document(filename, data):
+    """
+    extract_text, with pages that have no text layer OCR'd (resumate.ocr),
+    and results cached by the SHA-256 of the file bytes.
+    """
+    cache = get_cache()
+    key = text_cache_key(filename, data)
+    text = cache.get(key)
+    if text is None:
+        from resumate.ocr import recover_text
+
+        text, complete = recover_text(filename, data, extract_text(filename, data))
+        if complete:
+            cache.set(key, text)
+    return text
+
+
+def extract_text_from_file(uploaded_file):
+    """
+    Extracts text from an uploaded file (anything with .name and .getvalue()).
+    Returns an error message string instead of raising, for display in the UI.
+    """
+    try:
+        return extract_document(uploaded_file.name, uploaded_file.getvalue())
+    except ExtractionError as e:
+        return str(e)
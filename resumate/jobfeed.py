@@ -0,0 +1,414 @@
+"""
+Job-feed ingestion: a persisted table of job postings and their keywords,
+so one resume can be matched against every open role without running NLP
+per posting.
+
+Postings are streamed from JSONL or CSV files one row at a time, normalized
+(HTML stripped, whitespace collapsed) and keyword-extracted a chunk at a
+time through get_keywords_batch (one nlp.pipe per chunk), so memory stays
+flat however large the feed is:
+
+    resumate feed ingest --db jobs.db postings.jsonl
+    resumate feed match --db jobs.db resume.pdf --top 20
+
+Reposts are detected before any NLP runs: postings with the same normalized
+text by hash, near-identical ones (re-worded intros, a changed date) by
+MinHash signatures and locality-sensitive hashing. A duplicate is stored
+with a pointer to the posting it repeats and is never analyzed or indexed.
+
+Matching uses the same inverted SkillIndex as the candidate pool
+(resumate.store), keyed by posting ID instead of candidate ID.
+"""
+import csv
+import html
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+import zlib
+from array import array
+from dataclasses import dataclass
+
+import numpy as np
+
+from resumate.cache import content_key
+from resumate.extract import file_extension
+from resumate.keywords import get_keywords, get_keywords_batch
+from resumate.store import SkillIndex, flatten_skills
+from resumate.taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+# Feed columns/keys accepted for each posting field (compared lower-cased,
+# with spaces and hyphens as underscores), first match wins
+FIELD_ALIASES = {
+    "id": ("id", "job_id", "posting_id", "external_id", "requisition_id"),
+    "title": ("title", "job_title", "position", "role"),
+    "company": ("company", "company_name", "employer", "organization"),
+    "location": ("location", "job_location", "city"),
+    "url": ("url", "link", "job_url", "apply_url"),
+    "description": ("description", "job_description", "jd", "text", "body", "content"),
+}
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"\w+")
+_KEY_SEPARATORS = re.compile(r"[\s-]+")
+
+
+@dataclass(frozen=True)
+class Posting:
+    external_id: str
+    title: str
+    company: str
+    location: str
+    url: str
+    text: str  # normalized title and description: what is matched and deduplicated
+
+    @property
+    def content_hash(self):
+        return content_key(self.text.lower())
+
+
+def normalize_text(value):
+    """Plain text from a feed field: HTML tags and entities removed, Unicode NFKC, whitespace collapsed."""
+    value = html.unescape(_TAG.sub(" ", value or ""))
+    return " ".join(unicodedata.normalize("NFKC", value).split())
+
+
+def normalize_posting(row):
+    """A Posting from one feed row, or None if it has no description."""
+    row = {_KEY_SEPARATORS.sub("_", str(key).strip().lower()): value for key, value in row.items() if key is not None}
+    fields = {}
+    for field, aliases in FIELD_ALIASES.items():
+        value = next((row[a] for a in aliases if row.get(a) not in (None, "")), "")
+        fields[field] = normalize_text(str(value))
+    if not fields["description"]:
+        return None
+    text = f"{fields['title']}\n{fields['description']}" if fields["title"] else fields["description"]
+    external_id = fields["id"] or fields["url"] or "sha256:" + content_key(
+        fields["company"].lower(), text.lower())
+    return Posting(external_id, fields["title"], fields["company"], fields["location"], fields["url"], text)
+
+
+def iter_postings(path):
+    """
+    Yields Postings from a .csv (header row required) or .jsonl/.ndjson
+    file, reading one row at a time. Rows without a description or that
+    aren't valid JSON are skipped with a warning.
+    """
+    ext = file_extension(path)
+    if ext not in ("csv", "jsonl", "ndjson"):
+        raise ValueError(f"Unsupported feed format '.{ext}': use .csv or .jsonl")
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        rows = csv.DictReader(f) if ext == "csv" else f
+        for number, row in enumerate(rows, start=1):
+            if ext != "csv":
+                if not row.strip():
+                    continue
+                try:
+                    row = json.loads(row)
+                except ValueError as e:
+                    logger.warning("%s line %d: not valid JSON (%s)", path, number, e)
+                    continue
+                if not isinstance(row, dict):
+                    logger.warning("%s line %d: expected a JSON object", path, number)
+                    continue
+            posting = normalize_posting(row)
+            if posting is None:
+                logger.warning("%s row %d: no description", path, number)
+                continue
+            yield posting
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles, with banded LSH keys. Two texts'
+    signatures agree in about the Jaccard similarity of their shingle sets.
+    Signatures depend only on the constructor arguments, so they can be
+    stored and compared across runs.
+    """
+
+    def __init__(self, num_perm=120, bands=20, shingle_size=5, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing of 32-bit shingle hashes: the top 32 bits
+        # of (a*x + b) mod 2**64, with random 64-bit a (odd) and b
+        self._a = rng.integers(0, 2 ** 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 64, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        """uint32 array of length num_perm."""
+        words = _WORD.findall(text.lower())
+        k = self.shingle_size
+        shingles = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64,
+                             count=len(shingles))
+        return ((hashes[:, None] * self._a + self._b) >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature):
+        """One 60-bit bucket key per band (fits an SQLite INTEGER)."""
+        rows = signature.reshape(self.bands, self.rows)
+        return [int(content_key(band.tobytes())[:15], 16) for band in rows]
+
+    @staticmethod
+    def similarity(a, b):
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(a == b)) / len(a)
+
+
+class JobStore:
+    """
+    SQLite table of ingested postings with their keywords, near-duplicate
+    links and LSH buckets. Owns a SkillIndex over the unique postings and
+    keeps its snapshot at `<db path>.idx` up to date, like CandidateStore.
+    """
+
+    def __init__(self, path, threshold=0.8, hasher=None):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, external_id TEXT UNIQUE NOT NULL, title TEXT, company TEXT, "
+            "location TEXT, url TEXT, content_hash TEXT NOT NULL, text TEXT NOT NULL, minhash BLOB NOT NULL, "
+            "duplicate_of INTEGER, keywords TEXT, n_skills INTEGER, taxonomy TEXT, updated REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS postings_hash ON postings (content_hash);"
+            "CREATE INDEX IF NOT EXISTS postings_duplicate_of ON postings (duplicate_of);"
+            "CREATE TABLE IF NOT EXISTS lsh (band INTEGER NOT NULL, bucket INTEGER NOT NULL, "
+            "posting_id INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS lsh_bucket ON lsh (band, bucket);"
+            "CREATE INDEX IF NOT EXISTS lsh_posting ON lsh (posting_id);"
+        )
+        self._conn.commit()
+        self._dirty = False
+        self._sizes = array("I")
+        self.index = self._load_index()
+
+    def _signature(self):
+        return list(self._conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(MAX(updated), 0) FROM postings"
+        ).fetchone())
+
+    def _load_index(self):
+        for pid, n_skills in self._conn.execute(
+                "SELECT id, n_skills FROM postings WHERE duplicate_of IS NULL AND keywords IS NOT NULL"):
+            self._set_size(pid, n_skills)
+        if os.path.exists(self.index_path):
+            index, meta = SkillIndex.load(self.index_path)
+            if meta == self._signature():
+                return index
+        self._dirty = True
+        index = SkillIndex()
+        for pid, keywords in self._conn.execute(
+                "SELECT id, keywords FROM postings WHERE duplicate_of IS NULL AND keywords IS NOT NULL"):
+            index.add(pid, flatten_skills(json.loads(keywords)))
+        return index
+
+    def _set_size(self, posting_id, n_skills):
+        if posting_id >= len(self._sizes):
+            self._sizes.extend([0] * (posting_id + 1 - len(self._sizes)))
+        self._sizes[posting_id] = n_skills
+
+    def __len__(self):
+        """Unique postings (duplicates not counted)."""
+        return self._conn.execute("SELECT COUNT(*) FROM postings WHERE duplicate_of IS NULL").fetchone()[0]
+
+    def count_duplicates(self):
+        return self._conn.execute("SELECT COUNT(*) FROM postings WHERE duplicate_of IS NOT NULL").fetchone()[0]
+
+    def _find_original(self, posting_id, content_hash, signature, stale):
+        """
+        ID of another unique posting that posting `posting_id` repeats, or
+        None. Postings still pointing at `stale` are being re-placed and
+        don't count.
+        """
+        row = self._conn.execute(
+            "SELECT COALESCE(duplicate_of, id) FROM postings WHERE content_hash = ? AND id != ? "
+            "AND COALESCE(duplicate_of, id) != ? LIMIT 1", (content_hash, posting_id, stale)).fetchone()
+        if row:
+            return row[0]
+        candidates = set()
+        for band, bucket in enumerate(self.hasher.band_keys(signature)):
+            candidates.update(pid for (pid,) in self._conn.execute(
+                "SELECT posting_id FROM lsh WHERE band = ? AND bucket = ?", (band, bucket)))
+        candidates.discard(posting_id)
+        best, best_similarity = None, self.threshold
+        for pid in sorted(candidates):
+            (other,) = self._conn.execute("SELECT minhash FROM postings WHERE id = ?", (pid,)).fetchone()
+            similarity = MinHasher.similarity(signature, np.frombuffer(other, dtype=np.uint32))
+            if similarity >= best_similarity:
+                best, best_similarity = pid, similarity
+        return best
+
+    def _place(self, posting_id, content_hash, signature, stale):
+        """Links a stored posting to the posting it repeats, or makes it unique. Returns whether it is unique."""
+        original = self._find_original(posting_id, content_hash, signature, stale)
+        self._conn.execute("UPDATE postings SET duplicate_of = ? WHERE id = ?", (original, posting_id))
+        if original is None:
+            self._conn.executemany(
+                "INSERT INTO lsh (band, bucket, posting_id) VALUES (?, ?, ?)",
+                [(band, bucket, posting_id) for band, bucket in enumerate(self.hasher.band_keys(signature))])
+        return original is None
+
+    def _unindex(self, posting_id, keywords):
+        if keywords is not None:
+            self.index.remove(posting_id, flatten_skills(json.loads(keywords)))
+            self._set_size(posting_id, 0)
+        self._conn.execute("DELETE FROM lsh WHERE posting_id = ?", (posting_id,))
+
+    def _add(self, posting, todo):
+        """
+        Stores one posting and returns its status: "new", "updated",
+        "unchanged" or "duplicate". Unique postings whose keywords need
+        extracting are appended to `todo` as (ID, text).
+        """
+        row = self._conn.execute(
+            "SELECT id, content_hash, keywords FROM postings WHERE external_id = ?", (posting.external_id,)
+        ).fetchone()
+        if row and row[1] == posting.content_hash:
+            return "unchanged"
+
+        signature = self.hasher.signature(posting.text)
+        values = (posting.title, posting.company, posting.location, posting.url, posting.content_hash,
+                  posting.text, signature.tobytes(), time.time())
+        if row:
+            pid = row[0]
+            self._unindex(pid, row[2])
+            self._conn.execute(
+                "UPDATE postings SET title = ?, company = ?, location = ?, url = ?, content_hash = ?, text = ?, "
+                "minhash = ?, duplicate_of = NULL, keywords = NULL, n_skills = NULL, taxonomy = NULL, updated = ? "
+                "WHERE id = ?", (*values, pid))
+        else:
+            pid = self._conn.execute(
+                "INSERT INTO postings (external_id, title, company, location, url, content_hash, text, minhash, "
+                "updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (posting.external_id, *values)).lastrowid
+        self._dirty = True
+
+        unique = self._place(pid, posting.content_hash, signature, stale=pid)
+        if unique:
+            todo.append((pid, posting.text))
+        if row:
+            # Reposts of the old text may now be unique or repeat another posting
+            for other, content_hash, minhash, text in self._conn.execute(
+                    "SELECT id, content_hash, minhash, text FROM postings WHERE duplicate_of = ?", (pid,)).fetchall():
+                if self._place(other, content_hash, np.frombuffer(minhash, dtype=np.uint32), stale=pid):
+                    todo.append((other, text))
+        if not unique:
+            return "duplicate"
+        return "updated" if row else "new"
+
+    def _set_keywords(self, posting_id, keywords, fingerprint):
+        skills = flatten_skills(keywords)
+        self._conn.execute("UPDATE postings SET keywords = ?, n_skills = ?, taxonomy = ? WHERE id = ?",
+                           (json.dumps(keywords), len(skills), fingerprint, posting_id))
+        self.index.add(posting_id, skills)
+        self._set_size(posting_id, len(skills))
+
+    def ingest(self, postings, chunk_size=256, progress=None):
+        """
+        Adds or updates Postings from any iterable, `chunk_size` at a time:
+        each chunk is deduplicated, its unique postings go through
+        get_keywords_batch together, and it is committed as one
+        transaction. `progress(stats)` is called after every chunk.
+        Returns counts: {"read", "new", "updated", "unchanged", "duplicate"}.
+        """
+        stats = dict.fromkeys(("read", "new", "updated", "unchanged", "duplicate"), 0)
+        fingerprint = get_taxonomy().fingerprint
+        chunk = []
+
+        def flush_chunk():
+            todo = []
+            for posting in chunk:
+                stats[self._add(posting, todo)] += 1
+            for (pid, _), keywords in zip(todo, get_keywords_batch([text for _, text in todo])):
+                self._set_keywords(pid, keywords, fingerprint)
+            self._conn.commit()
+            chunk.clear()
+            if progress is not None:
+                progress(dict(stats))
+
+        for posting in postings:
+            stats["read"] += 1
+            chunk.append(posting)
+            if len(chunk) >= chunk_size:
+                flush_chunk()
+        if chunk:
+            flush_chunk()
+        return stats
+
+    def refresh_stale(self):
+        """
+        Re-runs keyword extraction (from the stored text) for unique
+        postings keyed with an older taxonomy. Returns how many.
+        """
+        fingerprint = get_taxonomy().fingerprint
+        stale = self._conn.execute(
+            "SELECT id, text, keywords FROM postings WHERE duplicate_of IS NULL AND taxonomy IS NOT ?",
+            (fingerprint,)).fetchall()
+        for pid, text, old in stale:
+            keywords = get_keywords(text)
+            if old is not None:
+                self.index.remove(pid, flatten_skills(json.loads(old)))
+            self._set_keywords(pid, keywords, fingerprint)
+        self._conn.commit()
+        self._dirty = self._dirty or bool(stale)
+        return len(stale)
+
+    def flush(self):
+        """Writes the index snapshot if anything changed since the last flush."""
+        if self._dirty:
+            self.index.save(self.index_path, meta=self._signature())
+            self._dirty = False
+
+    def match(self, resume_keywords, top_k=20, min_score=0, index=None):
+        """
+        Ranks unique postings against a get_keywords result for a resume.
+        A posting's score is the share of its skills the resume has, the
+        same percentage score_match gives for that JD. Pass a
+        MappedSkillIndex to search a shared snapshot instead of this store's
+        in-memory index.
+        """
+        index = index or self.index
+        lists = [p for p in (index.postings(s) for s in sorted(flatten_skills(resume_keywords))) if len(p)]
+        if not lists:
+            return []
+        hits = np.bincount(np.concatenate(lists), minlength=index.max_id + 1)
+        sizes = np.zeros(len(hits), dtype=np.float64)
+        known = np.frombuffer(self._sizes, dtype=np.uint32)[:len(hits)]
+        sizes[:len(known)] = known
+        ids = np.flatnonzero((hits > 0) & (sizes > 0))
+        scores = hits[ids] / sizes[ids] * 100
+        keep = scores >= min_score
+        ids, scores = ids[keep], scores[keep]
+        if len(ids) > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            ids, scores = ids[top], scores[top]
+        ranked = sorted(zip(ids.tolist(), scores.tolist()), key=lambda r: (-r[1], -hits[r[0]], r[0]))
+
+        results = []
+        for pid, score in ranked:
+            row = self._conn.execute(
+                "SELECT external_id, title, company, location, url, "
+                "(SELECT COUNT(*) FROM postings d WHERE d.duplicate_of = p.id) FROM postings p WHERE id = ?",
+                (pid,)).fetchone()
+            if row is None:
+                continue
+            results.append({"id": pid, "external_id": row[0], "title": row[1], "company": row[2],
+                            "location": row[3], "url": row[4], "score": round(score),
+                            "matched": int(hits[pid]), "skills": int(sizes[pid]), "reposts": row[5]})
+        return results
+
+    def close(self):
+        self.flush()
+        self._conn.close()
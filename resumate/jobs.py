@@ -0,0 +1,193 @@
+"""
+Background jobs shared by every session of the Streamlit app.
+
+An analysis runs on a small process-wide thread pool instead of inside the
+session's script run, so widget interactions and reruns neither block on it
+nor throw it away: the page keeps the job ID in st.session_state and polls.
+Submitting identical inputs returns the existing job, and once
+JOB_MAX_PENDING jobs are queued or running new submissions are refused.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from resumate import config
+
+logger = logging.getLogger("resumate.jobs")
+
+
+class JobQueueFull(Exception):
+    """Raised by JobManager.submit when too many jobs are already pending."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function once its job has been cancelled."""
+
+
+class Job:
+    """
+    State of one background job. The job function receives it as its first
+    argument to report progress and to stop early when cancelled.
+    """
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.status = "queued"
+        self.progress = 0.0
+        self.message = "Waiting for a free worker..."
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._future = None
+        self._cleanup = None
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, progress=None, message=None, partial=None):
+        """Publishes progress (0-1), a status message and/or partial results; raises JobCancelled if cancelled."""
+        self.check_cancelled()
+        if progress is not None:
+            self.progress = progress
+        if message is not None:
+            self.message = message
+        if partial is not None:
+            self.partial = partial
+
+    def _finish(self, status, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.status = status
+        cleanup, self._cleanup = self._cleanup, None
+        _run_cleanup(cleanup)
+
+
+def _run_cleanup(cleanup):
+    if cleanup is None:
+        return
+    try:
+        cleanup()
+    except Exception:
+        logger.exception("Job cleanup failed")
+
+
+class JobManager:
+    """Runs job functions on a bounded thread pool and tracks them by ID and input key."""
+
+    def __init__(self, workers=2, max_pending=16, result_ttl=900):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resumate-job")
+        self._jobs = {}
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """Jobs queued or running."""
+        return sum(not job.done for job in list(self._jobs.values()))
+
+    def submit(self, key, fn, *args, cleanup=None, **kwargs):
+        """
+        Schedules fn(job, *args, **kwargs) and returns its Job. If a job with
+        the same `key` is pending or finished successfully within
+        JOB_RESULT_TTL, that job is returned instead.
+
+        `cleanup()` (e.g. releasing uploaded files) runs once the arguments
+        are no longer needed: when the job finishes, including when it is
+        cancelled before it starts, or straight away if an existing job is
+        returned or JobQueueFull is raised.
+        """
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(self._by_key.get(key))
+            reuse = job is not None and job.status not in ("failed", "cancelled")
+            pending = self.pending
+            if not reuse and pending < self.max_pending:
+                job = Job(key)
+                job._cleanup = cleanup
+                self._jobs[job.id] = job
+                self._by_key[key] = job.id
+        if reuse:
+            _run_cleanup(cleanup)
+            return job
+        if pending >= self.max_pending:
+            _run_cleanup(cleanup)
+            raise JobQueueFull(f"{pending} analyses are already waiting; try again shortly")
+        job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id) if job_id else None
+
+    def cancel(self, job_id):
+        """
+        Cancels a job: a queued job never starts; a running one stops at its
+        next progress report.
+        """
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            job._finish("cancelled")
+        return True
+
+    def _run(self, job, fn, args, kwargs):
+        if job._cancel.is_set():
+            job._finish("cancelled")
+            return
+        job.status = "running"
+        job.message = "Starting..."
+        try:
+            result = fn(job, *args, **kwargs)
+        except JobCancelled:
+            job._finish("cancelled")
+        except Exception as e:
+            # Imported here: resumate.extract pulls in pdfminer
+            from resumate.extract import ExtractionError
+            from resumate.keywords import ModelNotInstalled
+
+            if isinstance(e, (ExtractionError, ModelNotInstalled)):
+                job._finish("failed", error=str(e))
+            else:
+                logger.exception("Job %s failed", job.id)
+                job._finish("failed", error=f"Analysis failed: {e}")
+        else:
+            job.progress = 1.0
+            job._finish("done", result=result)
+
+    def _prune(self):
+        # Finished jobs are kept for result reuse until they expire
+        cutoff = time.time() - self.result_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.done and job.finished_at < cutoff:
+                del self._jobs[job_id]
+                if self._by_key.get(job.key) == job_id:
+                    del self._by_key[job.key]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """Process-wide JobManager configured from resumate.config."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager(config.JOB_WORKERS, config.JOB_MAX_PENDING, config.JOB_RESULT_TTL)
+    return _manager
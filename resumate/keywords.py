@@ -0,0 +1,149 @@
+import importlib.util
+import logging
+import os
+import threading
+from functools import lru_cache
+
+from resumate import config
+from resumate.cache import content_key, get_cache
+from resumate.taxonomy import get_taxonomy
+
+logger = logging.getLogger("resumate.keywords")
+
+
+class ModelNotInstalled(RuntimeError):
+    """The configured spaCy model is missing; models are never downloaded at runtime."""
+
+
+def model_installed(name=None):
+    """
+    Whether a spaCy model is available offline, as an installed package or a
+    model directory. Checked without importing spaCy.
+    """
+    name = name or config.SPACY_MODEL
+    if os.path.isdir(name):
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def check_model():
+    """Raises ModelNotInstalled, with install instructions, if spaCy mode can't find its model."""
+    if config.KEYWORD_MODE == "spacy" and not model_installed():
+        raise ModelNotInstalled(
+            f"spaCy model '{config.SPACY_MODEL}' is not installed. Install it with "
+            f"`python -m spacy download {config.SPACY_MODEL}` (or set RESUMATE_SPACY_MODEL to a model "
+            f"directory), or set RESUMATE_KEYWORD_MODE=matcher to run without spaCy."
+        )
+
+
+@lru_cache(maxsize=None)
+def load_nlp():
+    """Loads the spaCy model once per process."""
+    check_model()
+    import spacy
+
+    # Only the tagger is needed for keyword extraction; parser/NER stay unloaded
+    return spacy.load(config.SPACY_MODEL, exclude=list(config.SPACY_EXCLUDE))
+
+
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """The spaCy pipeline for the configured keyword mode, or None in matcher mode."""
+    if config.KEYWORD_MODE != "spacy":
+        return None
+    # Callers wait for a load already in progress (e.g. preload_nlp) instead of starting another
+    with _nlp_lock:
+        return load_nlp()
+
+
+_preload_thread = None
+
+
+def preload_nlp():
+    """
+    Starts loading the model on a daemon thread, once per process, so startup
+    doesn't wait for it and the first analysis usually doesn't either. A
+    failure is logged here and raised again on first use.
+    """
+    global _preload_thread
+    if _preload_thread is None and config.KEYWORD_MODE == "spacy":
+        def preload():
+            try:
+                get_nlp()
+            except Exception:
+                logger.exception("Preloading spaCy model '%s' failed", config.SPACY_MODEL)
+
+        _preload_thread = threading.Thread(target=preload, name="resumate-preload", daemon=True)
+        _preload_thread.start()
+    return _preload_thread
+
+
+def get_keywords(text):
+    """
+    Extracts key technical and soft skills from a text using SpaCy NLP.
+    Returns a dictionary of skills grouped by category.
+    With RESUMATE_KEYWORD_MODE=matcher only the phrase matcher runs.
+    """
+    return get_keywords_batch([text])[0]
+
+
+def get_keywords_batch(texts):
+    """
+    get_keywords for many texts at once: cache hits are reused and the rest
+    go through spaCy together with nlp.pipe.
+    """
+    # Loaded once per process and reloaded when the taxonomy file changes
+    taxonomy = get_taxonomy()
+    cache = get_cache()
+    nlp = get_nlp()
+    
+    # Process text
+    texts_lower = [text.lower() for text in texts]
+
+    # Same text + same taxonomy + same mode always yields the same keywords
+    keys = [_keywords_key(taxonomy, t) for t in texts_lower]
+    results = [cache.get(key) for key in keys]
+    todo = [i for i, r in enumerate(results) if r is None]
+
+    if nlp is not None:
+        docs = nlp.pipe((texts_lower[i] for i in todo), batch_size=config.NLP_BATCH_SIZE, n_process=config.NLP_PROCESSES)
+    else:
+        docs = ([] for _ in todo)
+
+    for i, doc in zip(todo, docs):
+        results[i] = _categorize(texts_lower[i], doc, taxonomy)
+        cache.set(keys[i], results[i])
+    return results
+
+
+def _keywords_key(taxonomy, text_lower):
+    return content_key("keywords", taxonomy.fingerprint, config.KEYWORD_MODE, " ".join(text_lower.split()))
+
+
+def _categorize(text_lower, doc, taxonomy):
+    results = {cat: [] for cat in taxonomy.categories}
+    found_any = set()
+
+    # 1. POS Tagging Method: Extract nouns and proper nouns
+    for token in doc:
+        if token.pos_ in ['NOUN', 'PROPN'] and not token.is_stop:
+            clean_text = token.text.strip().lower()
+            if len(clean_text) > 2:
+                # Resolve aliases, then check which category it belongs to
+                skill = taxonomy.canonical(clean_text)
+                if skill and skill not in found_any:
+                    results[taxonomy.category_of(skill)].append(skill)
+                    found_any.add(skill)
+    
+    # 2. Phrase Matching Method (for multi-word or exact matches)
+    for skill in taxonomy.matcher.find_all(text_lower):
+        if skill not in found_any:
+            results[taxonomy.category_of(skill)].append(skill)
+            found_any.add(skill)
+            
+    return results
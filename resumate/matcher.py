@@ -0,0 +1,100 @@
+import re
+
+
+def normalize_term(term):
+    return " ".join(term.lower().split())
+
+
+def _term_regex(term):
+    # Spaces inside a term match any run of whitespace, so phrases that wrap
+    # across lines in an extracted PDF are still found.
+    return r"\s+".join(re.escape(word) for word in term.split(" "))
+
+
+def _trie_regex(terms):
+    """
+    Builds a single regex from a character trie of the terms, so the regex
+    engine walks shared prefixes once instead of trying every term in turn.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node):
+        is_end = "" in node
+        branches = []
+        for char in sorted(k for k in node if k):
+            atom = r"\s+" if char == " " else re.escape(char)
+            branches.append(atom + render(node[char]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_end:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class SkillMatcher:
+    """
+    Precompiled skill matcher that finds every known skill (single or
+    multi-word) in one pass over the text.
+
+    `terms` maps each searchable term to the canonical skill it stands for.
+    A term only matches as a whole word: it may not be preceded or followed
+    by a letter, digit or underscore.
+    """
+
+    def __init__(self, terms):
+        self.terms = {}
+        for term, skill in terms.items():
+            key = normalize_term(term)
+            if key:
+                self.terms[key] = skill
+
+        if self.terms:
+            self._pattern = re.compile(
+                r"(?<!\w)(?=(" + _trie_regex(self.terms) + r")(?!\w))"
+            )
+        else:
+            self._pattern = None
+
+        # The scan reports the longest term at each position; shorter terms
+        # that are a prefix of a longer one ("rest" / "rest api") are checked
+        # separately so both are reported like independent searches would.
+        self._prefixes = {}
+        for term in self.terms:
+            for end in range(1, len(term)):
+                if term[:end] in self.terms:
+                    self._prefixes.setdefault(term, []).append(
+                        re.compile(_term_regex(term[:end]) + r"(?!\w)")
+                    )
+
+    def find_all(self, text):
+        """
+        Returns the canonical skills found in `text` (already lower-cased),
+        de-duplicated and in order of first appearance.
+        """
+        return list(dict.fromkeys(self._mentions(text)))
+
+    def count_all(self, text):
+        """Returns {canonical skill: number of mentions} for `text` (already lower-cased)."""
+        counts = {}
+        for skill in self._mentions(text):
+            counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+    def _mentions(self, text):
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text):
+            term = normalize_term(match.group(1))
+            yield self.terms[term]
+            for prefix in self._prefixes.get(term, ()):
+                hit = prefix.match(text, match.start())
+                if hit:
+                    yield self.terms[normalize_term(hit.group(0))]
@@ -0,0 +1,175 @@
+"""
+Per-stage timing for the analysis pipeline.
+
+A StageTimer records how long each stage of one request took and emits it as
+a structured log line; every stage is also folded into a process-wide
+histogram that can be scraped in Prometheus text format.
+"""
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("resumate.metrics")
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsRegistry:
+    """Thread-safe duration histograms keyed by (pipeline, stage)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, pipeline, stage, seconds):
+        with self._lock:
+            h = self._histograms.get((pipeline, stage))
+            if h is None:
+                h = self._histograms[(pipeline, stage)] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    h["counts"][i] += 1
+            h["sum"] += seconds
+            h["count"] += 1
+
+    def render_prometheus(self):
+        lines = [
+            "# HELP resumate_stage_duration_seconds Time spent in each pipeline stage.",
+            "# TYPE resumate_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (pipeline, stage), h in sorted(self._histograms.items()):
+                labels = f'pipeline="{pipeline}",stage="{stage}"'
+                for bound, count in zip(self.buckets, h["counts"]):
+                    lines.append(f'resumate_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'resumate_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {h["count"]}')
+                lines.append(f"resumate_stage_duration_seconds_sum{{{labels}}} {h['sum']:.6f}")
+                lines.append(f"resumate_stage_duration_seconds_count{{{labels}}} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class StageTimer:
+    """
+    Times the stages of one pipeline run. Stages may nest; each stage records
+    only its own (exclusive) time, so the breakdown adds up to the total.
+    Stages timed elsewhere for the same request (e.g. by the page, around a
+    job) are passed as `stages` and `request_id`.
+    """
+
+    def __init__(self, pipeline, registry=REGISTRY, request_id=None, stages=None):
+        self.pipeline = pipeline
+        self.registry = registry
+        self.request_id = request_id or uuid.uuid4().hex[:12]
+        self.stages = dict(stages or {})
+        self._stack = []
+        # Stages measured elsewhere count towards the total
+        self._started = time.perf_counter() - sum(self.stages.values())
+
+    def _record(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        if self._stack:
+            self._stack[-1][1] += seconds
+
+    @contextmanager
+    def stage(self, name):
+        frame = [name, 0.0]  # name, time spent in nested stages
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self._record(name, elapsed - frame[1])
+
+    @property
+    def total(self):
+        return time.perf_counter() - self._started
+
+    def finish(self, **fields):
+        """Publishes the stage times to the registry and logs them as one JSON line."""
+        for name, seconds in self.stages.items():
+            self.registry.observe(self.pipeline, name, seconds)
+        logger.info(json.dumps({
+            "event": "pipeline_timing",
+            "pipeline": self.pipeline,
+            "request_id": self.request_id,
+            "total_ms": round(self.total * 1000, 2),
+            "stages_ms": {name: round(s * 1000, 2) for name, s in self.stages.items()},
+            **fields,
+        }))
+
+
+@contextmanager
+def capture_profile(engine="cprofile"):
+    """
+    Profiles the enclosed block. Yields a dict whose "report" key holds a
+    text report once the block exits. Uses pyinstrument when requested and
+    installed, cProfile otherwise.
+    """
+    result = {"engine": engine, "report": ""}
+    if engine == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            result["engine"] = engine = "cprofile"
+        else:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield result
+            finally:
+                profiler.stop()
+                result["report"] = profiler.output_text(unicode=True)
+            return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(30)
+        result["report"] = out.getvalue()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serves /metrics on `host`:`port` from a daemon thread; safe to call repeatedly."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="resumate-metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,295 @@
+"""
+OCR fallback for scanned PDFs: pages that come out of text extraction
+empty (no text layer) but draw an image are rendered with pypdfium2 and
+read with a local Tesseract through pytesseract. Nothing is sent over the
+network. Blank pages without images are left alone.
+
+OCR is optional (`pip install -e ".[ocr]"` plus the `tesseract` binary) and
+slow, so:
+
+- only empty pages with images are OCR'd, in a shared process pool
+  (OCR_WORKERS), and each task is sent just its page, copied into a
+  one-page PDF;
+- each page's text is cached under a hash of what the page draws (its
+  content streams and the images and forms they use), taken before
+  anything is rendered, so the same scan is read once even when it turns
+  up in a different file;
+- a document gets OCR_MAX_SECONDS in total; Tesseract is killed when that
+  runs out, and pages not read by then are skipped and reported.
+
+recover_pages returns a report of what was done, which is also cached
+next to the document's text (see ocr_report). Without OCR installed the
+text is cached as it is, and the report only says what was missed.
+"""
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from functools import lru_cache
+
+from resumate import config
+from resumate.cache import content_key, get_cache
+from resumate.extract import content_digest, file_extension, open_document
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def ocr_available():
+    """Whether pytesseract, pypdfium2 and the tesseract binary are installed (checked without importing them)."""
+    return (importlib.util.find_spec("pytesseract") is not None
+            and importlib.util.find_spec("pypdfium2") is not None
+            and shutil.which("tesseract") is not None)
+
+
+def ocr_page(page, dpi=300, lang="eng", deadline=None):
+    """
+    Renders a one-page PDF (bytes, see _split_pages) and OCRs it. Tesseract
+    is killed at `deadline` (a time.time() value), raising TimeoutError.
+    Runs in the OCR pool.
+    """
+    import pypdfium2
+    import pytesseract
+
+    pdf = pypdfium2.PdfDocument(page)
+    try:
+        image = pdf[0].render(scale=dpi / 72, grayscale=True).to_pil()
+    finally:
+        pdf.close()
+
+    timeout = 0  # no limit
+    if deadline is not None:
+        timeout = deadline - time.time()
+        if timeout <= 0:
+            raise TimeoutError("OCR time budget used up")
+    try:
+        text = pytesseract.image_to_string(image, lang=lang, timeout=timeout)
+    except RuntimeError as e:
+        if "timeout" in str(e):
+            raise TimeoutError("OCR time budget used up") from None
+        raise
+    # Tesseract ends each page with a form feed, which separates pages here
+    return text.replace("\f", "\n")
+
+
+def _scanned_pages(data, indexes, dpi, lang):
+    """
+    {page index: text cache key} for those of pages `indexes` that draw an
+    image. The key hashes what the page draws, so it's known before rendering.
+    """
+    from pdfminer.pdfpage import PDFPage
+
+    wanted = set(indexes)
+    keys = {}
+    with open_document(data) as fp:
+        for i, page in enumerate(PDFPage.get_pages(fp)):
+            if i not in wanted:
+                continue
+            h = hashlib.sha256(repr((page.mediabox, page.rotate)).encode())
+            seen = set()
+            images = False
+            for stream in page.contents:
+                images |= _hash_stream(h, stream, seen)
+            images |= _hash_resources(h, page.resources, seen)
+            if images:
+                keys[i] = content_key("ocr", lang, str(dpi), h.hexdigest())
+    return keys
+
+
+# An inline image (BI ... ID ... EI) in a content stream
+_INLINE_IMAGE = re.compile(rb"(?:^|\s)BI\s")
+
+
+def _hash_resources(h, resources, seen):
+    """Hashes the XObjects in `resources`; returns whether any is an image."""
+    from pdfminer.pdftypes import dict_value, resolve1
+
+    images = False
+    for name, ref in sorted(dict_value(resolve1(resources or {}).get("XObject", {})).items()):
+        h.update(name.encode())
+        images |= _hash_stream(h, ref, seen)
+    return images
+
+
+def _hash_stream(h, ref, seen):
+    """Hashes a content stream or XObject; returns whether it is or draws an image."""
+    from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+    from pdfminer.psparser import literal_name
+
+    if isinstance(ref, PDFObjRef):
+        if ref.objid in seen:
+            return False
+        seen.add(ref.objid)
+    stream = resolve1(ref)
+    if not isinstance(stream, PDFStream):
+        return False
+    h.update(repr([stream.get(k) for k in ("Width", "Height", "BitsPerComponent", "Matrix")]).encode())
+    data = stream.get_data()
+    h.update(len(data).to_bytes(8, "big"))
+    h.update(data)
+    subtype = stream.get("Subtype")
+    if subtype is not None and literal_name(subtype) == "Image":
+        return True
+    images = "Subtype" not in stream and _INLINE_IMAGE.search(data) is not None
+    if "Resources" in stream:
+        # A form XObject draws with its own resources
+        images |= _hash_resources(h, stream["Resources"], seen)
+    return images
+
+
+# PDFium isn't thread-safe, and jobs and API requests split documents on threads
+_pdfium_lock = threading.Lock()
+
+
+def _split_pages(data, indexes):
+    """[(index, one-page PDF bytes)] for pages `indexes` of a PDF."""
+    import pypdfium2
+
+    pages = []
+    with _pdfium_lock, open_document(data) as fp:
+        source = pypdfium2.PdfDocument(fp)
+        try:
+            for i in indexes:
+                target = pypdfium2.PdfDocument.new()
+                try:
+                    target.import_pages(source, [i])
+                    out = io.BytesIO()
+                    target.save(out)
+                finally:
+                    target.close()
+                pages.append((i, out.getvalue()))
+        finally:
+            source.close()
+    return pages
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ocr_pool():
+    """Process pool shared by every OCR'd document (OCR_WORKERS processes, default one per CPU)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from resumate.batch import _new_pool, _start_workers
+
+                workers = config.OCR_WORKERS or os.cpu_count() or 1
+                pool = _new_pool(workers)
+                _start_workers(pool, workers)
+                _pool = pool
+    return _pool
+
+
+def ocr_report_key(filename, data):
+    return content_key("ocr-report", file_extension(filename), content_digest(data))
+
+
+def ocr_report(filename, data):
+    """The report of the last recover_pages run for this file, or None if no page needed OCR."""
+    return get_cache().get(ocr_report_key(filename, data))
+
+
+def recover_pages(filename, data, text, max_seconds=None, pool=None):
+    """
+    OCRs the pages of a PDF whose extracted text (pages separated by form
+    feeds, as extract_text returns it) is empty and that draw an image.
+    Returns (text, report); report is None when no page needed OCR,
+    otherwise a dict:
+
+        {"pages": OCR'd, "cached": of those, read from the cache,
+         "skipped": left empty, "seconds": wall time, "error": why pages were skipped or None}
+    """
+    pages = text.split("\f")
+    missing = [i for i, page in enumerate(pages) if not page.strip()]
+    if file_extension(filename) != "pdf" or not missing or config.OCR_MODE == "off":
+        return text, None
+
+    # Only the blank pages that draw an image can hold text worth reading
+    keys = _scanned_pages(data, missing, config.OCR_DPI, config.OCR_LANG)
+    if not keys:
+        return text, None
+    scanned = sorted(keys)
+
+    report = {"pages": 0, "cached": 0, "skipped": len(scanned), "seconds": 0.0, "error": None}
+    if not ocr_available():
+        report["error"] = (f"{len(scanned)} page(s) are scanned images and OCR is not installed: "
+                           "install the `ocr` extra and the tesseract binary")
+        return text, report
+
+    max_seconds = config.OCR_MAX_SECONDS if max_seconds is None else max_seconds
+    start = time.monotonic()
+    # Workers see the budget as a wall-clock deadline, since they kill Tesseract themselves
+    deadline = time.time() + max_seconds
+    budget_error = f"OCR time budget of {max_seconds:g}s used up"
+
+    # The disk tier (RESUMATE_CACHE_DIR) shares page texts between processes and restarts
+    cache = get_cache()
+    todo = []
+    for i in scanned:
+        page_text = cache.get(keys[i])
+        if page_text is None:
+            todo.append(i)
+        else:
+            pages[i] = page_text
+            report["pages"] += 1
+            report["cached"] += 1
+    if not todo:
+        report["skipped"] = 0
+        report["seconds"] = round(time.monotonic() - start, 3)
+        return "\f".join(pages), report
+
+    pool = pool or get_ocr_pool()
+    futures = {pool.submit(ocr_page, page, config.OCR_DPI, config.OCR_LANG, deadline): i
+               for i, page in _split_pages(data, todo)}
+    pending = set(futures)
+    try:
+        while pending:
+            remaining = start + max_seconds - time.monotonic()
+            if remaining <= 0:
+                report["error"] = budget_error
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = futures[future]
+                try:
+                    page_text = future.result()
+                except TimeoutError:
+                    report["error"] = budget_error
+                    continue
+                except Exception as e:
+                    logger.warning("OCR of %s page %d failed: %s", filename, i + 1, e)
+                    report["error"] = f"OCR failed: {e}"
+                    continue
+                cache.set(keys[i], page_text)
+                pages[i] = page_text
+                report["pages"] += 1
+    finally:
+        for future in pending:
+            future.cancel()
+
+    report["skipped"] = len(scanned) - report["pages"]
+    report["seconds"] = round(time.monotonic() - start, 3)
+    return "\f".join(pages), report
+
+
+def recover_text(filename, data, text):
+    """
+    recover_pages for the extraction path: caches the report and returns
+    (text, complete). Text with pages skipped by OCR (out of time, or
+    failed) shouldn't be cached, so the next attempt can fill them in.
+    Without OCR installed no attempt will, so that text is complete.
+    """
+    text, report = recover_pages(filename, data, text)
+    if report is None:
+        return text, True
+    get_cache().set(ocr_report_key(filename, data), report)
+    logger.info("OCR for %s: %s", filename, report)
+    return text, not report["skipped"] or not ocr_available()
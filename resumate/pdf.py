@@ -0,0 +1,454 @@
+"""
+Resume PDF rendering for the Builder, the API and bulk export.
+
+Layouts are described by frozen Template records. Documents whose text is
+all Latin-1 are set in the built-in Helvetica, which needs nothing embedded.
+Others are set in a Unicode TrueType font (DejaVu Sans by default, see
+RESUMATE_PDF_FONT) so names and places outside Latin-1 render, as far as the
+font covers them: DejaVu Sans has Greek, Cyrillic, Armenian, Georgian,
+Hebrew and Arabic but no CJK, whose characters come out blank with a warning
+from fpdf2 (point RESUMATE_PDF_FONT at a font such as Noto Sans CJK for
+those). When no font file is found, Helvetica is used for everything, with
+unsupported characters replaced by "?".
+
+Parsing a TrueType font costs more than laying out a resume, so each
+process parses the font once, trimmed to the characters resumes mostly use
+(WORKING_SET), and every document that needs it gets a copy that reuses the
+parsed metrics.
+
+Bulk export renders a CSV or JSONL file of profiles in a process pool
+into a ZIP of PDFs:
+
+    resumate render profiles.csv --out resumes.zip --template Compact
+"""
+import copy
+import csv
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from dataclasses import dataclass
+from functools import lru_cache
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+from fpdf import FPDF
+# Not public API: _FontFamily relies on TTFFont's constructor and attributes,
+# which is why fpdf2 is pinned to the 2.8 series it was tested with
+# (tests/test_pdf.py fails when they change)
+from fpdf.fonts import SubsetMap, TTFFont
+
+from resumate import config
+
+DEFAULT_ACCENT = "#6366f1"
+
+# (profile field, section heading) in the order they appear on the page
+SECTIONS = (
+    ("summary", "Professional Summary"),
+    ("education", "Education"),
+    ("experience", "Experience"),
+    ("skills", "Skills"),
+    ("projects", "Projects"),
+)
+PROFILE_FIELDS = ("name", "email", "phone", "location", "linkedin") + tuple(field for field, _ in SECTIONS)
+
+# Unicode blocks kept in the per-process working copy of the font: Latin
+# (including Vietnamese), punctuation, currency, letterlike symbols, arrows,
+# and the shapes and dingbats used as bullets. Every document loads and
+# subsets the font it uses, so a small working copy is much faster; profiles
+# with other characters (Greek, Cyrillic, ...) get the complete font.
+WORKING_SET = ((0x20, 0x24F), (0x1E00, 0x1EFF), (0x2000, 0x20CF), (0x2100, 0x21FF), (0x25A0, 0x25FF),
+               (0x2700, 0x27BF))
+
+# Searched in order when RESUMATE_PDF_FONT is unset
+FONT_DIRS = (
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/dejavu",
+    "/usr/share/fonts/TTF",
+    "/usr/local/share/fonts",
+    "/Library/Fonts",
+    os.path.expanduser("~/.fonts"),
+)
+
+
+@dataclass(frozen=True)
+class Template:
+    """
+    A resume layout. `rule_width` is the length of the line under each
+    heading in mm (None spans the page, 0 draws none).
+    """
+
+    name: str
+    align: str = "L"
+    margin: float = 10
+    name_size: float = 24
+    contact_size: float = 10
+    heading_size: float = 14
+    body_size: float = 11
+    line_height: float = 6
+    heading_height: float = 10
+    section_gap: float = 5
+    rule_width: float = None
+    uppercase_name: bool = True
+    separator: str = " | "
+    description: str = ""
+
+
+TEMPLATES = {
+    t.name: t for t in (
+        Template("Modern", align="C", description="Centered header, full-width section rules."),
+        Template("Classic", rule_width=80, description="Left-aligned, short section rules."),
+        Template("Compact", margin=12, name_size=18, contact_size=9, heading_size=11, body_size=9.5,
+                 line_height=4.6, heading_height=7, section_gap=3,
+                 description="Smaller type and spacing to fit more on one page."),
+        Template("Minimal", margin=18, name_size=20, heading_size=11, body_size=10.5, line_height=5.5,
+                 heading_height=8, section_gap=6, rule_width=0, uppercase_name=False, separator="  ·  ",
+                 description="Wide margins, no rules, name in title case."),
+    )
+}
+
+
+def get_template(name):
+    try:
+        return TEMPLATES[name]
+    except KeyError:
+        raise ValueError(f"Unknown resume template '{name}' (choose from {', '.join(TEMPLATES)})") from None
+
+
+def find_font():
+    """
+    (regular, bold) TrueType paths from RESUMATE_PDF_FONT/_BOLD, else DejaVu
+    Sans from the usual font directories; None for the core-font fallback.
+    """
+    if config.PDF_FONT:
+        if config.PDF_FONT == "core":
+            return None
+        return config.PDF_FONT, config.PDF_FONT_BOLD or config.PDF_FONT
+    for directory in FONT_DIRS:
+        regular = os.path.join(directory, "DejaVuSans.ttf")
+        if os.path.isfile(regular):
+            bold = os.path.join(directory, "DejaVuSans-Bold.ttf")
+            return regular, bold if os.path.isfile(bold) else regular
+    return None
+
+
+class PDF(FPDF):
+    def header(self):
+        pass
+    def footer(self):
+        pass
+
+
+def _font_program(path, unicodes=None):
+    with open(path, "rb") as f:
+        program = f.read()
+    if unicodes is None:
+        return program
+    font = TTFont(io.BytesIO(program), recalcTimestamp=False)
+    options = subset.Options(glyph_names=True, notdef_outline=True, name_IDs=["*"], name_languages=["*"],
+                             layout_features=[], hinting=False, ignore_missing_unicodes=True)
+    options.drop_tables = options.drop_tables + ["FFTM"]
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+    out = io.BytesIO()
+    font.save(out)
+    return out.getvalue()
+
+
+class _FontFamily:
+    """
+    A regular and a bold TrueType face parsed once. install() adds them to
+    a document as copies that own their font tables, since fpdf2 subsets
+    those in place when the document is written.
+    """
+
+    def __init__(self, paths, unicodes=None):
+        owner = FPDF()
+        self._faces = []
+        for style, path in zip(("", "B"), paths):
+            program = _font_program(path, unicodes)
+            fontkey = "resumesans" + style
+            owner.fonts[fontkey] = TTFFont(owner, io.BytesIO(program), fontkey, style)
+            self._faces.append((owner.fonts[fontkey], program))
+        self.charset = frozenset(owner.fonts["resumesans"].cmap)
+
+    def install(self, pdf):
+        for parsed, program in self._faces:
+            # Widths, cmap and glyph IDs are shared; the font tables and the
+            # subset being collected belong to this document
+            font = copy.copy(parsed)
+            font.ttfont = TTFont(io.BytesIO(program), recalcTimestamp=False, lazy=True)
+            font.missing_glyphs = []
+            font.biggest_size_pt = 0
+            font.subset = SubsetMap(font)
+            pdf.fonts[font.fontkey] = font
+
+
+@lru_cache(maxsize=None)
+def _font_family(full=False):
+    # Parsed once per process
+    paths = find_font()
+    if paths is None:
+        return None
+    return _FontFamily(paths, None if full else [c for lo, hi in WORKING_SET for c in range(lo, hi + 1)])
+
+
+@lru_cache(maxsize=64)
+def _rgb(accent_color):
+    h = accent_color.lstrip('#')
+    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+
+
+def _new_document(template, texts):
+    """
+    A blank document laid out for `template` with the font family that
+    covers `texts`. Returns (pdf, family name, function preparing text).
+    """
+    pdf = PDF()
+    pdf.set_margins(template.margin, template.margin, template.margin)
+    pdf.set_auto_page_break(True, margin=max(template.margin, 15))
+    used = {ord(c) for value in texts for c in value.upper() + value if c >= " "}
+    # Helvetica covers Latin-1 and needs no font embedded, which is several
+    # times faster than the TrueType font
+    family = None if max(used, default=0) < 0x100 else _font_family()
+    if family is None:
+        return pdf, "Helvetica", _latin1
+    if not used <= family.charset:
+        family = _font_family(full=True)
+    family.install(pdf)
+    return pdf, "ResumeSans", str
+
+
+def _latin1(value):
+    # The core fonts only encode Latin-1
+    return value.encode("latin-1", "replace").decode("latin-1")
+
+
+def render_resume(data, accent_color=DEFAULT_ACCENT, template="Modern"):
+    """Renders a profile dict (see PROFILE_FIELDS) as PDF bytes."""
+    t = get_template(template)
+    pdf, family, text = _new_document(t, [v for v in data.values() if isinstance(v, str)])
+    rgb = _rgb(accent_color)
+    pdf.add_page()
+
+    # Header
+    pdf.set_font(family, 'B', t.name_size)
+    pdf.set_text_color(15, 23, 42)
+    name = data['name'].upper() if t.uppercase_name else data['name']
+    pdf.cell(0, t.name_size * 0.6, text(name), new_x="LMARGIN", new_y="NEXT", align=t.align)
+
+    pdf.set_font(family, '', t.contact_size)
+    pdf.set_text_color(100, 116, 139)
+    contact_info = t.separator.join(v for v in (data.get('email'), data.get('phone'), data.get('location')) if v)
+    pdf.cell(0, t.contact_size / 2, text(contact_info), new_x="LMARGIN", new_y="NEXT", align=t.align)
+    if data.get('linkedin'):
+        pdf.cell(0, t.contact_size / 2, text(data['linkedin']), new_x="LMARGIN", new_y="NEXT", align=t.align)
+
+    pdf.ln(t.section_gap * 2)
+
+    # Sections
+    rule_width = pdf.epw if t.rule_width is None else t.rule_width
+    for field, title in SECTIONS:
+        content = data.get(field)
+        if not content:
+            continue
+        pdf.set_font(family, 'B', t.heading_size)
+        pdf.set_text_color(*rgb)
+        pdf.cell(0, t.heading_height, text(title.upper()), new_x="LMARGIN", new_y="NEXT")
+        if rule_width:
+            pdf.set_draw_color(226, 232, 240)
+            pdf.line(pdf.get_x(), pdf.get_y(), pdf.get_x() + rule_width, pdf.get_y())
+        pdf.ln(2)
+
+        pdf.set_font(family, '', t.body_size)
+        pdf.set_text_color(30, 41, 59)
+        pdf.multi_cell(0, t.line_height, text(content))
+        pdf.ln(t.section_gap)
+
+    return bytes(pdf.output())
+
+
+def generate_resume_pdf(data, accent_color, layout_style="Modern"):
+    """The Builder's and the API's entry point; `layout_style` names a template."""
+    return render_resume(data, accent_color, layout_style)
+
+
+def render_prep_pack(pack, accent_color=DEFAULT_ACCENT, title="Interview Prep Pack"):
+    """Renders a resumate.questions.prep_pack result as PDF bytes, grouped by skill."""
+    t = get_template("Classic")
+    questions = pack["questions"] + pack["behavioral"]
+    pdf, family, text = _new_document(t, [title] + [q["text"] for q in questions] + [q["skill"] for q in questions])
+    rgb = _rgb(accent_color)
+    pdf.add_page()
+
+    pdf.set_font(family, 'B', 20)
+    pdf.set_text_color(15, 23, 42)
+    pdf.cell(0, 12, text(title), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font(family, '', t.contact_size)
+    pdf.set_text_color(100, 116, 139)
+    skills = ", ".join(s["skill"] for s in pack["skills"])
+    pdf.multi_cell(0, t.contact_size / 2, text(f"Skills from the job description: {skills}" if skills else
+                                              "No specific skills found in the job description."))
+    pdf.ln(t.section_gap)
+
+    groups = {}
+    for q in pack["questions"]:
+        groups.setdefault(q["skill"], []).append(q)
+    if pack["behavioral"]:
+        groups["Behavioral"] = pack["behavioral"]
+
+    number = 0
+    for heading, group in groups.items():
+        pdf.set_font(family, 'B', t.heading_size)
+        pdf.set_text_color(*rgb)
+        pdf.cell(0, t.heading_height, text(heading.upper()), new_x="LMARGIN", new_y="NEXT")
+        pdf.set_draw_color(226, 232, 240)
+        pdf.line(pdf.get_x(), pdf.get_y(), pdf.get_x() + t.rule_width, pdf.get_y())
+        pdf.ln(2)
+        pdf.set_text_color(30, 41, 59)
+        for q in group:
+            number += 1
+            pdf.set_font(family, '', t.body_size)
+            pdf.multi_cell(0, t.line_height, text(f"{number}. {q['text']}  ({q['difficulty']})"))
+            pdf.ln(1)
+        pdf.ln(t.section_gap)
+
+    return bytes(pdf.output())
+
+
+def iter_profiles(filename, data):
+    """
+    Yields profile dicts from a .csv (one column per field, header row
+    required) or .jsonl/.json file given as bytes. Optional `template` and
+    `accent_color` columns override the export-wide choice per profile.
+    """
+    text = data.decode("utf-8-sig", errors="replace")
+    if filename.lower().endswith(".csv"):
+        rows = csv.DictReader(io.StringIO(text))
+    elif filename.lower().endswith(".json") and text.lstrip().startswith("["):
+        rows = json.loads(text)
+    else:
+        rows = (json.loads(line) for line in text.splitlines() if line.strip())
+    for row in rows:
+        yield {key.strip().lower(): ("" if value is None else str(value).strip())
+               for key, value in row.items() if key}
+
+
+def _render_chunk(jobs):
+    # Runs in a pool worker: [(index, profile, accent, template)] -> [(index, pdf bytes, error)]
+    out = []
+    for index, profile, accent_color, template in jobs:
+        try:
+            if not profile.get("name"):
+                raise ValueError("missing name")
+            out.append((index, render_resume(profile, accent_color, template), None))
+        except Exception as e:
+            out.append((index, None, str(e)))
+    return out
+
+
+def _archive_name(profile, used):
+    base = re.sub(r"[^\w.-]+", "_", profile.get("name") or "resume").strip("_") or "resume"
+    name = f"{base}_Resume.pdf"
+    n = 1
+    while name in used:
+        n += 1
+        name = f"{base}_Resume_{n}.pdf"
+    used.add(name)
+    return name
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool():
+    """Process pool shared by bulk exports (PDF_WORKERS processes, default one per CPU)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Imported here: resumate.batch pulls in the extraction stack
+                from resumate.batch import _new_pool, _start_workers
+
+                workers = config.PDF_WORKERS or os.cpu_count() or 1
+                pool = _new_pool(workers)
+                _start_workers(pool, workers)
+                _pool = pool
+    return _pool
+
+
+def render_bulk(profiles, out, accent_color=DEFAULT_ACCENT, template="Modern", workers=None,
+                chunk_size=16, progress=None):
+    """
+    Renders profiles into a ZIP written to `out` (a path or binary file
+    object). By default the chunks go to the shared get_render_pool();
+    `workers` starts a pool of that many processes for this call instead
+    (0 renders in this process). Profiles are sent to the workers
+    `chunk_size` at a time and `progress(done)` is called as chunks come
+    back, in input order. Returns (rendered count, [(row number, error)]).
+    """
+    get_template(template)
+    chunks = []
+    profiles = list(profiles)
+    for start in range(0, len(profiles), chunk_size):
+        chunks.append([
+            (i, p, p.get("accent_color") or accent_color, p.get("template") or template)
+            for i, p in enumerate(profiles[start:start + chunk_size], start=start)
+        ])
+
+    own_pool = workers is not None
+    futures = []
+    if workers == 0 or len(chunks) <= 1:
+        own_pool = False
+        results = map(_render_chunk, chunks)
+    else:
+        if own_pool:
+            from resumate.batch import _new_pool, _start_workers
+
+            pool = _new_pool(min(workers, len(chunks)))
+            _start_workers(pool, pool._max_workers)
+        else:
+            pool = get_render_pool()
+        futures = [pool.submit(_render_chunk, chunk) for chunk in chunks]
+        results = (future.result() for future in futures)
+
+    used = set()
+    errors = []
+    done = 0
+    try:
+        # PDF streams are already compressed
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as archive:
+            for chunk in results:
+                for index, pdf_bytes, error in chunk:
+                    if error:
+                        errors.append((index + 1, error))
+                    else:
+                        archive.writestr(_archive_name(profiles[index], used), pdf_bytes)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done)
+    finally:
+        # A failed or cancelled export leaves the shared pool to other jobs
+        for future in futures:
+            future.cancel()
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+    return done - len(errors), errors
+
+
+def export_resumes(job, filename, data, accent_color=DEFAULT_ACCENT, template="Modern"):
+    """resumate.jobs function for the Builder's bulk export: a profiles file to ZIP bytes."""
+    profiles = list(iter_profiles(filename, data))
+    if not profiles:
+        raise ValueError(f"No profiles found in {filename}")
+    job.report(0.0, f"Rendering {len(profiles)} resumes...")
+    buf = io.BytesIO()
+    count, errors = render_bulk(
+        profiles, buf, accent_color, template,
+        progress=lambda done: job.report(done / len(profiles), f"Rendered {done}/{len(profiles)} resumes"),
+    )
+    return {"zip": buf.getvalue(), "count": count, "errors": errors}
@@ -0,0 +1,180 @@
+"""
+Interview question bank for the Interview Prep page.
+
+Curated questions live in data/questions.json, keyed by canonical skill
+(see skills.json) and difficulty. Skills without curated questions get
+questions from their category's templates. The bank is loaded once per
+process, like the taxonomy, and reloaded when the file changes.
+
+A prep pack ranks the JD's skills by how often the JD mentions them and
+samples questions for each one. Sampling is seeded from the JD, so the same
+JD and settings always give the same pack, and packs are memoized, so
+revisiting a JD doesn't redo any work. Packs are never truncated: long JDs
+give long packs, which the page shows a page at a time.
+"""
+import json
+import logging
+import os
+import random
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from resumate import config
+from resumate.cache import LRUCache, content_key
+from resumate.keywords import get_keywords
+from resumate.taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUESTIONS_PATH = Path(__file__).parent / "data" / "questions.json"
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+@dataclass(frozen=True)
+class Question:
+    text: str
+    difficulty: str
+    skill: str = ""
+    category: str = ""
+
+
+class QuestionBank:
+    """
+    Immutable index over a questions file: curated questions by skill and
+    difficulty, category templates and behavioral questions.
+    """
+
+    def __init__(self, version, skills, templates, behavioral, fingerprint=""):
+        self.version = version
+        self.fingerprint = fingerprint
+        taxonomy = get_taxonomy()
+
+        self._by_skill = {}
+        for skill, questions in skills.items():
+            canonical = taxonomy.canonical(skill) or skill
+            category = taxonomy.category_of(canonical) or ""
+            self._by_skill[canonical] = self._index(questions, canonical, category)
+        self._templates = {cat: self._index(questions) for cat, questions in templates.items()}
+        self.behavioral = self._index(behavioral, category="Behavioral")
+
+    @staticmethod
+    def _index(questions, skill="", category=""):
+        by_difficulty = {d: [] for d in DIFFICULTIES}
+        for q in questions:
+            if q["difficulty"] not in by_difficulty:
+                raise ValueError(f"Unknown difficulty '{q['difficulty']}' for question: {q['text']}")
+            by_difficulty[q["difficulty"]].append(Question(q["text"], q["difficulty"], skill, category))
+        return {d: tuple(qs) for d, qs in by_difficulty.items()}
+
+    @classmethod
+    def from_file(cls, path):
+        raw = Path(path).read_bytes()
+        data = json.loads(raw)
+        return cls(data["version"], data["skills"], data.get("templates", {}), data.get("behavioral", []),
+                   content_key(raw))
+
+    def questions_for(self, skill, difficulties=DIFFICULTIES):
+        """Questions for a canonical skill at the given difficulties, easiest first."""
+        curated = self._by_skill.get(skill)
+        if curated is not None:
+            return [q for d in difficulties for q in curated[d]]
+        category = get_taxonomy().category_of(skill) or ""
+        templates = self._templates.get(category) or self._templates.get("*", {})
+        return [Question(t.text.format(skill=skill), d, skill, category)
+                for d in difficulties for t in templates.get(d, ())]
+
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def get_question_bank(path=None):
+    """
+    Returns the question bank for `path` (default: RESUMATE_QUESTIONS or the
+    bundled questions.json), loading it once and again whenever the file or
+    the skill taxonomy changes.
+    """
+    path = str(path or config.QUESTIONS_PATH or DEFAULT_QUESTIONS_PATH)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size, get_taxonomy().fingerprint)
+
+    cached = _loaded.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with _lock:
+        cached = _loaded.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        bank = QuestionBank.from_file(path)
+        _loaded[path] = (stamp, bank)
+        logger.info("Loaded question bank %s from %s", bank.version, path)
+        return bank
+
+
+def rank_skills(jd_text):
+    """
+    The JD's skills as [(skill, category, mentions)], most mentioned first;
+    ties keep the order in which the JD first mentions them.
+    """
+    taxonomy = get_taxonomy()
+    keywords = get_keywords(jd_text)
+    counts = taxonomy.matcher.count_all(jd_text.lower())
+    order = {skill: i for i, skill in enumerate(taxonomy.matcher.find_all(jd_text.lower()))}
+    skills = [(skill, cat, counts.get(skill, 1)) for cat, found in keywords.items() for skill in found]
+    # Skills only the POS tagger found have no matcher position; they go last
+    return sorted(skills, key=lambda s: (-s[2], order.get(s[0], len(order))))
+
+
+_packs = LRUCache(256)
+
+
+def prep_pack(jd_text, difficulties=DIFFICULTIES, per_skill=2, behavioral=4, seed=0):
+    """
+    Interview questions for a JD as a plain dict:
+
+        {"skills": [{"skill", "category", "mentions"}],
+         "questions": [{"text", "difficulty", "skill", "category"}],
+         "behavioral": [...same...]}
+
+    Up to `per_skill` questions are sampled per skill, in skill rank order.
+    The result depends only on the arguments (change `seed` for a different
+    sample) and is memoized; treat it as read-only.
+    """
+    difficulties = tuple(d for d in DIFFICULTIES if d in difficulties)
+    bank = get_question_bank()
+    jd_key = content_key(" ".join(jd_text.lower().split()))
+    key = content_key("prep", jd_key, ",".join(difficulties), str(per_skill), str(behavioral), str(seed),
+                      bank.fingerprint, get_taxonomy().fingerprint, config.KEYWORD_MODE)
+    pack = _packs.get(key)
+    if pack is not None:
+        return pack
+
+    ranked = rank_skills(jd_text)
+    questions = []
+    for skill, _, _ in ranked:
+        pool = bank.questions_for(skill, difficulties)
+        questions.extend(_sample(pool, per_skill, jd_key, skill, seed))
+    pool = [q for d in difficulties for q in bank.behavioral[d]]
+    pack = {
+        "skills": [{"skill": skill, "category": cat, "mentions": n} for skill, cat, n in ranked],
+        "questions": [asdict(q) for q in questions],
+        "behavioral": [asdict(q) for q in _sample(pool, behavioral, jd_key, "behavioral", seed)],
+    }
+    _packs.set(key, pack)
+    return pack
+
+
+def _sample(pool, k, *seed_parts):
+    if len(pool) <= k:
+        return pool
+    rng = random.Random(content_key(*map(str, seed_parts)))
+    # Keep the bank's easiest-first order within the sample
+    return [pool[i] for i in sorted(rng.sample(range(len(pool)), k))]
+
+
+def page(items, number, size):
+    """The 1-based page `number` of `items` and the page count."""
+    pages = max(1, -(-len(items) // size))
+    number = min(max(number, 1), pages)
+    return items[(number - 1) * size:number * size], pages
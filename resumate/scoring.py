@@ -0,0 +1,165 @@
+import numpy as np
+from scipy import sparse
+
+from resumate.taxonomy import get_taxonomy
+
+
+def score_match(jd_results, resume_results):
+    """
+    Compares JD and resume keywords.
+    Returns (score, found_dict, missing_dict, total_found, total_jd).
+    """
+    found_dict = {}
+    missing_dict = {}
+    
+    all_jd_keywords = []
+    all_res_keywords = []
+    
+    for cat in jd_results:
+        f = set(jd_results[cat]).intersection(set(resume_results[cat]))
+        m = set(jd_results[cat]).difference(set(resume_results[cat]))
+        
+        if f: found_dict[cat] = sorted(list(f))
+        if m: missing_dict[cat] = sorted(list(m))
+        
+        all_jd_keywords.extend(jd_results[cat])
+        all_res_keywords.extend(resume_results[cat])
+    
+    total_jd = len(all_jd_keywords)
+    total_found = len(set(all_jd_keywords).intersection(set(all_res_keywords)))
+    
+    score = round((total_found / total_jd) * 100) if total_jd > 0 else 0
+    return score, found_dict, missing_dict, total_found, total_jd
+
+
+def merge_results(results):
+    """One get_keywords result from several (e.g. one per section), keeping first-seen order."""
+    merged = {cat: [] for cat in get_taxonomy().categories}
+    for res in results:
+        for cat, skills in res.items():
+            found = merged.setdefault(cat, [])
+            found.extend(skill for skill in skills if skill not in found)
+    return merged
+
+
+# How much a JD skill counts for, by the resume section it was found in
+# (resumate.sections): shown in work is worth more than listed or mentioned
+# in passing. A resume without recognized headings is all "header" and
+# counts in full.
+SECTION_WEIGHTS = {
+    "experience": 1.0,
+    "projects": 0.9,
+    "skills": 0.8,
+    "summary": 0.6,
+    "education": 0.6,
+    "header": 0.5,
+    "other": 0.25,
+}
+
+
+def score_sections(jd_results, section_results, section_weights=None):
+    """
+    Section-weighted variant of score_match. `section_results` maps resume
+    section names to get_keywords results (see sections.section_keywords).
+    Each JD skill earns the weight of the best section it appears in, and
+    the score is the percentage of the maximum.
+    Returns (score, {skill: [sections it was found in, best first]}).
+    """
+    weights = section_weights or SECTION_WEIGHTS
+    if set(section_results) <= {"header"}:
+        weights = {"header": 1.0}
+    where = {}
+    for section, results in section_results.items():
+        for skills in results.values():
+            for skill in skills:
+                where.setdefault(skill, []).append(section)
+
+    jd_skills = {skill for skills in jd_results.values() for skill in skills}
+    found = {}
+    earned = 0.0
+    for skill in jd_skills:
+        sections = sorted(where.get(skill, ()), key=lambda s: -weights.get(s, 0.0))
+        if sections:
+            found[skill] = sections
+            earned += weights.get(sections[0], 0.0)
+    score = round(earned / len(jd_skills) * 100) if jd_skills else 0
+    return score, found
+
+
+class SkillVocabulary:
+    """Column index for every canonical skill in a taxonomy."""
+
+    def __init__(self, taxonomy=None):
+        taxonomy = taxonomy or get_taxonomy()
+        self.skills = [skill for skills in taxonomy.categories.values() for skill in skills]
+        self.column = {skill: i for i, skill in enumerate(self.skills)}
+        self.categories = [taxonomy.category_of(skill) for skill in self.skills]
+
+    def __len__(self):
+        return len(self.skills)
+
+    def matrix(self, keyword_results):
+        """Binary CSR matrix (documents x skills) from get_keywords results."""
+        indptr = [0]
+        indices = []
+        for results in keyword_results:
+            cols = {self.column[s] for skills in results.values() for s in skills if s in self.column}
+            indices.extend(sorted(cols))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self)))
+
+
+def idf_weights(resume_matrix):
+    """Smoothed inverse document frequency of each skill across a resume pool."""
+    n = resume_matrix.shape[0]
+    df = np.asarray((resume_matrix > 0).sum(axis=0)).ravel()
+    return np.log((1 + n) / (1 + df)) + 1
+
+
+def score_matrix(jd_results, resume_results, category_weights=None, required=None,
+                 required_weight=2.0, idf=False, vocabulary=None):
+    """
+    Scores M job descriptions against N resumes with one sparse matrix
+    product and returns an M x N array of percentages (unrounded).
+
+    Each JD skill is weighted by its category weight (default 1), times
+    `required_weight` if it is in `required` (skill names for all JDs, or a
+    list of skill sets, one per JD), times its IDF over the resume pool if
+    `idf` is set. A score is
+    the weight of matched JD skills over the total JD weight, so with
+    uniform weights round(score) equals score_match's score.
+    """
+    vocab = vocabulary or SkillVocabulary()
+    jd = vocab.matrix(jd_results)
+    res = vocab.matrix(resume_results)
+
+    column_weights = np.ones(len(vocab), dtype=np.float64)
+    if category_weights:
+        column_weights *= np.array([category_weights.get(cat, 1.0) for cat in vocab.categories])
+    if idf:
+        column_weights *= idf_weights(res)
+    weights = jd.multiply(column_weights).tocsr()
+
+    if required:
+        required = [required] if isinstance(required, str) else list(required)
+        if all(isinstance(skill, str) for skill in required):
+            per_jd = [required] * len(jd_results)
+        elif len(required) == len(jd_results):
+            per_jd = required
+        else:
+            raise ValueError(f"required has {len(required)} skill sets for {len(jd_results)} job descriptions")
+        rows, cols = [], []
+        for row, skills in enumerate(per_jd):
+            for skill in skills:
+                if skill in vocab.column:
+                    rows.append(row)
+                    cols.append(vocab.column[skill])
+        boost = sparse.csr_matrix((np.full(len(rows), required_weight - 1.0), (rows, cols)), shape=jd.shape)
+        weights = weights + weights.multiply(boost)
+
+    matched = np.asarray((weights @ res.T).todense())
+    totals = np.asarray(weights.sum(axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(totals > 0, matched / totals * 100, 0.0)
+    return scores
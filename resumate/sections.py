@@ -0,0 +1,226 @@
+"""
+Splits extracted resume text into the sections the Resume Builder uses
+(summary, education, experience, skills, projects), so matching can tell
+whether a skill appears under Skills, Experience or a hobby line.
+
+A ResumeDocument keeps the text once and describes each section by offsets
+into it; section text is only sliced out when asked for. Text before the
+first recognized heading is the "header" (name and contact details), and
+headings such as Certifications or Hobbies start an "other" section.
+
+    doc = parse_resume(text)
+    doc.section_text("skills")
+    doc.to_profile()   # a dict for the Builder form / render_resume
+    section_keywords(doc)  # get_keywords results per section
+
+profile_keywords does the same for a Builder profile, field by field.
+"""
+import re
+
+from resumate import config
+from resumate.cache import LRUCache, content_key, get_cache
+from resumate.keywords import get_keywords_batch
+from resumate.taxonomy import get_taxonomy
+
+HEADER = "header"
+OTHER = "other"
+
+# Headings recognized for each section, matched case-insensitively against
+# a whole line (an optional trailing colon and leading bullet are ignored).
+# "and" also matches "&".
+HEADINGS = {
+    "summary": ("summary", "professional summary", "career summary", "profile", "professional profile",
+                "personal profile", "objective", "career objective", "about me", "about"),
+    "education": ("education", "academic background", "education and training", "academics",
+                  "academic qualifications", "qualifications"),
+    "experience": ("experience", "work experience", "professional experience", "relevant experience",
+                   "employment", "employment history", "work history", "career history", "internships",
+                   "internship experience"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "skills and tools",
+               "core competencies", "competencies", "technologies", "tech stack", "skills and technologies"),
+    "projects": ("projects", "personal projects", "academic projects", "significant projects", "selected projects",
+                 "key projects", "side projects"),
+    # Never scored like the sections above; these may not have text after the colon
+    OTHER: ("certifications", "certificates", "licenses and certifications", "awards", "honors",
+            "honors and awards", "achievements", "publications", "languages", "interests", "hobbies",
+            "hobbies and interests", "volunteering", "volunteer experience", "activities",
+            "extracurricular activities", "references"),
+}
+SECTION_NAMES = tuple(name for name in HEADINGS if name != OTHER)
+
+# OTHER headings that are subheadings when they come up inside Skills:
+# "Languages" there lists programming languages, not spoken ones
+SKILLS_SUBHEADINGS = ("languages",)
+
+# Builder profile fields that make up the header; the others are SECTION_NAMES
+HEADER_FIELDS = ("name", "email", "phone", "location", "linkedin")
+
+# Bump when parsing changes so cached documents are reparsed
+PARSER_VERSION = "2"
+
+
+def _alias_regex(alias):
+    words = [r"(?:and|&)" if word == "and" else re.escape(word) for word in alias.split()]
+    return r"[ \t]+".join(words)
+
+
+_ALIASES = {alias: name for name, aliases in HEADINGS.items() for alias in aliases}
+_HEADING = re.compile(
+    r"^[ \t]*(?:[#*•▪■◆►\-–—]+[ \t]*)?"
+    r"(" + "|".join(_alias_regex(a) for a in sorted(_ALIASES, key=len, reverse=True)) + r")"
+    r"[ \t]*(?::[ \t]*(.*?))?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"\+?\d[\d ().-]{6,}\d")
+_PROFILE_URL = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com|gitlab\.com)/[^\s|·•,]+", re.IGNORECASE)
+_LOCATION = re.compile(r"^[^\W\d_][^\d@/|·•]*,[ \t]*[^\W\d_][^\d@/|·•]*$")
+_CONTACT_SEPARATORS = re.compile(r"[ \t]*[|·•\t][ \t]*| {3,}")
+
+
+class Section:
+    """
+    One section of a ResumeDocument: its heading is text[heading_start:start]
+    and its body text[start:end].
+    """
+
+    __slots__ = ("name", "heading_start", "start", "end")
+
+    def __init__(self, name, heading_start, start, end):
+        self.name = name
+        self.heading_start = heading_start
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Section({self.name!r}, {self.heading_start}, {self.start}, {self.end})"
+
+
+class ResumeDocument:
+    """Resume text and its sections, in the order they appear."""
+
+    __slots__ = ("text", "sections")
+
+    def __init__(self, text, sections):
+        self.text = text
+        self.sections = sections
+
+    @property
+    def sectioned(self):
+        """Whether any heading was recognized (otherwise everything is the header)."""
+        return any(s.name != HEADER for s in self.sections)
+
+    def names(self):
+        """Section names present, in order of first appearance."""
+        return list(dict.fromkeys(s.name for s in self.sections))
+
+    def section_text(self, name):
+        """The bodies of every section called `name`, joined by blank lines."""
+        return "\n\n".join(self.text[s.start:s.end].strip() for s in self.sections if s.name == name).strip()
+
+    def to_dict(self):
+        """Compact JSON-serializable form; the text itself is not included."""
+        return [[s.name, s.heading_start, s.start, s.end] for s in self.sections]
+
+    @classmethod
+    def from_dict(cls, text, sections):
+        return cls(text, [Section(*s) for s in sections])
+
+    def to_profile(self):
+        """
+        The document as a profile dict with the fields of the Resume Builder
+        (pdf.PROFILE_FIELDS). Contact details are picked out of the header.
+        """
+        profile = dict.fromkeys(HEADER_FIELDS, "")
+        header = self.section_text(HEADER)
+        for pattern, field in ((_EMAIL, "email"), (_PROFILE_URL, "linkedin"), (_PHONE, "phone")):
+            m = pattern.search(header)
+            if m:
+                profile[field] = m.group(0)
+                header = header.replace(m.group(0), " ")
+
+        # The name comes first; the location is a "City, Region" part near it
+        for line in header.splitlines()[:6]:
+            for part in _CONTACT_SEPARATORS.split(line.strip()):
+                part = part.strip(" ,;")
+                if not part:
+                    continue
+                if not profile["name"]:
+                    profile["name"] = part.title() if part.isupper() else part
+                elif not profile["location"] and _LOCATION.match(part):
+                    profile["location"] = part
+
+        for name in SECTION_NAMES:
+            profile[name] = self.section_text(name)
+        return profile
+
+
+def split_sections(text):
+    """Parses `text` into a ResumeDocument without the cache."""
+    sections = []
+    heading_start, start = 0, 0
+    name = HEADER
+    for m in _HEADING.finditer(text):
+        alias = " ".join(m.group(1).lower().replace("&", "and").split())
+        heading_name = _ALIASES[alias]
+        # "Skills: Python, SQL" starts the section on the heading line, but
+        # "Languages: English" inside Skills is content, not a new section
+        if heading_name == OTHER and (m.group(2) or (name == "skills" and alias in SKILLS_SUBHEADINGS)):
+            continue
+        if m.start() > start or name != HEADER:
+            sections.append(Section(name, heading_start, start, m.start()))
+        name, heading_start = heading_name, m.start()
+        start = m.start(2) if m.group(2) else m.end()
+    if len(text) > start or name != HEADER:
+        sections.append(Section(name, heading_start, start, len(text)))
+    return ResumeDocument(text, sections)
+
+
+def parse_resume(text):
+    """
+    Parses extracted resume text into a ResumeDocument. The section offsets
+    are cached by content, so reparsing a resume that was seen before only
+    rebuilds the offset records.
+    """
+    cache = get_cache()
+    key = content_key("sections", PARSER_VERSION, text)
+    cached = cache.get(key)
+    if cached is not None:
+        return ResumeDocument.from_dict(text, cached)
+    doc = split_sections(text)
+    cache.set(key, doc.to_dict())
+    return doc
+
+
+def section_keywords(doc):
+    """
+    get_keywords results for each section name of `doc`, as {name: results}.
+    All sections go through get_keywords_batch together.
+    """
+    names = doc.names()
+    return dict(zip(names, get_keywords_batch([doc.section_text(name) for name in names])))
+
+
+_field_results = LRUCache(1024)
+
+
+def profile_keywords(profile):
+    """
+    get_keywords results for each non-empty section of a Builder profile
+    (see ResumeDocument.to_profile), as {name: results}, with the contact
+    fields as the header. Results are memoized per field text, so after an
+    edit only the changed field goes through get_keywords_batch.
+    """
+    texts = {HEADER: "\n".join(profile.get(field) or "" for field in HEADER_FIELDS).strip()}
+    texts.update((name, (profile.get(name) or "").strip()) for name in SECTION_NAMES)
+    texts = {name: text for name, text in texts.items() if text}
+
+    taxonomy = get_taxonomy()
+    keys = {name: content_key("field", taxonomy.fingerprint, config.KEYWORD_MODE, text) for name, text in texts.items()}
+    results = {name: _field_results.get(key) for name, key in keys.items()}
+    changed = [name for name, found in results.items() if found is None]
+    for name, found in zip(changed, get_keywords_batch([texts[name] for name in changed])):
+        _field_results.set(keys[name], found)
+        results[name] = found
+    return results
@@ -0,0 +1,324 @@
+"""
+Semantic matching: embeds the sentences of a JD and a resume and pairs each
+JD requirement with its nearest resume sentence, so "built REST services in
+FastAPI" can cover "API development" even though no keyword is shared.
+
+Everything runs offline on CPU. The embedding backend is the first available
+of (see RESUMATE_SEMANTIC_BACKEND):
+
+- sentence-transformers with a locally installed model (never downloaded)
+- the word vectors of a spaCy model that ships them (en_core_web_md/lg)
+- hashed word and character n-grams plus taxonomy skills; no model needed,
+  but it only catches shared word forms and skill aliases
+
+Embeddings are cached per sentence by content hash, so a resume or JD is
+only encoded once, and misses are encoded in batches.
+"""
+import base64
+import os
+import re
+import threading
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from resumate import config
+from resumate.cache import DiskCache, LRUCache, TieredCache, content_key
+from resumate.taxonomy import get_taxonomy
+
+# Vector sets smaller than this are searched exactly with NumPy even when an
+# ANN library is installed: one matrix product beats building an index.
+ANN_MIN_VECTORS = 2048
+
+_SENTENCE_BREAK = re.compile(r"[\n\f\r]+|(?<=[.!?;])\s+|\s+[•·▪●◦]\s+")
+_BULLET_CHARS = " \t•·▪●◦-–—*>:"
+
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we will with you your".split()
+)
+
+
+def split_sentences(text, min_words=3):
+    """
+    Splits a resume or JD into unique sentences and bullet points with at
+    least `min_words` words, in document order.
+    """
+    seen = set()
+    sentences = []
+    for piece in _SENTENCE_BREAK.split(text or ""):
+        piece = " ".join(piece.strip(_BULLET_CHARS).split())
+        if len(piece.split()) < min_words or piece.lower() in seen:
+            continue
+        seen.add(piece.lower())
+        sentences.append(piece)
+    return sentences
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class SentenceTransformerEmbedder:
+    """A sentence-transformers model loaded from local files only."""
+
+    threshold = 0.5
+
+    def __init__(self, model):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model, device="cpu", local_files_only=True)
+        self.name = f"sentence-transformers:{model}"
+
+    def encode(self, texts):
+        return _normalize(self._model.encode(
+            texts, batch_size=config.EMBEDDING_BATCH_SIZE, convert_to_numpy=True, show_progress_bar=False
+        ))
+
+
+class SpacyVectorEmbedder:
+    """Mean of a spaCy model's static word vectors over each sentence."""
+
+    threshold = 0.8
+
+    def __init__(self, model):
+        import spacy
+
+        # Only the tokenizer and the vector table are needed
+        self._nlp = spacy.load(model, exclude=["tok2vec", "tagger", "parser", "ner", "attribute_ruler",
+                                               "lemmatizer", "senter"])
+        if not self._nlp.vocab.vectors.shape[0]:
+            raise ValueError(f"spaCy model '{model}' has no word vectors")
+        self.name = f"spacy:{model}"
+
+    def encode(self, texts):
+        docs = self._nlp.pipe(texts, batch_size=config.EMBEDDING_BATCH_SIZE)
+        return _normalize([doc.vector for doc in docs])
+
+
+class HashingEmbedder:
+    """
+    Model-free fallback: words, character trigrams and canonical taxonomy
+    skills hashed into a fixed-size vector. Lexical rather than semantic, but
+    it tolerates inflections ("deploying"/"deployment") and skill aliases.
+    """
+
+    threshold = 0.3
+
+    def __init__(self, dim=2048):
+        self.dim = dim
+
+    @property
+    def name(self):
+        # Skill features depend on the taxonomy, so cached vectors do too
+        return f"hashing:{self.dim}:{get_taxonomy().fingerprint}"
+
+    def _features(self, text):
+        text = text.lower()
+        for word in re.findall(r"\w[\w+#.]*", text):
+            if word in _STOP_WORDS:
+                continue
+            yield "w:" + word
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                yield "c:" + padded[i:i + 3]
+
+    def encode(self, texts):
+        matcher = get_taxonomy().matcher
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                out[row, zlib.crc32(feature.encode("utf-8")) % self.dim] += 1.0
+            # A shared skill counts for more than a shared word, whatever alias
+            # each side used
+            for skill in matcher.find_all(text.lower()):
+                out[row, zlib.crc32(("s:" + skill).encode("utf-8")) % self.dim] += 4.0
+        return _normalize(out)
+
+
+def _load_embedder(backend):
+    if backend == "sentence-transformers":
+        return SentenceTransformerEmbedder(config.EMBEDDING_MODEL)
+    if backend == "spacy":
+        return SpacyVectorEmbedder(config.SPACY_VECTORS_MODEL)
+    return HashingEmbedder()
+
+
+@lru_cache(maxsize=None)
+def get_embedder(backend=None):
+    """The configured embedding backend, loaded once per process."""
+    backend = backend or config.SEMANTIC_BACKEND
+    if backend != "auto":
+        return _load_embedder(backend)
+    for candidate in ("sentence-transformers", "spacy"):
+        try:
+            return _load_embedder(candidate)
+        except (ImportError, OSError, ValueError):
+            continue
+    return HashingEmbedder()
+
+
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache():
+    """
+    Cache of sentence embeddings. Kept apart from get_cache() so thousands of
+    small vectors don't evict extracted documents from its memory tier.
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                disk = None
+                if config.CACHE_DIR:
+                    disk = DiskCache(
+                        os.path.join(config.CACHE_DIR, "resumate-embeddings.sqlite3"),
+                        max_bytes=config.CACHE_MAX_BYTES,
+                        ttl=config.CACHE_TTL,
+                    )
+                _embedding_cache = TieredCache(LRUCache(config.EMBEDDING_CACHE_ENTRIES), disk)
+    return _embedding_cache
+
+
+def _pack(vector):
+    return base64.b64encode(vector.astype("<f4").tobytes()).decode("ascii")
+
+
+def _unpack(value):
+    return np.frombuffer(base64.b64decode(value), dtype="<f4")
+
+
+def embed(texts, embedder=None):
+    """
+    Unit-length embeddings for `texts` as an (n, dim) float32 array. Cached
+    vectors are reused; the rest are encoded in batches of
+    RESUMATE_EMBEDDING_BATCH_SIZE.
+    """
+    embedder = embedder or get_embedder()
+    cache = get_embedding_cache()
+    keys = [content_key("embedding", embedder.name, text) for text in texts]
+    vectors = {}
+    todo = {}
+    for text, key in zip(texts, keys):
+        if key in vectors or key in todo:
+            continue
+        cached = cache.get(key)
+        if cached is not None:
+            vectors[key] = _unpack(cached)
+        else:
+            todo[key] = text
+
+    pending = list(todo.items())
+    for start in range(0, len(pending), config.EMBEDDING_BATCH_SIZE):
+        batch = pending[start:start + config.EMBEDDING_BATCH_SIZE]
+        for (key, _), vector in zip(batch, embedder.encode([text for _, text in batch])):
+            vectors[key] = vector
+            cache.set(key, _pack(vector))
+
+    if not keys:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack([vectors[key] for key in keys]).astype(np.float32, copy=False)
+
+
+class VectorIndex:
+    """
+    Inner-product nearest-neighbour index over unit vectors (so scores are
+    cosine similarities). Uses faiss or hnswlib when installed and the set is
+    large enough to benefit, NumPy brute force otherwise.
+    """
+
+    def __init__(self, vectors, kind=None):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.size = len(self.vectors)
+        kind = kind or config.VECTOR_INDEX
+        if kind == "auto":
+            kind = "numpy"
+            if self.size >= ANN_MIN_VECTORS:
+                for candidate in ("faiss", "hnswlib"):
+                    try:
+                        __import__(candidate)
+                    except ImportError:
+                        continue
+                    kind = candidate
+                    break
+        self.kind = kind
+
+        if kind == "faiss":
+            import faiss
+
+            self._index = faiss.IndexFlatIP(self.vectors.shape[1])
+            self._index.add(self.vectors)
+        elif kind == "hnswlib":
+            import hnswlib
+
+            self._index = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+            self._index.init_index(max_elements=max(self.size, 1), ef_construction=200, M=16)
+            self._index.add_items(self.vectors)
+        elif kind != "numpy":
+            raise ValueError(f"Unknown vector index '{kind}'")
+
+    def search(self, queries, k=1):
+        """Returns (similarities, ids), each (len(queries), k), best first."""
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        k = min(k, self.size)
+        if k == 0 or not len(queries):
+            return np.zeros((len(queries), 0), dtype=np.float32), np.zeros((len(queries), 0), dtype=np.int64)
+        if self.kind == "faiss":
+            return self._index.search(queries, k)
+        if self.kind == "hnswlib":
+            self._index.set_ef(max(50, k))
+            ids, distances = self._index.knn_query(queries, k=k)
+            return 1.0 - distances, ids.astype(np.int64)
+
+        sims = queries @ self.vectors.T
+        ids = np.argpartition(-sims, k - 1, axis=1)[:, :k] if k < self.size else np.tile(np.arange(self.size), (len(queries), 1))
+        top = np.take_along_axis(sims, ids, axis=1)
+        order = np.argsort(-top, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+
+def semantic_match_many(jd_text, resume_texts, threshold=None, embedder=None):
+    """
+    Semantic coverage of one JD by each resume. Every sentence involved is
+    embedded in one batched call. Returns one dict per resume:
+
+        {"score": % of JD requirements covered, "covered": n, "total": n,
+         "matches": [{"requirement", "evidence", "similarity", "matched"}]}
+    """
+    embedder = embedder or get_embedder()
+    if threshold is None:
+        threshold = config.SEMANTIC_THRESHOLD if config.SEMANTIC_THRESHOLD is not None else embedder.threshold
+
+    requirements = split_sentences(jd_text)
+    resumes = [split_sentences(text) for text in resume_texts]
+    vectors = embed(requirements + [s for sentences in resumes for s in sentences], embedder)
+    jd_vectors = vectors[:len(requirements)]
+
+    results = []
+    offset = len(requirements)
+    for sentences in resumes:
+        matches = []
+        if requirements and sentences:
+            index = VectorIndex(vectors[offset:offset + len(sentences)])
+            sims, ids = index.search(jd_vectors, k=1)
+            for requirement, sim, i in zip(requirements, sims[:, 0], ids[:, 0]):
+                matches.append({"requirement": requirement, "evidence": sentences[i],
+                                "similarity": round(float(sim), 3), "matched": bool(sim >= threshold)})
+        offset += len(sentences)
+        covered = sum(m["matched"] for m in matches)
+        results.append({
+            "score": round(covered / len(requirements) * 100) if requirements else 0,
+            "covered": covered,
+            "total": len(requirements),
+            "matches": matches,
+        })
+    return results
+
+
+def semantic_match(jd_text, resume_text, threshold=None, embedder=None):
+    """semantic_match_many for a single resume."""
+    return semantic_match_many(jd_text, [resume_text], threshold, embedder)[0]
@@ -0,0 +1,305 @@
+"""
+Persistent candidate pool with an inverted skill index.
+
+Every ingested resume's text and get_keywords output are stored once in
+SQLite. Alongside it, an inverted index maps each canonical skill to the
+sorted IDs of the candidates that have it, so a JD is scored against the
+whole pool with posting-list counting instead of re-running NLP.
+
+The index is updated in place when a resume is added, updated or removed,
+and snapshotted to a flat file of uint32 posting lists that reader
+processes memory-map (MappedSkillIndex), sharing one copy in the page cache.
+"""
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+from resumate.cache import content_key
+from resumate.keywords import get_keywords
+from resumate.taxonomy import get_taxonomy
+
+MAGIC = b"RMIDX001"
+
+
+def flatten_skills(keywords):
+    """All skills in a get_keywords result, as a set."""
+    return {skill for skills in keywords.values() for skill in skills}
+
+
+def rank_candidates(index, jd_skills, top_k=20):
+    """
+    Scores every candidate in `index` against a set of JD skills.
+    Returns [(candidate_id, score, matched)] for the best `top_k`, where
+    score is the same percentage score_match computes.
+    """
+    jd_skills = sorted(jd_skills)
+    if not jd_skills:
+        return []
+    lists = [index.postings(skill) for skill in jd_skills]
+    lists = [p for p in lists if len(p)]
+    if not lists:
+        return []
+    hits = np.bincount(np.concatenate(lists), minlength=index.max_id + 1)
+    candidates = np.flatnonzero(hits)
+    if len(candidates) > top_k:
+        candidates = candidates[np.argpartition(-hits[candidates], top_k - 1)[:top_k]]
+    ranked = sorted(candidates.tolist(), key=lambda cid: (-hits[cid], cid))
+    return [(cid, round(int(hits[cid]) / len(jd_skills) * 100), int(hits[cid])) for cid in ranked]
+
+
+class SkillIndex:
+    """Writable in-memory inverted index: skill -> sorted array of candidate IDs."""
+
+    def __init__(self):
+        self._postings = {}
+        self.max_id = 0
+
+    def add(self, candidate_id, skills):
+        self.max_id = max(self.max_id, candidate_id)
+        for skill in skills:
+            plist = self._postings.setdefault(skill, array("I"))
+            i = bisect_left(plist, candidate_id)
+            if i == len(plist) or plist[i] != candidate_id:
+                plist.insert(i, candidate_id)
+
+    def remove(self, candidate_id, skills):
+        for skill in skills:
+            plist = self._postings.get(skill)
+            if plist is None:
+                continue
+            i = bisect_left(plist, candidate_id)
+            if i < len(plist) and plist[i] == candidate_id:
+                del plist[i]
+            if not plist:
+                del self._postings[skill]
+
+    def postings(self, skill):
+        plist = self._postings.get(skill)
+        return np.frombuffer(plist, dtype=np.uint32) if plist else np.empty(0, dtype=np.uint32)
+
+    def save(self, path, meta=None):
+        """
+        Writes a memory-mappable snapshot, atomically replacing `path`.
+        `meta` is stored in the header for the owner's bookkeeping.
+        """
+        directory = {}
+        offset = 0
+        for skill, plist in sorted(self._postings.items()):
+            directory[skill] = [offset, len(plist)]
+            offset += len(plist)
+        header = json.dumps({"max_id": self.max_id, "meta": meta, "skills": directory}).encode("utf-8")
+        pad = (-(len(MAGIC) + 8 + len(header))) % 4
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(b"\0" * pad)
+            for skill in directory:
+                f.write(np.frombuffer(self._postings[skill], dtype=np.uint32).astype("<u4", copy=False).tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a snapshot for writing. Returns (index, meta)."""
+        index = cls()
+        mapped = MappedSkillIndex(path)
+        index.max_id = mapped.max_id
+        for skill in mapped.skills:
+            index._postings[skill] = array("I", mapped.postings(skill).tolist())
+        meta = mapped.meta
+        mapped.close()
+        return index, meta
+
+
+class MappedSkillIndex:
+    """
+    Read-only view of a SkillIndex snapshot. Posting lists are zero-copy
+    NumPy views into the mmap, so any number of processes share one copy.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a skill index snapshot")
+        (header_len,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(self._mm[start:start + header_len])
+        data_start = start + header_len + (-(start + header_len)) % 4
+        self.max_id = header["max_id"]
+        self.meta = header.get("meta")
+        self._directory = header["skills"]
+        total = sum(n for _, n in self._directory.values())
+        self._data = np.frombuffer(self._mm, dtype="<u4", count=total, offset=data_start)
+        self.mtime_ns = os.fstat(self._file.fileno()).st_mtime_ns
+
+    @property
+    def skills(self):
+        return list(self._directory)
+
+    def postings(self, skill):
+        entry = self._directory.get(skill)
+        if entry is None:
+            return np.empty(0, dtype=np.uint32)
+        offset, length = entry
+        return self._data[offset:offset + length]
+
+    def is_stale(self):
+        try:
+            return os.stat(self.path).st_mtime_ns != self.mtime_ns
+        except FileNotFoundError:
+            return True
+
+    def close(self):
+        self._data = None
+        self._mm.close()
+        self._file.close()
+
+
+class CandidateStore:
+    """
+    SQLite store of candidates (text + keywords) that owns a SkillIndex and
+    keeps its snapshot at `<db path>.idx` up to date.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, external_id TEXT UNIQUE NOT NULL, "
+            "name TEXT, content_hash TEXT NOT NULL, text TEXT NOT NULL, keywords TEXT NOT NULL, "
+            "taxonomy TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._dirty = False
+        self.index = self._load_index()
+
+    def _signature(self):
+        # Changes whenever a candidate is added, updated or removed
+        return list(self._conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(MAX(updated), 0) FROM candidates"
+        ).fetchone())
+
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            index, meta = SkillIndex.load(self.index_path)
+            if meta == self._signature():
+                return index
+        # No snapshot, or it missed writes that were never flushed: rebuild
+        # from the stored keywords (no NLP involved).
+        self._dirty = True
+        index = SkillIndex()
+        for cid, keywords in self._conn.execute("SELECT id, keywords FROM candidates"):
+            index.add(cid, flatten_skills(json.loads(keywords)))
+        return index
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def upsert(self, external_id, text, name=None, keywords=None):
+        """
+        Adds or updates a candidate and returns its ID. Unchanged text is a
+        no-op; otherwise only this candidate's postings are touched.
+        """
+        digest = content_key(text)
+        row = self._conn.execute(
+            "SELECT id, content_hash, keywords FROM candidates WHERE external_id = ?", (external_id,)
+        ).fetchone()
+        if row and row[1] == digest:
+            return row[0]
+
+        keywords = keywords if keywords is not None else get_keywords(text)
+        values = (name or external_id, digest, text, json.dumps(keywords), get_taxonomy().fingerprint, time.time())
+        if row:
+            cid = row[0]
+            self.index.remove(cid, flatten_skills(json.loads(row[2])))
+            self._conn.execute(
+                "UPDATE candidates SET name = ?, content_hash = ?, text = ?, keywords = ?, taxonomy = ?, updated = ? "
+                "WHERE id = ?", (*values, cid))
+        else:
+            cid = self._conn.execute(
+                "INSERT INTO candidates (external_id, name, content_hash, text, keywords, taxonomy, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", (external_id, *values)).lastrowid
+        self._conn.commit()
+        self.index.add(cid, flatten_skills(keywords))
+        self._dirty = True
+        return cid
+
+    def remove(self, external_id):
+        row = self._conn.execute(
+            "SELECT id, keywords FROM candidates WHERE external_id = ?", (external_id,)
+        ).fetchone()
+        if row is None:
+            return False
+        self.index.remove(row[0], flatten_skills(json.loads(row[1])))
+        self._conn.execute("DELETE FROM candidates WHERE id = ?", (row[0],))
+        self._conn.commit()
+        self._dirty = True
+        return True
+
+    def refresh_stale(self):
+        """
+        Re-runs keyword extraction (from the stored text, no file parsing)
+        for candidates indexed with an older taxonomy. Returns how many.
+        """
+        fingerprint = get_taxonomy().fingerprint
+        stale = self._conn.execute(
+            "SELECT id, text, keywords FROM candidates WHERE taxonomy != ?", (fingerprint,)
+        ).fetchall()
+        now = time.time()
+        for cid, text, old in stale:
+            keywords = get_keywords(text)
+            self.index.remove(cid, flatten_skills(json.loads(old)))
+            self.index.add(cid, flatten_skills(keywords))
+            # Bumping `updated` changes _signature, so an older snapshot isn't loaded
+            self._conn.execute("UPDATE candidates SET keywords = ?, taxonomy = ?, updated = ? WHERE id = ?",
+                               (json.dumps(keywords), fingerprint, now, cid))
+        self._conn.commit()
+        self._dirty = self._dirty or bool(stale)
+        return len(stale)
+
+    def flush(self):
+        """Writes the index snapshot if anything changed since the last flush."""
+        if self._dirty:
+            self.index.save(self.index_path, meta=self._signature())
+            self._dirty = False
+
+    def get(self, candidate_id):
+        row = self._conn.execute(
+            "SELECT id, external_id, name, keywords FROM candidates WHERE id = ?", (candidate_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "external_id": row[1], "name": row[2], "keywords": json.loads(row[3])}
+
+    def search(self, jd_keywords, top_k=20, index=None):
+        """
+        Ranks stored candidates against a get_keywords result for a JD.
+        Pass a MappedSkillIndex to search a shared snapshot instead of this
+        store's in-memory index.
+        """
+        ranked = rank_candidates(index or self.index, flatten_skills(jd_keywords), top_k)
+        results = []
+        for cid, score, matched in ranked:
+            candidate = self.get(cid)
+            if candidate is not None:
+                results.append({**candidate, "score": score, "matched": matched})
+        return results
+
+    def close(self):
+        self.flush()
+        self._conn.close()
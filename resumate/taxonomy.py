@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
+
+from resumate import config
+from resumate.matcher import SkillMatcher, normalize_term
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).parent / "data" / "skills.json"
+
+
+class SkillTaxonomy:
+    """
+    Immutable, normalized view of the skill taxonomy file.
+
+    Every alias (and every canonical name) resolves to its canonical skill in
+    `aliases`, and every canonical skill to its category in `skill_category`,
+    so a lookup is a single dict access.
+    """
+
+    def __init__(self, version, categories, fingerprint=""):
+        self.version = version
+        self.fingerprint = fingerprint
+
+        skill_category = {}
+        aliases = {}
+        ordered = {}
+        for cat, skills in categories.items():
+            ordered[cat] = []
+            for skill, skill_aliases in skills.items():
+                canonical = normalize_term(skill)
+                if canonical in skill_category:
+                    raise ValueError(f"Skill '{canonical}' is listed under both '{skill_category[canonical]}' and '{cat}'")
+                skill_category[canonical] = cat
+                ordered[cat].append(canonical)
+                for alias in [canonical, *skill_aliases]:
+                    key = normalize_term(alias)
+                    if aliases.get(key, canonical) != canonical:
+                        raise ValueError(f"Alias '{key}' maps to both '{aliases[key]}' and '{canonical}'")
+                    aliases[key] = canonical
+
+        self.categories = MappingProxyType({cat: tuple(skills) for cat, skills in ordered.items()})
+        self.skill_category = MappingProxyType(skill_category)
+        self.aliases = MappingProxyType(aliases)
+
+    @classmethod
+    def from_file(cls, path):
+        raw = Path(path).read_bytes()
+        data = json.loads(raw)
+        return cls(data["version"], data["categories"], hashlib.sha256(raw).hexdigest())
+
+    @cached_property
+    def matcher(self):
+        return SkillMatcher(self.aliases)
+
+    def canonical(self, term):
+        """Returns the canonical skill for a term or alias, or None."""
+        return self.aliases.get(normalize_term(term))
+
+    def category_of(self, skill):
+        return self.skill_category.get(skill)
+
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def get_taxonomy(path=None):
+    """
+    Returns the taxonomy for `path` (default: config.TAXONOMY_PATH or the
+    bundled skills.json), loading it once and reloading it whenever the file
+    changes on disk. If a reload fails, or the file can't be found for a
+    while, the previous version keeps serving.
+    """
+    path = str(path or config.TAXONOMY_PATH or DEFAULT_TAXONOMY_PATH)
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        # Mid atomic replace, or removed: keep serving what was loaded
+        with _lock:
+            cached = _loaded.get(path)
+            if cached is None:
+                raise
+            if cached[0] is not None:
+                logger.warning("Keeping taxonomy %s, can't read %s: %s", cached[1].version, path, e)
+                # Logged once; the next successful stat reloads
+                _loaded[path] = (None, cached[1])
+        return cached[1]
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _loaded.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with _lock:
+        cached = _loaded.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        try:
+            taxonomy = SkillTaxonomy.from_file(path)
+        except (OSError, ValueError, KeyError) as e:
+            if cached is None:
+                raise
+            logger.warning("Keeping taxonomy %s, reload of %s failed: %s", cached[1].version, path, e)
+            if not isinstance(e, OSError):
+                # Remember the bad file's stamp so we don't retry until it changes again
+                _loaded[path] = (stamp, cached[1])
+            return cached[1]
+        _loaded[path] = (stamp, taxonomy)
+        logger.info("Loaded skill taxonomy %s from %s", taxonomy.version, path)
+        return taxonomy
@@ -0,0 +1,378 @@
+"""
+Bounded-memory handling of the resumes uploaded to the Streamlit pages.
+
+An upload is checked before anything parses it: its size against the
+extraction limits first, then a PDF's page count (from the page tree) and
+how far a DOCX unpacks (see extract.check_document). It is then held as an
+Upload until its text has been extracted:
+
+- files up to UPLOAD_SPILL_BYTES stay in memory; larger ones are written to
+  a temp file, which extraction reads through mmap, so pdfminer never needs
+  a copy of the file in memory;
+- an Upload pickles to its path (or its bytes), so it can be sent to the
+  extraction pool, and extract_many releases it, dropping its bytes or
+  deleting its file, as soon as its text is cached.
+
+The UploadStore accounts uploads per session. A session can't hold more
+than UPLOAD_SESSION_MAX_BYTES; when all sessions together would hold more
+than UPLOAD_MEMORY_BUDGET in memory, the least recently active other
+sessions' uploads are moved to disk first (and new uploads spilled if that
+isn't enough). Sessions idle for UPLOAD_IDLE_SECONDS have their uploads
+released; a job that still needed one fails asking for the file again.
+
+    store = get_upload_store()
+    upload = store.accept(session_id, uploaded_file.name, uploaded_file)
+    items, rejected = store.accept_files(session_id, uploaded_files)  # ZIPs are unpacked
+"""
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from resumate import config
+from resumate.cache import content_key
+from resumate.extract import (
+    SUPPORTED_EXTENSIONS,
+    ExtractionError,
+    ExtractionLimits,
+    check_document,
+    check_size,
+    file_extension,
+)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadBudgetExceeded(ExtractionError):
+    """Raised when an upload would take its session past UPLOAD_SESSION_MAX_BYTES."""
+
+
+class MappedFile(io.RawIOBase):
+    """
+    A read-only binary file object over a memory-mapped file, for the
+    readers that want a real file object (pdfminer, zipfile, pypdfium2).
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = (0, self._pos, len(self._map))[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, buffer):
+        n = max(0, min(len(buffer), len(self._map) - self._pos))
+        with memoryview(buffer) as target:
+            target.cast("B")[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+            self._map.close()
+        super().close()
+
+
+class Upload:
+    """
+    One uploaded document, in memory or spilled to a temp file at `path`.
+    `digest` is the content_key of its bytes and stays valid after release.
+    """
+
+    __slots__ = ("name", "size", "digest", "path", "_data")
+
+    def __init__(self, name, size, digest, data=None, path=None):
+        self.name = name
+        self.size = size
+        self.digest = digest
+        self.path = path
+        self._data = data
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        where = "released" if self.released else "disk" if self.path else "memory"
+        return f"Upload({self.name!r}, {self.size}, {where})"
+
+    @property
+    def in_memory(self):
+        return self._data is not None
+
+    @property
+    def released(self):
+        return self._data is None and self.path is None
+
+    @contextmanager
+    def open(self):
+        """A binary file object over the upload's bytes (see extract.open_document)."""
+        data, path = self._data, self.path
+        if data is not None:
+            yield io.BytesIO(data)
+            return
+        try:
+            fp = MappedFile(path) if path else None
+        except FileNotFoundError:
+            fp = None
+        if fp is None:
+            raise ExtractionError(f"{self.name} is no longer available (this session was idle too long); "
+                                  "please upload it again")
+        with fp:
+            yield fp
+
+    def spill(self, directory=None):
+        """Moves the upload's bytes to a temp file."""
+        data = self._data
+        if data is None:
+            return
+        self.path = _write_temp(self.name, [data], directory)
+        self._data = None
+
+    def release(self):
+        """Drops the bytes or deletes the temp file; the upload can't be read afterwards."""
+        self._data = None
+        path, self.path = self.path, None
+        if path:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def _write_temp(name, chunks, directory=None):
+    fd, path = tempfile.mkstemp(prefix="resumate-upload-", suffix="." + file_extension(name), dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+class _Session:
+    __slots__ = ("active", "uploads")
+
+    def __init__(self, now):
+        self.active = now
+        self.uploads = []
+
+    def prune(self):
+        self.uploads = [u for u in self.uploads if not u.released]
+        return self.uploads
+
+
+class UploadStore:
+    """Uploads held for each session, within the budgets described above. Thread-safe."""
+
+    def __init__(self, directory=None, spill_bytes=None, session_max_bytes=None, memory_budget=None,
+                 idle_seconds=None):
+        self.directory = directory or config.UPLOAD_DIR
+        self.spill_bytes = config.UPLOAD_SPILL_BYTES if spill_bytes is None else spill_bytes
+        self.session_max_bytes = config.UPLOAD_SESSION_MAX_BYTES if session_max_bytes is None else session_max_bytes
+        self.memory_budget = config.UPLOAD_MEMORY_BUDGET if memory_budget is None else memory_budget
+        self.idle_seconds = config.UPLOAD_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self._sessions = OrderedDict()  # least recently active first
+        self._lock = threading.Lock()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def accept(self, session_id, name, source, size=None, limits=None):
+        """
+        Checks and stores one upload for `session_id`. `source` is bytes or
+        a binary file object (a Streamlit UploadedFile, a ZIP member) of
+        `size` bytes. Returns an Upload; raises ExtractionError (including
+        ExtractionLimitExceeded and UploadBudgetExceeded) if it's refused.
+        """
+        limits = limits or ExtractionLimits()
+        if size is None:
+            size = len(source) if isinstance(source, (bytes, bytearray)) else source.size
+        check_size(name, size, limits)
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            session = self._sessions.pop(session_id, None) or _Session(now)
+            session.active = now
+            self._sessions[session_id] = session
+
+            held = sum(u.size for u in session.prune())
+            if held + size > self.session_max_bytes:
+                raise UploadBudgetExceeded(
+                    f"Uploads waiting to be read in this session are limited to "
+                    f"{self.session_max_bytes / 1048576:g} MB; wait for the current analysis to finish"
+                )
+            spill = size > self.spill_bytes or not self._make_room(size, session_id)
+            upload = self._store(name, source, size, spill)
+            session.uploads.append(upload)
+
+        try:
+            check_document(name, upload, limits)
+        except BaseException:
+            upload.release()
+            raise
+        return upload
+
+    def accept_files(self, session_id, files, limits=None):
+        """
+        accept for every PDF/DOCX in `files` (uploaded files or ZIP archives
+        of them; anything else is skipped). Returns ([(name, Upload)],
+        [(name, error message)]) with the refused files in the second list.
+        """
+        items, rejected = [], []
+        for f in files:
+            ext = file_extension(f.name)
+            if ext in SUPPORTED_EXTENSIONS:
+                members = [(f.name, f, f.size)]
+            elif ext == "zip":
+                members = _zip_members(f, rejected)
+            else:
+                continue
+            for name, source, size in members:
+                try:
+                    items.append((name, self.accept(session_id, name, source, size, limits)))
+                except (ExtractionError, zipfile.BadZipFile, zlib.error, EOFError) as e:
+                    rejected.append((name, str(e)))
+        return items, rejected
+
+    def release_session(self, session_id):
+        """Releases everything `session_id` holds."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        for upload in session.uploads if session else ():
+            upload.release()
+
+    def usage(self):
+        """{"sessions", "uploads", "memory_bytes", "disk_bytes"} currently held."""
+        with self._lock:
+            self._expire(time.monotonic())
+            sessions = len(self._sessions)
+            uploads = [u for session in self._sessions.values() for u in session.prune()]
+        return {
+            "sessions": sessions,
+            "uploads": len(uploads),
+            "memory_bytes": sum(u.size for u in uploads if u.in_memory),
+            "disk_bytes": sum(u.size for u in uploads if not u.in_memory),
+        }
+
+    def _store(self, name, source, size, spill):
+        if isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
+        elif not spill:
+            # A Streamlit UploadedFile is a BytesIO; getvalue() shares its buffer
+            data = source.getvalue() if hasattr(source, "getvalue") else source.read(size + 1)
+        else:
+            h = hashlib.sha256(size.to_bytes(8, "big"))
+            written = 0
+
+            def chunks():
+                nonlocal written
+                if hasattr(source, "seek"):
+                    source.seek(0)
+                while written <= size:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    h.update(chunk)
+                    written += len(chunk)
+                    yield chunk
+
+            path = _write_temp(name, chunks(), self.directory)
+            if written != size:
+                os.unlink(path)
+                raise ExtractionError(f"{file_extension(name).upper()} upload is truncated or corrupt")
+            # The same digest as content_key(data), without holding the data
+            return Upload(name, size, h.hexdigest(), path=path)
+
+        if len(data) != size:
+            raise ExtractionError(f"{file_extension(name).upper()} upload is truncated or corrupt")
+        upload = Upload(name, size, content_key(data), data=data)
+        if spill:
+            upload.spill(self.directory)
+        return upload
+
+    def _make_room(self, size, session_id):
+        """Spills other sessions' uploads, least recently active first, until `size` more bytes fit in memory."""
+        in_memory = [u for session in self._sessions.values() for u in session.uploads if u.in_memory]
+        used = sum(u.size for u in in_memory)
+        for sid, session in self._sessions.items():
+            if used + size <= self.memory_budget:
+                break
+            if sid == session_id:
+                continue
+            for upload in session.uploads:
+                if upload.in_memory:
+                    used -= upload.size
+                    upload.spill(self.directory)
+        return used + size <= self.memory_budget
+
+    def _expire(self, now):
+        while self._sessions:
+            sid, session = next(iter(self._sessions.items()))
+            if now - session.active < self.idle_seconds:
+                break
+            del self._sessions[sid]
+            for upload in session.uploads:
+                upload.release()
+
+
+def _zip_members(archive_file, rejected):
+    """(name, file object, size) for the PDF/DOCX files in a ZIP; each must be read before the next."""
+    try:
+        with zipfile.ZipFile(archive_file) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or "__MACOSX" in name or os.path.basename(name).startswith("."):
+                    continue
+                if file_extension(name) in SUPPORTED_EXTENSIONS:
+                    try:
+                        member = archive.open(info)
+                    except NotImplementedError as e:
+                        # A compression method zipfile can't read
+                        rejected.append((os.path.basename(name), f"Can't unpack from {archive_file.name}: {e}"))
+                        continue
+                    except RuntimeError:
+                        # zipfile asks for the password
+                        rejected.append((os.path.basename(name), f"Encrypted in {archive_file.name}"))
+                        continue
+                    with member:
+                        yield os.path.basename(name), member, info.file_size
+    except zipfile.BadZipFile as e:
+        rejected.append((archive_file.name, f"Not a valid ZIP archive: {e}"))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_upload_store():
+    """The UploadStore shared by every session of this process."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = UploadStore()
+    return _store
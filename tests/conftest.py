@@ -0,0 +1,4 @@
+import os
+
+# The tests never load a spaCy model: keyword extraction uses only the skill matcher
+os.environ.setdefault("RESUMATE_KEYWORD_MODE", "matcher")
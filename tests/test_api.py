@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from resumate.api import app  # noqa: E402
+
+PROFILE = {"name": "Jane Doe", "email": "jane@example.com", "skills": "Python, SQL"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("color", ["#0ea5e9", "0EA5E9"])
+def test_resume_pdf(client, color):
+    response = client.post("/resume/pdf", json={"data": PROFILE, "accent_color": color})
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+
+
+@pytest.mark.parametrize("body", [{"accent_color": "red"}, {"accent_color": "#12345"}, {"layout_style": "Fancy"}])
+def test_resume_pdf_rejects_bad_options(client, body):
+    assert client.post("/resume/pdf", json={"data": PROFILE, **body}).status_code == 422
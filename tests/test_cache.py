@@ -0,0 +1,54 @@
+from resumate.cache import DiskCache, LRUCache, TieredCache, content_key
+
+
+def test_content_key_separates_parts():
+    assert content_key("ab", "c") != content_key("a", "bc")
+    assert content_key("a", b"b") == content_key(b"a", "b")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+def test_tiered_round_trip(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    value = {"Languages": ["python"], "Frameworks": []}
+    TieredCache(LRUCache(8), disk).set("k", value)
+
+    # A new process starts with an empty memory tier
+    memory = LRUCache(8)
+    cache = TieredCache(memory, disk)
+    assert cache.get("k") == value
+    assert memory.get("k") == value  # promoted
+    assert cache.get("missing", "default") == "default"
+
+    cache.clear()
+    assert cache.get("k") is None
+
+
+def test_memory_only(tmp_path):
+    cache = TieredCache(LRUCache(8))
+    cache.set("k", "text")
+    assert cache.get("k") == "text"
+
+
+def test_disk_bounds(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"), max_bytes=25)
+    disk.set("a", "x" * 10)
+    disk.set("b", "y" * 10)
+    assert disk.get("a") == "x" * 10  # b is now least recently used
+    disk.set("c", "z" * 10)
+    assert disk.get("b") is None
+    assert disk.get("a") == "x" * 10
+
+    disk.set("huge", "x" * 100)  # bigger than the whole cache
+    assert disk.get("huge") is None
+
+    expired = DiskCache(str(tmp_path / "ttl.db"), ttl=-1)
+    expired.set("a", 1)
+    assert expired.get("a") is None
@@ -0,0 +1,74 @@
+import pickle
+import types
+
+import pytest
+from fpdf import FPDF
+
+from resumate import extract
+from resumate.batch import extract_many
+from resumate.extract import (
+    ExtractionLimitExceeded,
+    ExtractionLimits,
+    check_document,
+    check_size,
+    iter_pdf_pages,
+)
+
+
+def _pdf(pages, tag="page"):
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for i in range(1, pages + 1):
+        pdf.add_page()
+        pdf.cell(0, 10, f"{tag} {i}")
+    return bytes(pdf.output())
+
+
+def test_page_cap():
+    data = _pdf(3)
+    limits = ExtractionLimits(max_pages=2)
+    with pytest.raises(ExtractionLimitExceeded, match="more than 2 pages") as e:
+        check_document("cv.pdf", data, limits)
+    assert e.value.limit == "max_pages"
+
+    pages = []
+    with pytest.raises(ExtractionLimitExceeded) as e:
+        for text in iter_pdf_pages(data, limits):
+            pages.append(text.strip())
+    assert e.value.limit == "max_pages" and pages == ["page 1", "page 2"]
+    assert len(list(iter_pdf_pages(data, ExtractionLimits(max_pages=3)))) == 3
+
+
+def test_size_cap():
+    data = _pdf(1)
+    limits = ExtractionLimits(max_bytes=len(data) - 1)
+    for check in (lambda: check_size("cv.pdf", len(data), limits), lambda: next(iter_pdf_pages(data, limits))):
+        with pytest.raises(ExtractionLimitExceeded, match="larger than") as e:
+            check()
+        assert e.value.limit == "max_bytes"
+
+
+def test_time_limit_checked_between_pages(monkeypatch):
+    # The clock reads 0 when reading starts, then 0.5 and 2 after pages 1 and 2
+    clock = iter([0.0, 0.5, 2.0])
+    monkeypatch.setattr(extract, "time", types.SimpleNamespace(monotonic=lambda: next(clock)))
+    pages = []
+    with pytest.raises(ExtractionLimitExceeded, match=r"longer than 1s to read \(stopped after page 2\)") as e:
+        for text in iter_pdf_pages(_pdf(3), ExtractionLimits(max_seconds=1)):
+            pages.append(text.strip())
+    assert e.value.limit == "max_seconds" and pages == ["page 1", "page 2"]
+
+
+def test_limit_survives_pickling():
+    e = pickle.loads(pickle.dumps(ExtractionLimitExceeded("max_pages", "PDF has more than 2 pages")))
+    assert (e.limit, str(e)) == ("max_pages", "PDF has more than 2 pages")
+
+
+def test_errors_come_back_through_extract_many(monkeypatch):
+    # The pool's workers are spawned, so they read the limit from the environment
+    monkeypatch.setenv("RESUMATE_EXTRACT_MAX_PAGES", "2")
+    items = [("long.pdf", _pdf(3, "long")), ("short.pdf", _pdf(1, "short")), ("broken.pdf", b"%PDF-1.4 not a pdf")]
+    results = {name: (text, error) for name, text, error in extract_many(items, max_workers=1)}
+    assert results["long.pdf"] == (None, "PDF has more than 2 pages")
+    assert results["short.pdf"][0].strip() == "short 1" and results["short.pdf"][1] is None
+    assert results["broken.pdf"] == (None, "Error extracting PDF text")
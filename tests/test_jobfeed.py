@@ -0,0 +1,45 @@
+from resumate.jobfeed import JobStore, MinHasher, normalize_posting
+
+DESCRIPTION = (
+    "We are hiring a backend engineer to build and operate Python services on AWS. "
+    "You will design APIs with Django, run them in Docker and Kubernetes, and own "
+    "PostgreSQL schemas. Experience with CI/CD pipelines and on-call rotations is a plus. "
+    "Our team values clear writing, code review and mentoring."
+)
+
+
+def posting(external_id, description, title="Backend Engineer"):
+    return normalize_posting({"id": external_id, "title": title, "description": description})
+
+
+def test_signatures_estimate_similarity():
+    hasher = MinHasher()
+    original = hasher.signature(DESCRIPTION)
+    assert MinHasher.similarity(original, MinHasher().signature(DESCRIPTION)) == 1.0
+    reworded = hasher.signature("Apply by Friday! " + DESCRIPTION.replace("a plus", "nice to have"))
+    assert MinHasher.similarity(original, reworded) > 0.6
+    other = hasher.signature("Seeking a registered nurse for night shifts in a busy emergency department "
+                             "with strong patient care and triage experience.")
+    assert MinHasher.similarity(original, other) < 0.1
+    assert len(hasher.band_keys(original)) == hasher.bands
+
+
+def test_reposts_are_linked_not_indexed(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"), threshold=0.6)
+    stats = store.ingest([
+        posting("1", DESCRIPTION),
+        posting("2", DESCRIPTION),  # exact repost
+        posting("3", "<p>Apply by Friday!</p> " + DESCRIPTION.replace("a plus", "nice to have")),
+        posting("4", "Registered nurse for night shifts in a busy emergency department.", title="Nurse"),
+    ])
+    assert stats == {"read": 4, "new": 2, "updated": 0, "unchanged": 0, "duplicate": 2}
+    assert store.count_duplicates() == 2
+
+    resume = {"Languages": ["python"], "Tools & Cloud": ["aws", "docker"]}
+    results = store.match(resume)
+    assert [(r["external_id"], r["reposts"]) for r in results] == [("1", 2)]
+
+    # Re-ingesting the same feed changes nothing
+    again = store.ingest([posting("1", DESCRIPTION), posting("2", DESCRIPTION)])
+    assert again["unchanged"] == 2
+    store.close()
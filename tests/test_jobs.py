@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from resumate.jobs import JobManager, JobQueueFull
+from resumate.uploads import Upload
+
+
+def _wait(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.done:
+        assert time.monotonic() < deadline, f"job still {job.status}"
+        time.sleep(0.01)
+    return job
+
+
+def _blocked(job, gate):
+    gate.wait(5)
+    return "ok"
+
+
+def _until_cancelled(job, started):
+    started.set()
+    while True:
+        job.report(message="working")
+        time.sleep(0.01)
+
+
+def _upload(data=b"%PDF-1.4 resume"):
+    return Upload("cv.pdf", len(data), "digest", data=data)
+
+
+def test_same_key_reuses_job():
+    manager = JobManager(workers=1)
+    gate = threading.Event()
+    job = manager.submit("k", _blocked, gate)
+    assert manager.submit("k", _blocked, gate) is job  # pending
+    gate.set()
+    assert _wait(job).result == "ok"
+    assert manager.submit("k", _blocked, gate) is job  # finished within the TTL
+    assert manager.submit("other", _blocked, gate) is not job
+
+
+def test_failed_job_is_not_reused():
+    manager = JobManager(workers=1)
+
+    def fail(job):
+        raise ValueError("boom")
+
+    job = _wait(manager.submit("k", fail))
+    assert job.status == "failed" and job.error == "Analysis failed: boom"
+    assert _wait(manager.submit("k", lambda job: 1)).result == 1
+
+
+def test_cancel_queued_and_running():
+    manager = JobManager(workers=1)
+    started = threading.Event()
+    running = manager.submit("running", _until_cancelled, started)
+    queued = manager.submit("queued", lambda job: pytest.fail("a cancelled job ran"))
+    assert started.wait(5)
+
+    assert manager.cancel(queued.id) and queued.status == "cancelled"
+    assert manager.cancel(running.id)
+    assert _wait(running).status == "cancelled"
+    assert not manager.cancel(running.id)  # already finished
+
+
+def test_queue_full_refuses_and_releases():
+    manager = JobManager(workers=1, max_pending=1)
+    gate = threading.Event()
+    job = manager.submit("a", _blocked, gate)
+    upload = _upload()
+    with pytest.raises(JobQueueFull):
+        manager.submit("b", _blocked, gate, cleanup=upload.release)
+    assert upload.released
+    gate.set()
+    _wait(job)
+    assert _wait(manager.submit("b", _blocked, gate)).result == "ok"
+
+
+def test_cleanup_releases_uploads():
+    manager = JobManager(workers=1)
+    gate = threading.Event()
+    blocker = manager.submit("blocker", _blocked, gate)
+
+    done, reused, cancelled = _upload(), _upload(), _upload()
+    job = manager.submit("k", lambda job, upload: upload.size, done, cleanup=done.release)
+    assert manager.submit("k", lambda job, upload: upload.size, reused, cleanup=reused.release) is job
+    assert reused.released and not done.released  # the pending job still needs its upload
+    skipped = manager.submit("cancelled", _blocked, gate, cleanup=cancelled.release)
+    manager.cancel(skipped.id)
+    assert cancelled.released
+
+    gate.set()
+    _wait(blocker)
+    assert _wait(job).result == len(b"%PDF-1.4 resume")
+    assert done.released
@@ -0,0 +1,80 @@
+import random
+import re
+import string
+
+import pytest
+
+from resumate.matcher import SkillMatcher
+from resumate.taxonomy import get_taxonomy
+
+FILLER = (
+    "designed built and shipped services for customers across teams "
+    "improved reliability latency and cost while mentoring junior engineers"
+).split()
+
+
+def legacy_find_all(skills, text_lower):
+    # The loop get_keywords used before SkillMatcher: one regex per skill
+    return [s for s in skills if re.search(r'\b' + re.escape(s) + r'\b', text_lower)]
+
+
+def legacy_count_all(skills, text_lower):
+    counts = {}
+    for skill in skills:
+        n = len(re.findall(r'\b' + re.escape(skill) + r'\b', text_lower))
+        if n:
+            counts[skill] = n
+    return counts
+
+
+def random_skills(n, rng):
+    """The taxonomy's skills plus random one- to three-word ones, `n` in all."""
+    skills = set(get_taxonomy().skill_category)
+    while len(skills) < n:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+                 for _ in range(rng.choice((1, 1, 2, 3)))]
+        skills.add(" ".join(words))
+    return sorted(skills)
+
+
+def random_document(n_words, skills, rng):
+    words = []
+    while len(words) < n_words:
+        words.extend(rng.choice(skills).split() if rng.random() < 0.05 else [rng.choice(FILLER)])
+    return " ".join(words)
+
+
+def word_bounded(skills):
+    # \b only marks a whole word for terms that start and end with a word
+    # character ("c++" can't match at all with the old regex)
+    return [s for s in skills if re.match(r"\w", s) and re.search(r"\w$", s)]
+
+
+@pytest.mark.parametrize("n_skills", [0, 200])
+def test_matches_whole_word_regex(n_skills):
+    # The taxonomy's skills, then with random one- to three-word skills added
+    rng = random.Random(n_skills)
+    skills = word_bounded(random_skills(n_skills, rng))
+    matcher = SkillMatcher({s: s for s in skills})
+    for _ in range(1500):
+        text = random_document(rng.randint(1, 120), skills, rng)
+        assert set(matcher.find_all(text)) == set(legacy_find_all(skills, text))
+        assert matcher.count_all(text) == legacy_count_all(skills, text)
+
+
+def test_reports_in_order_of_first_appearance():
+    matcher = SkillMatcher({"rest": "rest", "rest api": "rest api", "python": "python"})
+    assert matcher.find_all("python and rest api, then rest") == ["python", "rest api", "rest"]
+    assert matcher.count_all("python and rest api, then rest") == {"python": 1, "rest api": 1, "rest": 2}
+
+
+def test_aliases_and_wrapped_phrases():
+    matcher = SkillMatcher({"k8s": "kubernetes", "Kubernetes": "kubernetes", "machine learning": "ml"})
+    assert matcher.find_all("deployed on k8s; machine\n  learning") == ["kubernetes", "ml"]
+    assert matcher.find_all("k8sx and mymachine learning") == []
+
+
+def test_taxonomy_symbols_are_whole_words():
+    matcher = get_taxonomy().matcher
+    assert "c++" in matcher.find_all("wrote c++ and c#")
+    assert "java" not in matcher.find_all("javascript only")
@@ -0,0 +1,37 @@
+import io
+
+from fpdf import FPDF
+
+from resumate import ocr
+
+
+def _pdf(image=False):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.cell(0, 10, "Python developer")
+    pdf.add_page()
+    if image:
+        from PIL import Image
+
+        buf = io.BytesIO()
+        Image.new("L", (40, 20), 255).save(buf, "PNG")
+        pdf.image(buf, x=10, y=10, w=40)
+    return bytes(pdf.output())
+
+
+def test_blank_page_is_not_ocrd():
+    data = _pdf()
+    assert ocr._scanned_pages(data, [1], 300, "eng") == {}
+    assert ocr.recover_pages("cv.pdf", data, "Python developer\f") == ("Python developer\f", None)
+
+
+def test_image_page_without_ocr_is_complete(monkeypatch):
+    data = _pdf(image=True)
+    assert list(ocr._scanned_pages(data, [1], 300, "eng")) == [1]
+
+    monkeypatch.setattr(ocr, "ocr_available", lambda: False)
+    text, report = ocr.recover_pages("cv.pdf", data, "Python developer\f")
+    assert report["skipped"] == 1 and "not installed" in report["error"]
+    # No later attempt can read more, so the text is cached as it is
+    assert ocr.recover_text("cv.pdf", data, "Python developer\f") == ("Python developer\f", True)
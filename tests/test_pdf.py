@@ -0,0 +1,50 @@
+import io
+import zipfile
+
+import pytest
+from fpdf.fonts import TTFFont
+from pdfminer.high_level import extract_text
+
+from resumate import pdf
+
+PROFILE = {"name": "José Müller", "email": "jose@example.com", "phone": "555-0100", "location": "Zürich",
+           "summary": "Backend engineer · Python", "skills": "Python, Docker"}
+
+
+def test_latin1_profile_uses_core_font():
+    data = pdf.render_resume(PROFILE)
+    assert b"/Helvetica" in data and b"/FontFile2" not in data
+    assert "JOSÉ MÜLLER" in extract_text(io.BytesIO(data))
+
+
+def test_fpdf_font_internals_unchanged():
+    # _FontFamily.install copies TTFFont objects and resets their per-document
+    # attributes; a new fpdf2 may add state it doesn't know to reset
+    assert TTFFont.__slots__ == (
+        "i", "type", "name", "desc", "glyph_ids", "_hbfont", "sp", "ss", "up", "ut", "cw", "ttffile", "fontkey",
+        "emphasis", "scale", "subset", "cmap", "ttfont", "missing_glyphs", "biggest_size_pt", "color_font",
+        "unicode_range", "palette_index", "is_compressed", "is_cff", "is_cid_keyed", "is_symbol", "cff_ros",
+        "collection_font_number",
+    )
+
+
+@pytest.mark.skipif(pdf.find_font() is None, reason="no TrueType font installed")
+def test_unicode_profiles_embed_their_own_subset():
+    # Each document collects the glyphs it uses, though the parsed font is shared
+    names = ("Иван Петров", "Ελένη Παππά", "Đặng Thị Ngọc")
+    for name in names:
+        data = pdf.render_resume(dict(PROFILE, name=name))
+        assert b"/FontFile2" in data
+        text = extract_text(io.BytesIO(data))
+        assert name.upper() in text and "Zürich" in text
+
+
+def test_render_bulk_reuses_shared_pool():
+    profiles = [dict(PROFILE, name=f"Person {i}") for i in range(5)] + [dict(PROFILE, name="")]
+    pools = []
+    for _ in range(2):
+        out = io.BytesIO()
+        assert pdf.render_bulk(profiles, out, chunk_size=2) == (5, [(6, "missing name")])
+        assert len(zipfile.ZipFile(out).namelist()) == 5
+        pools.append(pdf.get_render_pool())
+    assert pools[0] is pools[1]
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from resumate.scoring import score_match, score_matrix
+from resumate.taxonomy import get_taxonomy
+
+
+def random_results(rng, size):
+    categories = get_taxonomy().categories
+    skills = rng.sample([skill for skills in categories.values() for skill in skills], size)
+    return {cat: [skill for skill in members if skill in skills] for cat, members in categories.items()}
+
+
+def test_uniform_score_matrix_matches_score_match():
+    rng = random.Random(0)
+    jds = [random_results(rng, rng.randint(0, 12)) for _ in range(20)]
+    resumes = [random_results(rng, rng.randint(0, 30)) for _ in range(30)]
+    scores = score_matrix(jds, resumes)
+    assert scores.shape == (len(jds), len(resumes))
+    for i, jd in enumerate(jds):
+        for j, resume in enumerate(resumes):
+            assert round(scores[i, j]) == score_match(jd, resume)[0]
+
+
+def jd_and_resumes():
+    jd = {cat: [] for cat in get_taxonomy().categories}
+    jd["Languages"] = ["python", "java"]
+    resumes = [dict(jd, Languages=["python"]), dict(jd, Languages=["java"])]
+    return jd, resumes
+
+
+def test_required_skills_apply_to_every_jd():
+    jd, resumes = jd_and_resumes()
+    # Required python counts double: 2 of 3 for the python resume, 1 of 3 for the java one
+    for required in (["python"], {"python"}, ("python",), iter(["python"]), "python"):
+        scores = score_matrix([jd, jd], resumes, required=required)
+        assert scores.round(1).tolist() == [[66.7, 33.3], [66.7, 33.3]]
+
+
+def test_required_skills_per_jd():
+    jd, resumes = jd_and_resumes()
+    scores = score_matrix([jd, jd], resumes, required=[{"python"}, {"java"}])
+    assert scores.round(1).tolist() == [[66.7, 33.3], [33.3, 66.7]]
+    with pytest.raises(ValueError, match="2 skill sets for 3 job descriptions"):
+        score_matrix([jd, jd, jd], resumes, required=[{"python"}, {"java"}])
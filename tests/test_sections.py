@@ -0,0 +1,89 @@
+from resumate import sections
+from resumate.scoring import score_sections
+from resumate.sections import profile_keywords, split_sections
+
+RESUME = """Ann Lee
+ann@example.com | +1 555 010 0100 | Austin, TX
+
+PROFESSIONAL SUMMARY
+Backend engineer.
+
+Work Experience:
+Built REST APIs in Django.
+
+• Skills & Tools
+Docker, AWS
+Languages
+Python, Go
+Languages: English, Spanish
+
+Side Projects
+A Flask app.
+
+Languages
+English, Spanish
+
+Certifications: AWS Certified Developer
+"""
+
+
+def _bodies(doc):
+    return [(s.name, doc.text[s.start:s.end].strip()) for s in doc.sections]
+
+
+def test_headings_split_sections():
+    doc = split_sections(RESUME)
+    assert doc.names() == ["header", "summary", "experience", "skills", "projects", "other"]
+    bodies = _bodies(doc)
+    assert bodies[2] == ("experience", "Built REST APIs in Django.")
+    # "Languages" inside Skills is a subheading, and "Languages: ..." with
+    # an OTHER heading is content; the top-level one starts a section
+    assert bodies[3] == ("skills", "Docker, AWS\nLanguages\nPython, Go\nLanguages: English, Spanish")
+    assert bodies[5] == ("other", "English, Spanish\n\nCertifications: AWS Certified Developer")
+
+
+def test_heading_text_after_colon():
+    doc = split_sections("Ann Lee\nSkills: Python, SQL\nExperience\nData engineer")
+    assert _bodies(doc) == [("header", "Ann Lee"), ("skills", "Python, SQL"), ("experience", "Data engineer")]
+
+
+def test_unsectioned_text_is_header():
+    doc = split_sections("Python developer with Docker experience")
+    assert not doc.sectioned and doc.names() == ["header"]
+
+
+def test_to_profile():
+    profile = split_sections(RESUME).to_profile()
+    assert (profile["name"], profile["email"], profile["location"]) == ("Ann Lee", "ann@example.com", "Austin, TX")
+    assert profile["projects"] == "A Flask app."
+
+
+def test_section_weights():
+    jd = {"Languages": ["python"], "Tools & Cloud": ["docker", "aws"]}
+    found = {
+        "experience": {"Languages": ["python"]},
+        "other": {"Languages": ["python"], "Tools & Cloud": ["aws"]},
+        "skills": {"Tools & Cloud": ["docker"]},
+    }
+    score, where = score_sections(jd, found)
+    # experience 1.0 + skills 0.8 + other 0.25 of 3
+    assert score == 68
+    assert where["python"] == ["experience", "other"]
+    # Without headings the whole resume is the header, at full weight
+    assert score_sections(jd, {"header": found["other"]})[0] == 67
+
+
+def test_profile_keywords_only_rematches_changed_fields(monkeypatch):
+    profile = {"name": "Ann Lee", "email": "ann@example.com", "skills": "Python, Docker",
+               "experience": "Built REST APIs in Django", "summary": ""}
+    results = profile_keywords(profile)
+    assert set(results) == {"header", "skills", "experience"}
+    assert results["skills"]["Languages"] == ["python"]
+    assert results["experience"]["Frameworks"] == ["django"]
+
+    batches = []
+    original = sections.get_keywords_batch
+    monkeypatch.setattr(sections, "get_keywords_batch", lambda texts: batches.append(texts) or original(texts))
+    results = profile_keywords(dict(profile, skills="Python, Docker, AWS"))
+    assert batches == [["Python, Docker, AWS"]]
+    assert results["skills"]["Tools & Cloud"] == ["docker", "aws"]
@@ -0,0 +1,70 @@
+import numpy as np
+
+from resumate.store import CandidateStore, MappedSkillIndex, SkillIndex
+
+
+def test_snapshot_round_trip(tmp_path):
+    index = SkillIndex()
+    index.add(3, {"python", "docker"})
+    index.add(1, {"python"})
+    index.add(70000, {"python", "aws"})
+    index.remove(3, {"docker"})
+    path = str(tmp_path / "skills.idx")
+    index.save(path, meta=[3, 70000, 1.5])
+
+    mapped = MappedSkillIndex(path)
+    try:
+        assert sorted(mapped.skills) == ["aws", "python"]
+        assert mapped.postings("python").tolist() == [1, 3, 70000]
+        assert mapped.postings("aws").dtype == np.uint32
+        assert len(mapped.postings("docker")) == 0
+        assert (mapped.max_id, mapped.meta) == (70000, [3, 70000, 1.5])
+        assert not mapped.is_stale()
+    finally:
+        mapped.close()
+
+    loaded, meta = SkillIndex.load(path)
+    assert meta == [3, 70000, 1.5]
+    loaded.add(2, {"python"})
+    assert loaded.postings("python").tolist() == [1, 2, 3, 70000]
+
+
+def test_snapshot_replaced_is_stale(tmp_path):
+    path = str(tmp_path / "skills.idx")
+    SkillIndex().save(path)
+    mapped = MappedSkillIndex(path)
+    index = SkillIndex()
+    index.add(1, {"go"})
+    index.save(path)
+    assert mapped.is_stale()
+    mapped.close()
+
+
+def test_candidate_store_reloads_snapshot(tmp_path):
+    path = str(tmp_path / "pool.db")
+    store = CandidateStore(path)
+    store.upsert("a.pdf", "Python and Django developer")
+    store.upsert("b.pdf", "Java developer")
+    store.flush()
+    store.close()
+
+    store = CandidateStore(path)
+    assert not store._dirty  # loaded from the snapshot
+    jd = {"Languages": ["python", "java"]}
+    assert [(c["external_id"], c["score"]) for c in store.search(jd)] == [("a.pdf", 50), ("b.pdf", 50)]
+    store.close()
+
+
+def test_refresh_stale_invalidates_snapshot(tmp_path):
+    path = str(tmp_path / "pool.db")
+    store = CandidateStore(path)
+    store.upsert("a.pdf", "Python developer")
+    store.flush()
+    store._conn.execute("UPDATE candidates SET taxonomy = 'old'")
+    store._conn.commit()
+    assert store.refresh_stale() == 1
+    store._conn.close()  # exits without flushing
+
+    store = CandidateStore(path)
+    assert store._dirty  # the snapshot predates the refresh, so it was rebuilt
+    store.close()
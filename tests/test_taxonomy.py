@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+
+import pytest
+
+from resumate import config
+from resumate.store import CandidateStore
+from resumate.taxonomy import DEFAULT_TAXONOMY_PATH, get_taxonomy
+
+
+@pytest.fixture
+def taxonomy_file(tmp_path, monkeypatch):
+    path = tmp_path / "skills.json"
+    path.write_bytes(DEFAULT_TAXONOMY_PATH.read_bytes())
+    monkeypatch.setattr(config, "TAXONOMY_PATH", str(path))
+    return path
+
+
+def _add_skill(path, skill, version):
+    data = json.loads(path.read_text())
+    data["version"] = version
+    data["categories"]["Languages"][skill] = []
+    path.write_text(json.dumps(data))
+    # A new mtime even where its resolution is coarse
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_hot_reload_refreshes_stale_candidates(taxonomy_file, tmp_path):
+    store = CandidateStore(str(tmp_path / "pool.db"))
+    store.upsert("a.pdf", "Python and Zig developer")
+    before = get_taxonomy()
+    assert store.refresh_stale() == 0
+    assert "zig" not in store.search({"Languages": ["python"]})[0]["keywords"]["Languages"]
+
+    _add_skill(taxonomy_file, "zig", "1.0.1")
+    after = get_taxonomy()
+    assert after.version == "1.0.1" and after.fingerprint != before.fingerprint
+    assert store.refresh_stale() == 1
+    assert [c["external_id"] for c in store.search({"Languages": ["zig"]})] == ["a.pdf"]
+    assert store.refresh_stale() == 0
+    store.close()
+
+
+def test_missing_or_broken_file_keeps_cached(taxonomy_file, caplog):
+    loaded = get_taxonomy()
+    os.replace(taxonomy_file, str(taxonomy_file) + ".old")
+    with caplog.at_level(logging.WARNING, logger="resumate.taxonomy"):
+        assert get_taxonomy() is loaded
+        assert get_taxonomy() is loaded
+    assert len(caplog.records) == 1 and "can't read" in caplog.text
+
+    taxonomy_file.write_text("{not json")
+    assert get_taxonomy() is loaded
+
+    _add_skill(taxonomy_file.with_name("skills.json.old"), "zig", "1.0.1")
+    os.replace(str(taxonomy_file) + ".old", taxonomy_file)
+    assert get_taxonomy().version == "1.0.1"
@@ -0,0 +1,102 @@
+import io
+import os
+import zipfile
+
+import pytest
+from fpdf import FPDF
+
+from resumate.cache import content_key
+from resumate.extract import ExtractionError, extract_text
+from resumate.uploads import MappedFile, UploadBudgetExceeded, UploadStore
+
+
+class UploadedFile(io.BytesIO):
+    # What accept_files reads from a Streamlit UploadedFile
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+def _pdf(text="Python developer"):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.cell(0, 10, text)
+    return bytes(pdf.output())
+
+
+PDF = _pdf()
+
+
+def test_session_budget(tmp_path):
+    store = UploadStore(directory=str(tmp_path), session_max_bytes=2 * len(PDF))
+    store.accept("a", "one.pdf", PDF)
+    store.accept("a", "two.pdf", PDF)
+    with pytest.raises(UploadBudgetExceeded, match="limited to"):
+        store.accept("a", "three.pdf", PDF)
+    store.accept("b", "one.pdf", PDF)  # budgets are per session
+
+    # Released uploads no longer count
+    store.release_session("a")
+    store.accept("a", "three.pdf", PDF)
+
+
+def test_memory_budget_spills_least_recently_active(tmp_path):
+    store = UploadStore(directory=str(tmp_path), memory_budget=len(PDF) * 3 // 2)
+    older = store.accept("a", "cv.pdf", PDF)
+    newer = store.accept("b", "cv.pdf", PDF)
+    assert not older.in_memory and os.path.exists(older.path)
+    assert newer.in_memory
+    assert store.usage() == {"sessions": 2, "uploads": 2, "memory_bytes": len(PDF), "disk_bytes": len(PDF)}
+
+    # With nothing left to move, a new upload goes straight to disk
+    assert not store.accept("b", "more.pdf", PDF).in_memory
+
+
+def test_large_uploads_are_read_through_mmap(tmp_path):
+    store = UploadStore(directory=str(tmp_path), spill_bytes=len(PDF) - 1)
+    upload = store.accept("a", "cv.pdf", UploadedFile("cv.pdf", PDF))
+    assert not upload.in_memory and os.path.getsize(upload.path) == len(PDF)
+    assert upload.digest == content_key(PDF)
+    with upload.open() as fp:
+        assert isinstance(fp, MappedFile) and fp.read() == PDF
+    assert extract_text("cv.pdf", upload).strip() == "Python developer"
+
+    at_threshold = UploadStore(directory=str(tmp_path), spill_bytes=len(PDF))
+    assert at_threshold.accept("a", "cv.pdf", UploadedFile("cv.pdf", PDF)).in_memory
+
+
+def test_release_and_idle_cleanup(tmp_path):
+    store = UploadStore(directory=str(tmp_path), spill_bytes=0)
+    upload = store.accept("a", "cv.pdf", PDF)
+    path = upload.path
+    upload.release()
+    assert upload.released and not os.path.exists(path)
+    with pytest.raises(ExtractionError, match="no longer available"):
+        with upload.open():
+            pass
+
+    idle = UploadStore(directory=str(tmp_path), spill_bytes=0, idle_seconds=0)
+    upload = idle.accept("a", "cv.pdf", PDF)
+    assert idle.usage()["sessions"] == 0  # idle since accepted
+    assert upload.released and os.listdir(tmp_path) == []
+
+
+def test_zip_members_that_cant_be_read_are_rejected(tmp_path):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        archive.writestr("good.pdf", _pdf())
+        # Changed after writing: the central directory, which open() reads, is written on close
+        archive.writestr("locked.pdf", _pdf())
+        archive.getinfo("locked.pdf").flag_bits |= 0x1  # encrypted
+        archive.writestr("odd.pdf", _pdf())
+        archive.getinfo("odd.pdf").compress_type = 99  # an unsupported method
+        archive.writestr("after.pdf", _pdf())
+
+    store = UploadStore(directory=str(tmp_path))
+    items, rejected = store.accept_files("s", [UploadedFile("resumes.zip", buf.getvalue())])
+    assert [name for name, _ in items] == ["good.pdf", "after.pdf"]
+    assert [name for name, _ in rejected] == ["locked.pdf", "odd.pdf"]
+    assert rejected[0][1] == "Encrypted in resumes.zip"
+    assert rejected[1][1].startswith("Can't unpack from resumes.zip: ")